@@ -47,6 +47,92 @@ class CacheTest(g.unittest.TestCase):
             assert xt < mt
             assert xt < ct
 
+    def test_hash_modes(self):
+        """
+        Benchmark cache lookups for every fast hash mode on
+        a large mesh, and make sure each mode detects changes.
+        """
+        caching = g.trimesh.caching
+        modes = ['crc', 'generation']
+        if caching.hasX:
+            modes.append('xxhash')
+        if caching.hasB:
+            modes.append('blake2b')
+
+        # a large mesh with 5M faces which we won't process
+        count = 5000000
+        state = g.np.random.RandomState(seed=1)
+        vertices = state.random_sample((count // 2, 3))
+        faces = state.randint(len(vertices), size=(count, 3))
+
+        original = caching.TrackedArray.__dict__['fast_hash']
+        try:
+            for mode in modes:
+                caching.set_fast_hash(mode)
+                m = g.trimesh.Trimesh(vertices=vertices,
+                                      faces=faces,
+                                      process=False)
+                m._cache['value'] = 1
+
+                # lookups where nothing has changed
+                tic = g.time.time()
+                for i in range(100):
+                    m._cache['value']
+                clean = (g.time.time() - tic) / 100
+
+                # lookups after a mutation through the array API
+                tic = g.time.time()
+                for i in range(5):
+                    m._cache['value'] = i
+                    m.vertices[i] += 1.0
+                    assert m._cache['value'] is None
+                dirty = (g.time.time() - tic) / 5
+
+                # reads which create views or copies shouldn't
+                # be mistaken for changes
+                m._cache['value'] = 1
+                m.vertices[:3]
+                m.vertices[m.faces[:10]]
+                m.vertices.reshape(-1)
+                assert m._cache['value'] == 1
+
+                # but writes through a view should
+                view = m.vertices[:3]
+                m._cache['value']
+                view[0] += 1.0
+                assert m._cache['value'] is None
+
+                g.log.info(
+                    '%s: Cache.__getitem__ %.2e s unchanged, %.2e s mutated',
+                    mode, clean, dirty)
+        finally:
+            caching.TrackedArray.fast_hash = original
+
+        # switching modes shouldn't return a stale hash
+        # computed before a change by another mode
+        a = caching.tracked_array(g.np.arange(10))
+        try:
+            for mode in modes:
+                caching.set_fast_hash(mode)
+                hashes = [a.fast_hash()]
+                for other in modes:
+                    caching.set_fast_hash(other)
+                    a.fast_hash()
+                caching.set_fast_hash(mode)
+                a[0] += 1
+                for other in modes:
+                    caching.set_fast_hash(other)
+                    a.fast_hash()
+                caching.set_fast_hash(mode)
+                hashes.append(a.fast_hash())
+                assert hashes[0] != hashes[1]
+        finally:
+            caching.TrackedArray.fast_hash = original
+
+        # bad modes should raise
+        with self.assertRaises(ValueError):
+            caching.set_fast_hash('not a mode')
+
     def test_track(self):
         """
         Check to make sure our fancy caching system only changes
@@ -182,6 +268,193 @@ class CacheTest(g.unittest.TestCase):
         assert t.crc() != t[::-1].crc()
         assert t.fast_hash() != t[::-1].fast_hash()
 
+    def test_depends(self):
+        """
+        Values which only depend on faces should survive
+        changes to vertices, and be dumped if faces change.
+        """
+        m = g.get_mesh('featuretype.STL')
+
+        # populate some topological and geometric values
+        adjacency = m.face_adjacency
+        neighbors = m.vertex_neighbors
+        edges = m.edges_unique
+        sparse = m.edges_sparse
+        area = m.area
+
+        # a vertex- only edit through the array API
+        m.vertices[:10] += 1.0
+        assert m.face_adjacency is adjacency
+        assert m.vertex_neighbors is neighbors
+        assert m.edges_unique is edges
+        # area depends on vertices and should be recomputed
+        assert 'area' not in m._cache
+
+        # apply_transform should also keep topology
+        m.face_normals
+        m.vertex_normals
+        m.apply_transform(g.trimesh.transformations.random_rotation_matrix())
+        assert m.face_adjacency is adjacency
+        assert m.edges_unique is edges
+        # and the normals it transformed
+        assert 'face_normals' in m._cache.cache
+        assert 'vertex_normals' in m._cache.cache
+
+        # transformed normals should match recomputed ones
+        # including for reflections and non- uniform scale
+        for matrix in [g.np.diag([-1, 1, 1, 1.0]),
+                       g.np.diag([2, 3, 0.5, 1.0])]:
+            m.apply_transform(matrix)
+            assert 'face_normals' in m._cache.cache
+            normals = m.face_normals.copy()
+            m._cache.delete('face_normals')
+            assert g.np.allclose(normals, m.face_normals)
+
+        # a singular transform can't transform normals so it
+        # should flatten the mesh and drop them
+        box = g.trimesh.creation.box()
+        box.apply_transform(g.np.diag([1, 1, 0, 1.0]))
+        assert g.np.allclose(box.vertices[:, 2], 0.0)
+        box = g.trimesh.creation.box()
+        box.face_normals
+        box.vertex_normals
+        box.apply_transform(g.np.diag([1, 1, 0, 1.0]))
+        assert 'face_normals' not in box._cache.cache
+        assert 'vertex_normals' not in box._cache.cache
+
+        # adding a vertex changes the shape of per- vertex values
+        m.vertices = g.np.vstack((m.vertices, [[0, 0, 0]]))
+        assert m.edges_sparse is not sparse
+        assert m.edges_sparse.shape == (len(m.vertices), len(m.vertices))
+
+        # changing faces should dump topology
+        edges = m.edges_unique
+        m.faces[0] = m.faces[0][::-1]
+        assert m.edges_unique is not edges
+
+        # the kdtree only depends on vertices
+        tree = m.kdtree
+        m.faces[0] = m.faces[0][::-1]
+        assert m.kdtree is tree
+        m.vertices[0] += 1.0
+        assert m.kdtree is not tree
+
+        # a primitive stores its parameters in the DataStore
+        # so changing them should dump everything
+        box = g.trimesh.primitives.Box()
+        edges = box.edges_unique
+        box.primitive.extents = [1, 2, 3]
+        assert box.edges_unique is not edges
+
+    def test_disk(self):
+        """
+        Values marked persistent should be stored on disk and
+        loaded by other copies of the same mesh.
+        """
+        caching = g.trimesh.caching
+        # convex_hull is checked separately as it requires qhull
+        names = ['facets', 'face_adjacency',
+                 'principal_inertia_transform', 'symmetry',
+                 'identifier']
+        with g.TemporaryDirectory() as path:
+            try:
+                disk = caching.set_disk_cache(path)
+                assert set(names).issubset(
+                    caching.persistent(g.trimesh.Trimesh))
+
+                # compute every value and store it on disk
+                m = g.get_mesh('featuretype.STL')
+                truth = {n: getattr(m, n) for n in names}
+                assert disk.size > 0
+
+                # a new copy of the mesh should load them from disk
+                c = g.get_mesh('featuretype.STL')
+                assert not any(n in c._cache.cache for n in names)
+                for name in names:
+                    value = getattr(c, name)
+                    assert name in c._cache.cache
+                    if name == 'facets':
+                        assert len(value) == len(truth[name])
+                        assert all((a == b).all() for a, b in
+                                   zip(value, truth[name]))
+                    elif name == 'symmetry':
+                        assert value == truth[name]
+                    else:
+                        assert g.np.allclose(value, truth[name])
+                # byproducts should have been restored
+                assert (c.face_adjacency_edges ==
+                        m.face_adjacency_edges).all()
+
+                # overriding mass properties should change the key
+                # so values aren't loaded from the unmodified mesh
+                count = len(disk._entries())
+                for attr, value in [('density', 2.0),
+                                    ('center_mass',
+                                     g.np.array([1.0, 2.0, 3.0]))]:
+                    c = g.get_mesh('featuretype.STL')
+                    setattr(c, attr, value)
+                    assert (disk.key(c, 'identifier') !=
+                            disk.key(m, 'identifier'))
+                    c.principal_inertia_transform
+                    assert len(disk._entries()) == count + 1
+                    count += 1
+
+                # a symmetric mesh stores its axis as a byproduct
+                truth = g.trimesh.creation.cylinder(radius=1, height=2)
+                assert truth.symmetry == 'radial'
+                c = truth.copy()
+                assert c.symmetry == 'radial'
+                assert g.np.allclose(c.symmetry_axis,
+                                     truth.symmetry_axis)
+
+                # a changed mesh should not get stale values
+                c.vertices[0] += 1.0
+                assert c.symmetry is None
+
+                # evicting to a tiny size should remove entries
+                disk.max_size = disk.size // 2
+                disk.evict()
+                assert disk.size <= disk.max_size
+
+                # warm the cache from a directory of models
+                disk.clear()
+                assert disk.size == 0
+                with g.TemporaryDirectory() as models:
+                    for name in ['featuretype.STL', 'box.STL']:
+                        g.shutil.copy(g.os.path.join(g.dir_models, name),
+                                      models)
+                    disk.max_size = 2 ** 30
+                    assert disk.warm(models, names=['identifier']) == 2
+                # the identifier uses other persistent values
+                # which should have been stored along the way
+                stored = [i[2] for i in disk._entries()]
+                assert len([i for i in stored
+                            if i.endswith('_identifier.npz')]) == 2
+                c = g.get_mesh('featuretype.STL')
+                assert g.np.allclose(c.identifier, m.identifier)
+            finally:
+                caching.set_disk_cache(None)
+
+    def test_disk_convex_hull(self):
+        """
+        A convex hull stored on disk should be loaded by other
+        copies of the same mesh.
+        """
+        caching = g.trimesh.caching
+        with g.TemporaryDirectory() as path:
+            try:
+                caching.set_disk_cache(path)
+                truth = g.get_mesh('featuretype.STL').convex_hull
+
+                c = g.get_mesh('featuretype.STL')
+                assert 'convex_hull' not in c._cache.cache
+                hull = c.convex_hull
+                assert 'convex_hull' in c._cache.cache
+                assert g.np.allclose(hull.vertices, truth.vertices)
+                assert (hull.faces == truth.faces).all()
+            finally:
+                caching.set_disk_cache(None)
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
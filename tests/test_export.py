@@ -231,6 +231,68 @@ class ExportTest(g.unittest.TestCase):
         assert g.np.allclose(reconstructed.visual.vertex_colors,
                              m.visual.vertex_colors)
 
+    def test_stream(self):
+        """
+        Exporters writing chunks to a file object should produce
+        the same result as the previous in- memory exporters, which
+        was saved in `models/export`.
+        """
+        # a box with face colors and a box with vertex colors
+        faces = g.trimesh.creation.box()
+        faces.visual.face_colors = g.np.column_stack((
+            g.np.arange(12) * 20,
+            255 - g.np.arange(12) * 20,
+            g.np.full(12, 7),
+            g.np.full(12, 255))).astype(g.np.uint8)
+        vertex = g.trimesh.creation.box()
+        vertex.visual.vertex_colors = g.np.column_stack((
+            g.np.arange(8) * 30,
+            g.np.full(8, 3),
+            255 - g.np.arange(8) * 30,
+            g.np.full(8, 255))).astype(g.np.uint8)
+
+        for m, name, file_type, kwargs in [
+                (faces, 'box_faces.stl', 'stl', {}),
+                (faces, 'box_faces_ascii.stl', 'stl_ascii', {}),
+                (faces, 'box_faces.ply', 'ply', {}),
+                (faces, 'box_faces_ascii.ply', 'ply',
+                 {'encoding': 'ascii', 'vertex_normal': True}),
+                (vertex, 'box_vertex.ply', 'ply', {})]:
+            with open(g.os.path.join(
+                    g.dir_models, 'export', name), 'rb') as f:
+                truth = f.read()
+
+            # in memory exports should be unchanged
+            export = m.export(file_type=file_type, **kwargs)
+            if hasattr(export, 'encode'):
+                export = export.encode('utf-8')
+            assert export == truth
+
+            # use a tiny chunk to exercise multiple chunks
+            stream = g.trimesh.util.BytesIO()
+            result = m.export(file_obj=stream,
+                              file_type=file_type,
+                              stream=True,
+                              chunk=5,
+                              **kwargs)
+            assert result is None
+            assert stream.getvalue() == truth
+
+            # file names should return the data unless streamed
+            with g.TemporaryDirectory() as path:
+                file_name = g.os.path.join(
+                    path, 'out.' + file_type.split('_')[0])
+                export = m.export(file_name,
+                                  file_type=file_type,
+                                  **kwargs)
+                assert len(export) == len(truth)
+                assert m.export(file_name,
+                                file_type=file_type,
+                                stream=True,
+                                **kwargs) is None
+                with open(file_name, 'rb') as f:
+                    assert f.read() == truth
+
     def test_dict(self):
         mesh = g.get_mesh('machinist.XAML')
         assert mesh.visual.kind == 'face'
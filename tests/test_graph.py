@@ -85,6 +85,36 @@ class GraphTest(g.unittest.TestCase):
         vert_adj_g = f(sing)
         assert len(sing.vertices) == len(vert_adj_g)
 
+    def test_csr(self):
+        """
+        Neighbors and vertex faces in CSR form should match
+        the networkx graph and the faces.
+        """
+        for mesh in [g.get_mesh('featuretype.STL'),
+                     g.trimesh.creation.icosphere(),
+                     g.trimesh.primitives.Box()]:
+            offsets, indices = mesh.vertex_neighbors_csr
+            assert len(offsets) == len(mesh.vertices) + 1
+            assert len(indices) == len(mesh.edges_unique) * 2
+
+            graph = mesh.vertex_adjacency_graph
+            for i, neighbors in enumerate(mesh.vertex_neighbors):
+                assert neighbors == sorted(graph.neighbors(i))
+                assert neighbors == indices[
+                    offsets[i]:offsets[i + 1]].tolist()
+
+            offsets, indices = mesh.vertex_faces_csr
+            assert len(indices) == mesh.faces.size
+            for i in range(len(mesh.vertices)):
+                truth = g.np.nonzero((mesh.faces == i).any(axis=1))[0]
+                assert (indices[offsets[i]:offsets[i + 1]] == truth).all()
+
+        # vertices which aren't referenced should have no neighbors
+        offsets, indices = g.trimesh.graph.neighbors_csr(
+            [[0, 1], [1, 3]], count=5)
+        assert (g.np.diff(offsets) == [1, 2, 0, 1, 0]).all()
+        assert (indices == [1, 0, 3, 1]).all()
+
     def test_engine_time(self):
         for mesh in g.get_meshes():
             tic = [g.time.time()]
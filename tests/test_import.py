@@ -0,0 +1,69 @@
+try:
+    from . import generic as g
+except BaseException:
+    import generic as g
+
+
+class ImportTest(g.unittest.TestCase):
+
+    def test_lazy(self):
+        """
+        Importing trimesh shouldn't import heavy submodules
+        or optional dependencies until they are used.
+        """
+        if tuple(g.python_version) < (3, 7):
+            g.log.info('lazy imports require python 3.7+')
+            return
+
+        script = '\n'.join([
+            'import sys, time, json',
+            'tic = time.time()',
+            'import trimesh',
+            'toc = time.time() - tic',
+            'before = sorted(sys.modules.keys())',
+            'm = trimesh.creation.box()',
+            'm.convex_hull',
+            'after = sorted(sys.modules.keys())',
+            'trimesh.Scene',
+            'print(json.dumps({"time": toc,',
+            '                  "before": before,',
+            '                  "after": after}))'])
+        result = g.json.loads(g.subprocess.check_output(
+            [g.sys.executable, '-c', script]).decode('utf-8'))
+        g.log.info('imported trimesh in %.3fs', result['time'])
+
+        # none of these should have been imported yet
+        for name in ['networkx',
+                     'trimesh.ray',
+                     'trimesh.voxel',
+                     'trimesh.scene',
+                     'trimesh.exchange.load',
+                     'trimesh.registration']:
+            assert name not in result['before']
+        # but using a property should import what it needs
+        assert 'trimesh.convex' in result['after']
+
+    def test_attributes(self):
+        # submodules should be available as attributes
+        assert g.trimesh.voxel.VoxelMesh is not None
+        assert g.trimesh.scene.Scene is g.trimesh.Scene
+        assert callable(g.trimesh.load)
+        assert g.trimesh.primitives.Box is not None
+        with self.assertRaises(AttributeError):
+            g.trimesh.not_a_submodule
+        # standard library modules shouldn't leak
+        assert not hasattr(g.trimesh, 'sys')
+        # format modules should be available from the package
+        for name in ['load', 'export', 'stl', 'ply', 'wavefront']:
+            module = getattr(g.trimesh.exchange, name)
+            assert module.__name__ == 'trimesh.exchange.' + name
+        with self.assertRaises(AttributeError):
+            g.trimesh.exchange.not_a_format
+        # lazy modules should pass through to the real module
+        lazy = g.trimesh.base.proximity
+        assert lazy.ProximityQuery is g.trimesh.proximity.ProximityQuery
+
+
+if __name__ == '__main__':
+    g.trimesh.util.attach_to_log()
+    g.unittest.main()
@@ -175,6 +175,59 @@ class PointsTest(g.unittest.TestCase):
                         g.np.diff(points[idx], axis=0), axis=1)
                     assert g.np.allclose(dist_check, dist)
 
+    def test_remove_close(self):
+        """
+        Removing close points should match keeping each point
+        in order if it isn't near a point which was kept.
+        """
+        from scipy.spatial import cKDTree
+        def loop(points, radius):
+            # the previous per- point implementation
+            tree = cKDTree(points)
+            consumed = g.np.zeros(len(points), dtype=bool)
+            unique = g.np.zeros(len(points), dtype=bool)
+            for i in range(len(points)):
+                if consumed[i]:
+                    continue
+                consumed[tree.query_ball_point(points[i], r=radius)] = True
+                unique[i] = True
+            return unique
+
+        for dimension in [2, 3]:
+            for count in [0, 1, 10, 1000, 200000]:
+                points = g.np.random.random((count, dimension))
+                # a radius with a few neighbors per point
+                radius = (5.0 / (count + 1)) ** (1.0 / dimension)
+
+                tic = [g.time.time()]
+                culled, mask = g.trimesh.points.remove_close(
+                    points, radius)
+                tic.append(g.time.time())
+                truth = loop(points, radius)
+                tic.append(g.time.time())
+
+                assert (mask == truth).all()
+                assert g.np.allclose(culled, points[truth])
+                g.log.info(
+                    'remove_close on %d points: %.3fs (loop: %.3fs)',
+                    count, *g.np.diff(tic))
+
+                # no two points should be within radius
+                if len(culled) > 1:
+                    distance, _ = cKDTree(culled).query(culled, k=2)
+                    assert (distance[:, 1] > radius).all()
+
+        # sorted points on a line settle one at a time per pass
+        # so most of them should go through the sequential sweep
+        points = g.np.column_stack((g.np.linspace(0, 1, 20000),
+                                    g.np.zeros(20000)))
+        radius = 2.5 / 20000
+        tic = g.time.time()
+        culled, mask = g.trimesh.points.remove_close(points, radius)
+        g.log.info('remove_close on a sorted line: %.3fs',
+                   g.time.time() - tic)
+        assert (mask == loop(points, radius)).all()
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -198,6 +198,118 @@ class NearestTest(g.unittest.TestCase):
                 g.np.all(faceIdxsB == faceIdxsB[0]) and
                 faceIdxsA[0] != faceIdxsB[0])
 
+    def test_candidates_chunked(self):
+        """
+        A memory budget on candidates should give the same
+        result as querying every point at once.
+        """
+        for mesh in g.get_meshes(3):
+            points = (g.random((1000, 3)) - 0.5) * mesh.extents * 1.5
+            points += mesh.centroid
+            vertices = mesh.vertices[:100]
+            points = g.np.vstack((points, vertices))
+
+            close, distance, tid = g.trimesh.proximity.closest_point(
+                mesh, points)
+            # small enough to split the points into many chunks
+            for budget in [500, 5000]:
+                check = g.trimesh.proximity.closest_point(
+                    mesh, points, max_candidates=budget)
+                assert g.np.allclose(check[0], close)
+                assert g.np.allclose(check[1], distance)
+                assert (check[2] == tid).all()
+
+            # vertices should be on the surface
+            assert g.np.allclose(distance[-len(vertices):], 0.0)
+            # every point should have been given a valid face
+            assert (tid < len(mesh.faces)).all()
+            assert g.np.allclose(
+                g.np.linalg.norm(close - points, axis=1), distance)
+
+    def test_distance_field(self):
+        """
+        Queries answered from a distance field should match
+        the exact queries.
+        """
+        for mesh in [g.trimesh.primitives.Sphere(subdivisions=3),
+                     g.get_mesh('featuretype.STL')]:
+            field = mesh.distance_field
+            # should be cached on the mesh
+            assert field is mesh.distance_field
+            assert len(field) > 0
+
+            # points near the surface and far away
+            points = g.np.vstack((
+                mesh.sample(500) + (g.random((500, 3)) - 0.5) * field.pitch,
+                (g.random((100, 3)) - 0.5) * mesh.extents * 3.0 +
+                mesh.centroid))
+
+            tic = [g.time.time()]
+            truth = mesh.nearest.on_surface(points)
+            tic.append(g.time.time())
+            check = mesh.nearest.on_surface(points, field=True)
+            tic.append(g.time.time())
+            g.log.info('exact query %.3fs, field query %.3fs',
+                       *g.np.diff(tic))
+
+            # points near the surface are refined exactly
+            assert g.np.allclose(check[1], truth[1],
+                                 atol=g.trimesh.tol.merge)
+            assert g.np.allclose(
+                g.np.linalg.norm(check[0] - points, axis=1), check[1])
+
+            signed = g.trimesh.proximity.signed_distance(
+                mesh, points)
+            signed_field = g.trimesh.proximity.signed_distance(
+                mesh, points, field=field)
+            assert g.np.allclose(signed, signed_field,
+                                 atol=mesh.scale * 1e-3)
+            # points near vertices are usually closest to an edge
+            # or a vertex where the face normal can't give the sign
+            nodes = mesh.vertices + (g.random(mesh.vertices.shape) -
+                                     0.5) * field.pitch
+            check = g.np.sign(g.trimesh.proximity.signed_distance(
+                mesh, nodes, field=field))
+            truth = g.np.sign(g.trimesh.proximity.signed_distance(
+                mesh, nodes))
+            assert (check == truth).all()
+
+            # interpolation is only defined near the surface
+            approximate = field.interpolate(points)
+            valid = ~g.np.isnan(approximate)
+            assert valid[:500].sum() > 400
+            assert g.np.allclose(approximate[valid], signed[valid],
+                                 atol=field.pitch)
+
+        # the closest face to a point is often not closest to
+        # any corner of its cell on a finely tessellated mesh
+        mesh = g.get_mesh('bunny.ply')
+        field = mesh.distance_field
+        points = mesh.sample(3000) + (
+            g.random((3000, 3)) - 0.5) * field.pitch
+        truth = mesh.nearest.on_surface(points)[1]
+        check = field.on_surface(points)[1]
+        assert g.np.allclose(check, truth, atol=g.trimesh.tol.merge)
+
+    def test_unreferenced_vertex(self):
+        """
+        A point whose nearest vertex isn't used by any face
+        should still find the closest face.
+        """
+        box = g.trimesh.creation.box()
+        mesh = g.trimesh.Trimesh(
+            vertices=g.np.vstack((box.vertices, [10, 10, 10])),
+            faces=box.faces,
+            process=False)
+        points = [[10, 10, 10.1], [0, 0, 2]]
+
+        truth = g.trimesh.proximity.closest_point(box, points)
+        check = g.trimesh.proximity.closest_point(mesh, points)
+        assert g.np.allclose(check[0], truth[0])
+        assert g.np.allclose(check[1], truth[1])
+        assert g.np.allclose(check[1][0], g.np.linalg.norm(
+            [9.5, 9.5, 9.6]))
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
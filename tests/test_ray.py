@@ -50,6 +50,90 @@ class RayTests(g.unittest.TestCase):
                        str(rps),
                        use_embree)
 
+    def test_broad_phase(self):
+        """
+        The BVH broad phase should return the same first hits
+        as the r-tree broad phase, and log the rays per second
+        of every available ray engine.
+        """
+        from trimesh.ray import ray_triangle
+
+        count = 2000
+        for mesh in g.get_meshes(5):
+            state = g.np.random.RandomState(seed=1)
+            # rays from around the mesh pointing in random directions
+            origins = (state.random_sample((count, 3)) - 0.5) * 2.0
+            origins = origins * mesh.extents + mesh.centroid
+            vectors = g.trimesh.unitize(state.random_sample((count, 3)) - 0.5)
+            # include some axis aligned rays
+            vectors[:10] = [0, 0, 1]
+
+            engines = {
+                'bvh': ray_triangle.RayMeshIntersector(
+                    mesh, broad_phase='bvh'),
+                'rtree': ray_triangle.RayMeshIntersector(
+                    mesh, broad_phase='rtree')}
+            if g.trimesh.ray.has_embree:
+                engines['embree'] = g.trimesh.ray.ray_pyembree.RayMeshIntersector(
+                    mesh)
+
+            first = {}
+            for name, engine in engines.items():
+                tic = g.time.time()
+                first[name] = engine.intersects_id(
+                    ray_origins=origins,
+                    ray_directions=vectors,
+                    multiple_hits=False)
+                rps = count / (g.time.time() - tic)
+                g.log.info('%s: %.0f rays/second with %s',
+                           mesh.metadata['file_name'],
+                           rps,
+                           name)
+
+            # the same rays should hit something
+            assert (set(first['bvh'][1]) == set(first['rtree'][1]))
+
+            # both broad phases run the same narrow phase
+            # so the hit locations should be the same
+            assert (set(zip(*first['bvh'])) == set(zip(*first['rtree'])))
+
+            # first hits should be in the same order as all hits
+            tri, ray = engines['bvh'].intersects_id(
+                ray_origins=origins,
+                ray_directions=vectors,
+                multiple_hits=True)[:2]
+            position = {k: i for i, k in enumerate(zip(tri, ray))}
+            order = [position[k] for k in zip(*first['bvh'][:2])]
+            assert (g.np.diff(order) > 0).all()
+
+    def test_bvh(self):
+        from trimesh.ray.ray_bvh import BVH
+
+        # a BVH over single points with one primitive per leaf
+        points = g.random((1000, 3))
+        tree = BVH(g.np.stack((points, points), axis=1), leaf_size=1)
+
+        # every primitive should be in exactly one leaf
+        assert (g.np.sort(tree.order) == g.np.arange(len(points))).all()
+        # parent boxes should contain child boxes
+        parent = (g.np.arange(1, len(tree.node_bounds)) - 1) // 2
+        assert (tree.node_bounds[parent, 0] <=
+                tree.node_bounds[1:, 0]).all()
+        assert (tree.node_bounds[parent, 1] >=
+                tree.node_bounds[1:, 1]).all()
+
+        # a ray pointing directly at each point should
+        # return that point as a candidate
+        origins = points - [0, 0, 10]
+        vectors = g.np.tile([0, 0, 1.0], (len(points), 1))
+        candidates, ray_id = tree.ray_candidates(origins, vectors)
+        assert set(zip(ray_id, candidates)).issuperset(
+            zip(range(len(points)), range(len(points))))
+
+        # rays pointing away should not hit anything
+        candidates, ray_id = tree.ray_candidates(origins, -vectors)
+        assert len(candidates) == 0
+
     def test_contains(self):
         scale = 1.5
         for use_embree in [True, False]:
@@ -34,6 +34,83 @@ class RegistrationTest(g.unittest.TestCase):
             X, m, scale=False)
         assert(cost < 0.01)
 
+    def test_icp_field(self):
+        # ICP against a distance field should also align
+        m = g.trimesh.creation.box()
+        X = m.sample(100) + [0.1, 0.1, 0.1]
+        matrix, transformed, cost = g.trimesh.registration.icp(
+            X, m, scale=False, field=True)
+        assert cost < 0.01
+        check = g.trimesh.registration.icp(X, m, scale=False)
+        assert g.np.allclose(matrix, check[0], atol=1e-3)
+
+    def test_icp_plane(self):
+        # point to plane should converge in fewer iterations
+        m = g.trimesh.creation.box().subdivide()
+        X = m.sample(500)
+        matrix = g.trimesh.transformations.rotation_matrix(
+            g.np.radians(5.0), [1, 1, 0])
+        matrix[:3, 3] = [0.05, 0.02, -0.03]
+        X = g.trimesh.transform_points(X, matrix)
+
+        result = {}
+        for method in ['point', 'plane']:
+            for iterations in range(1, 50):
+                transform, transformed, cost = g.trimesh.registration.icp(
+                    X, m, method=method,
+                    max_iterations=iterations, scale=False)
+                if g.np.allclose(transform, g.np.linalg.inv(matrix),
+                                 atol=1e-4):
+                    break
+            result[method] = iterations
+        g.log.info('iterations to converge: %s', str(result))
+        assert result['plane'] < result['point']
+
+        # point to plane needs normals from a mesh
+        with self.assertRaises(ValueError):
+            g.trimesh.registration.icp(X, m.vertices, method='plane')
+
+    def test_icp_robust(self):
+        # outliers shouldn't move a robust alignment
+        state = g.np.random.RandomState(seed=7)
+        m = g.trimesh.creation.box()
+        # seeded surface samples
+        face = state.choice(len(m.faces), size=500,
+                            p=m.area_faces / m.area)
+        barycentric = state.random_sample((500, 2))
+        flip = barycentric.sum(axis=1) > 1.0
+        barycentric[flip] = 1.0 - barycentric[flip]
+        X = g.trimesh.triangles.barycentric_to_points(
+            m.triangles[face], barycentric)
+        matrix = g.trimesh.transformations.translation_matrix(
+            [0.05, 0.02, 0.0])
+        X = g.trimesh.transform_points(X, matrix)
+        outliers = (state.random_sample((50, 3)) + 2.0) * 3.0
+        X = g.np.vstack((X, outliers))
+
+        for kwargs in [{'kernel': 'huber'},
+                       {'kernel': 'tukey'},
+                       {'trim': 0.85},
+                       {'kernel': 'tukey', 'method': 'plane'}]:
+            transform, transformed, cost = g.trimesh.registration.icp(
+                X, m, max_iterations=50, scale=False, **kwargs)
+            error = g.np.linalg.norm(
+                transform[:3, 3] + matrix[:3, 3])
+            g.log.info('%s translation error %f', str(kwargs), error)
+            assert error < 0.01
+
+    def test_icp_cloud(self):
+        # a point cloud target should reuse its tree
+        points = (g.np.random.random((1000, 3)) - .5) * 10
+        cloud = g.trimesh.PointCloud(points)
+        tree = cloud.kdtree
+        matrix = g.trimesh.transformations.translation_matrix(
+            [0.001, 0, 0])
+        moved = g.trimesh.transform_points(points[:100], matrix)
+        result = g.trimesh.registration.icp(moved, cloud)
+        assert cloud.kdtree is tree
+        assert g.np.allclose(result[1], points[:100])
+
     def test_icp_points(self):
         # see if ICP alignment works with point clouds
         # create random points in space
@@ -107,6 +184,38 @@ class RegistrationTest(g.unittest.TestCase):
 
         assert distance.mean() < noise
 
+    def test_mesh_batch(self):
+        noise = .05
+        extents = [6, 12, 3]
+        truth = g.trimesh.creation.box(extents=extents)
+        scan = truth.subdivide().subdivide().permutate.noise(noise)
+        transform = g.trimesh.transformations.random_rotation_matrix()
+        transform[:3, 3] = (g.np.random.random(3) - .5) * 100
+        scan.apply_transform(transform)
+
+        for kwargs in [{}, {'workers': 4}, {'prune': None}]:
+            tic = g.time.time()
+            a_to_b, cost = truth.register(scan, batch=True, **kwargs)
+            g.log.info('batched registration %s in %.3fs',
+                       str(kwargs), g.time.time() - tic)
+            check = truth.copy()
+            check.apply_transform(a_to_b)
+            distance = check.nearest.on_surface(scan.vertices)[1]
+            assert distance.max() < (noise * 2)
+
+    def test_procrustes_batch(self):
+        # stacked procrustes should match one at a time
+        points = (g.np.random.random((3, 100, 3)) - .5) * 10
+        matrices = [g.trimesh.transformations.random_rotation_matrix()
+                    for i in range(3)]
+        target = g.np.array([g.trimesh.transform_points(p, m)
+                             for p, m in zip(points, matrices)])
+        matrix, transformed, cost = \
+            g.trimesh.registration._procrustes_batch(points, target)
+        assert g.np.allclose(matrix, matrices)
+        assert g.np.allclose(transformed, target)
+        assert (cost < 1e-10).all()
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -20,6 +20,32 @@ class SampleTest(g.unittest.TestCase):
         distance = m.nearest.signed_distance(even)
         assert (g.np.abs(distance) < g.trimesh.tol.merge).all()
 
+    def test_even_seed(self):
+        m = g.get_mesh('featuretype.STL')
+
+        # a seed should make samples reproducible
+        a, ai = g.trimesh.sample.sample_surface_even(m, 500, seed=3)
+        b, bi = g.trimesh.sample.sample_surface_even(m, 500, seed=3)
+        assert g.np.allclose(a, b)
+        assert (ai == bi).all()
+        c, _ = g.trimesh.sample.sample_surface_even(m, 500, seed=4)
+        assert not g.np.allclose(a[:len(c)], c[:len(a)])
+
+        # face indexes should be for the face each point is on
+        assert len(a) <= 500
+        assert len(a) == len(ai)
+        barycentric = g.trimesh.triangles.points_to_barycentric(
+            m.triangles[ai], a)
+        assert (barycentric > -1e-8).all()
+
+        # no two samples should be closer than radius
+        radius = 0.5
+        a, _ = g.trimesh.sample.sample_surface_even(
+            m, 100, radius=radius, seed=3)
+        from scipy.spatial import cKDTree
+        distance, _ = cKDTree(a).query(a, k=2)
+        assert (distance[:, 1] > radius).all()
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
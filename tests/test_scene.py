@@ -259,9 +259,175 @@ class SceneTests(g.unittest.TestCase):
         set_dbl = set([len(i) for i in r.duplicate_nodes])
         assert set_ori == set_dbl
 
+    def test_dump_instanced(self):
+        """
+        A concatenated dump should match concatenating copies.
+        """
+        s = g.get_mesh('cycloidal.3DXML')
+        # add many instances of one mesh with a reflection
+        bolt = g.trimesh.creation.box()
+        bolt.visual.face_colors = [255, 0, 0, 255]
+        for i in range(100):
+            matrix = g.trimesh.transformations.random_rotation_matrix()
+            matrix[:3, 3] = g.np.random.random(3)
+            if i % 2 == 0:
+                matrix[:3, 0] *= -1
+            if i == 0:
+                s.add_geometry(bolt, geom_name='bolt', transform=matrix)
+            else:
+                s.graph.update(frame_to='bolt_{}'.format(i),
+                               matrix=matrix,
+                               geometry='bolt')
+
+        dumped = s.dump()
+        truth = g.trimesh.util.concatenate(dumped)
+        lazy = list(s.dump(lazy=True))
+        assert len(lazy) == len(dumped)
+
+        tic = g.time.time()
+        instanced = s.dump(concatenate=True)
+        g.log.info('instanced dump in %.3fs', g.time.time() - tic)
+
+        assert instanced.faces.shape == truth.faces.shape
+        # same surface so same area and volume
+        assert g.np.isclose(instanced.area, truth.area)
+        assert g.np.isclose(instanced.volume, truth.volume)
+        assert g.np.allclose(instanced.bounds, truth.bounds)
+        assert g.np.allclose(
+            g.np.sort(instanced.triangles_center, axis=0),
+            g.np.sort(truth.triangles_center, axis=0))
+        # windings of reflected instances should be flipped
+        box = instanced.faces[-12 * 100:]
+        assert g.np.allclose(
+            g.trimesh.triangles.normals(instanced.vertices[box])[0],
+            instanced.face_normals[-12 * 100:])
+
 
 class GraphTests(g.unittest.TestCase):
 
+    def test_forest_arrays(self):
+        """
+        Transforms from the array backed forest should match
+        multiplying matrices along the path between frames.
+        """
+        state = g.np.random.RandomState(seed=4)
+        forest = g.trimesh.scene.transforms.TransformForest()
+        parents = {}
+        matrices = {}
+        # a random tree where every node's parent is older
+        for i in range(500):
+            name = 'node_{}'.format(i)
+            parent = 'world' if i == 0 else 'node_{}'.format(
+                state.randint(i))
+            matrices[name] = g.trimesh.transformations.random_rotation_matrix(
+                state.random_sample(3))
+            matrices[name][:3, 3] = state.random_sample(3)
+            parents[name] = parent
+            forest.update(frame_to=name,
+                          frame_from=parent,
+                          matrix=matrices[name],
+                          geometry='geometry_{}'.format(i % 3))
+
+        def truth(name):
+            # multiply down the path from the root
+            matrix = g.np.eye(4)
+            while name in parents:
+                matrix = g.np.dot(matrices[name], matrix)
+                name = parents[name]
+            return matrix
+
+        def check():
+            for name in parents:
+                assert g.np.allclose(forest[name][0], truth(name))
+            a, b = 'node_7', 'node_300'
+            assert g.np.allclose(
+                forest.get(frame_to=b, frame_from=a)[0],
+                g.np.dot(g.np.linalg.inv(truth(a)), truth(b)))
+        check()
+        assert len(forest.nodes) == 501
+        assert len(forest.nodes_geometry) == 500
+        assert forest['node_5'][1] == 'geometry_2'
+
+        # updating a node should only change its subtree
+        world = forest.world.copy()
+        matrices['node_3'] = g.trimesh.transformations.random_rotation_matrix()
+        forest.update('node_3', parents['node_3'], matrix=matrices['node_3'])
+        check()
+        changed = ~g.np.isclose(world, forest.world).all(axis=(1, 2))
+        subtree = [forest.nodes.tolist().index(n) for n in parents
+                   if 'node_3' in self._ancestors(parents, n)]
+        assert set(g.np.nonzero(changed)[0]) == set(subtree)
+
+        # moving a node moves its subtree
+        other = next(n for n in parents
+                     if 'node_3' not in self._ancestors(parents, n))
+        parents['node_3'] = other
+        forest.update('node_3', other, matrix=matrices['node_3'])
+        check()
+
+        # an edge which would close a loop detaches the parent
+        child = next(n for n in parents if n != 'node_3' and
+                     'node_3' in self._ancestors(parents, n))
+        forest.update('node_3', child, matrix=g.np.eye(4))
+        parents['node_3'] = child
+        parents.pop(child)
+        assert g.np.allclose(forest.get('node_3', child)[0], g.np.eye(4))
+        # the child is now a root with no parent edge
+        assert all(e[1] != child for e in forest.to_edgelist())
+
+        # the edge list should round trip
+        edges = forest.to_edgelist()
+        assert len(edges) == 499
+        g.json.dumps(edges)
+        copied = g.trimesh.scene.transforms.TransformForest()
+        copied.from_edgelist(edges)
+        # geometry is saved on edges so roots don't keep it
+        assert (set(copied.nodes_geometry) ==
+                set(forest.nodes_geometry) - {child})
+        assert (sorted(str(e) for e in copied.to_edgelist()) ==
+                sorted(str(e) for e in edges))
+        for name in parents:
+            if 'world' in self._ancestors(parents, name):
+                assert g.np.allclose(copied[name][0], forest[name][0])
+        assert g.np.allclose(forest.copy().world, forest.world)
+
+        # disconnected frames should raise
+        forest.update('b', 'a', matrix=g.np.eye(4))
+        with self.assertRaises(ValueError):
+            forest.get('b', 'world')
+
+    def _ancestors(self, parents, name):
+        result = [name]
+        while name in parents:
+            name = parents[name]
+            result.append(name)
+        return result
+
+    def test_forest_large(self):
+        """
+        Benchmark building and querying a large forest.
+        """
+        count = 50000
+        matrix = g.trimesh.transformations.translation_matrix([1, 0, 0])
+        tic = [g.time.time()]
+        forest = g.trimesh.scene.transforms.TransformForest()
+        for i in range(count):
+            forest.update(frame_to=i,
+                          frame_from='world' if i < 100 else i // 100,
+                          matrix=matrix,
+                          geometry='bolt')
+        tic.append(g.time.time())
+        for node in forest.nodes_geometry:
+            forest.get(node)
+        tic.append(g.time.time())
+        g.log.info('built %d node forest in %.3fs, queried in %.3fs',
+                   count, *g.np.diff(tic))
+
+        # every level adds one translation
+        assert g.np.allclose(forest.get(12345)[0][:3, 3], [3, 0, 0])
+        assert g.np.allclose(forest.get(1234)[0][:3, 3], [2, 0, 0])
+        assert g.np.allclose(forest.get(12)[0][:3, 3], [1, 0, 0])
+
     def test_forest(self):
         g = EnforcedForest(assert_forest=True)
         for i in range(5000):
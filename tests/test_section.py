@@ -108,6 +108,107 @@ class SectionTest(g.unittest.TestCase):
                 assert g.np.isclose(back_3D.vertices[:, 2].mean(),
                                     z_levels[index])
 
+    def test_multiplane(self):
+        """
+        Slicing every layer at once should match slicing
+        one plane at a time, including layers through vertices.
+        """
+        mesh = g.get_mesh('featuretype.STL')
+        normal = g.trimesh.unitize([0.1, 0.2, 1.0])
+        heights = g.np.dot(mesh.vertices, normal)
+        heights = g.np.append(
+            heights[:200],
+            g.np.linspace(heights.min() - 1, heights.max() + 1, 500))
+        heights = g.np.random.permutation(heights)
+
+        tic = [g.time.time()]
+        lines, transforms, faces = g.trimesh.intersections.mesh_multiplane(
+            mesh=mesh,
+            plane_origin=[0, 0, 0],
+            plane_normal=normal,
+            heights=heights)
+        tic.append(g.time.time())
+        threaded = g.trimesh.intersections.mesh_multiplane(
+            mesh=mesh,
+            plane_origin=[0, 0, 0],
+            plane_normal=normal,
+            heights=heights,
+            workers=4)
+        tic.append(g.time.time())
+
+        for index, height in enumerate(heights):
+            check, check_faces = g.trimesh.intersections.mesh_plane(
+                mesh=mesh,
+                plane_normal=normal,
+                plane_origin=normal * height,
+                return_faces=True)
+            check = g.trimesh.transform_points(
+                check.reshape((-1, 3)),
+                g.np.linalg.inv(transforms[index]))
+            assert g.np.allclose(check[:, 2], 0.0)
+            assert g.np.allclose(check[:, :2].reshape((-1, 2, 2)),
+                                 lines[index])
+            assert (check_faces == faces[index]).all()
+
+            assert g.np.allclose(threaded[0][index], lines[index])
+            assert (threaded[2][index] == faces[index]).all()
+        tic.append(g.time.time())
+
+        g.log.info('sliced %d layers in %.3fs, threaded in %.3fs, '
+                   'one plane at a time in %.3fs',
+                   len(heights), *g.np.diff(tic))
+
+    def test_multiplane_polygons(self):
+        """
+        Stitching layers into polygons directly should match
+        the polygons of each Path2D section.
+        """
+        mesh = g.get_mesh('featuretype.STL')
+        heights = g.np.linspace(mesh.bounds[0][2] + 0.01,
+                                mesh.bounds[1][2] - 0.01, 20)
+        paths = mesh.section_multiplane(plane_origin=[0, 0, 0],
+                                        plane_normal=[0, 0, 1],
+                                        heights=heights)
+        lines = g.trimesh.intersections.mesh_multiplane(
+            mesh=mesh,
+            plane_origin=[0, 0, 0],
+            plane_normal=[0, 0, 1],
+            heights=heights)[0]
+
+        polygons = g.trimesh.path.polygons
+        for workers in [0, 2]:
+            layers = polygons.layers_to_polygons(lines, workers=workers)
+            # should be a generator rather than a list
+            assert not isinstance(layers, list)
+            for path, layer in zip(paths, layers):
+                assert len(layer) == len(path.polygons_full)
+                assert g.np.isclose(sum(p.area for p in layer),
+                                    path.area)
+
+        # a segment soup with a dangling segment and a square
+        square = g.np.array([[0, 0], [1, 0], [1, 1], [0, 1]],
+                            dtype=g.np.float64)
+        soup = g.np.stack((square, g.np.roll(square, -1, axis=0)),
+                          axis=1)
+        soup = g.np.vstack((g.np.random.permutation(soup[:, ::-1]),
+                            [[[5, 5], [6, 6]]]))
+        loops = g.trimesh.path.segments.stitch(soup)
+        assert len(loops) == 1
+        assert g.np.allclose(loops[0][0], loops[0][-1])
+        assert len(loops[0]) == 5
+        assert g.np.isclose(
+            polygons.segments_to_polygons(soup)[0].area, 1.0)
+
+        # two squares touching at a corner should both be kept
+        touching = g.np.vstack((soup[:-1], soup[:-1] + [1, 1]))
+        touching = g.np.random.permutation(touching)
+        loops = g.trimesh.path.segments.stitch(touching)
+        assert len(loops) == 2
+        assert all(len(loop) == 5 for loop in loops)
+        result = polygons.segments_to_polygons(touching)
+        assert len(result) == 2
+        assert g.np.allclose([p.area for p in result], 1.0)
+
 
 class PlaneLine(g.unittest.TestCase):
 
@@ -54,6 +54,115 @@ class SmoothTest(g.unittest.TestCase):
         assert g.np.isclose(f.volume, m.volume, rtol=0.1)
         assert g.np.isclose(d.volume, m.volume, rtol=0.1)
 
+    def test_operator(self):
+        """
+        Operators should be averages of neighbors and be
+        cached while only vertices change.
+        """
+        m = g.trimesh.creation.icosphere(3)
+        m.vertices += g.np.random.random(m.vertices.shape) * 0.01
+
+        for kwargs in [{'equal_weight': True},
+                       {'equal_weight': False},
+                       {'cotangent': True}]:
+            lap = g.trimesh.smoothing.laplacian_calculation(m, **kwargs)
+            assert lap.format == 'csr'
+            assert g.np.allclose(lap.sum(axis=1), 1.0)
+            # only neighbors should have weights
+            assert (lap.diagonal() == 0.0).all()
+            row, col = lap.nonzero()
+            edges = g.np.sort(g.np.column_stack((row, col)), axis=1)
+            assert len(g.trimesh.grouping.unique_rows(
+                edges)[0]) == len(m.edges_unique)
+
+        # equal weights are the inverse of the neighbor count
+        lap = m.laplacian_operator
+        counts = [len(n) for n in m.vertex_neighbors]
+        assert g.np.allclose(lap.max(axis=1).toarray().ravel(),
+                             1.0 / g.np.array(counts))
+
+        # the public calculation should not hand out the cache
+        copied = g.trimesh.smoothing.laplacian_calculation(m)
+        assert copied is not lap
+        copied.data[:] = 0.0
+        assert g.np.allclose(lap.sum(axis=1), 1.0)
+
+        # moving vertices should keep the same operator
+        m.vertices = m.vertices + 1.0
+        assert m.laplacian_operator is lap
+        # changing faces should not
+        m.faces = m.faces[:, ::-1]
+        assert m.laplacian_operator is not lap
+
+    def test_implicit(self):
+        """
+        Implicit smoothing should be stable for large steps and
+        reuse the factorization of the cached operator.
+        """
+        m = g.trimesh.creation.icosphere(3)
+        noise = g.np.random.random(m.vertices.shape) * 0.05
+        original = m.vertices.copy()
+
+        factors = g.trimesh.smoothing._factors
+        for lamb in [0.5, 50.0]:
+            s = m.copy()
+            s.vertices = original + noise
+            g.trimesh.smoothing.filter_implicit(s, lamb=lamb)
+            # the noise should be reduced and nothing should explode
+            assert g.np.isfinite(s.vertices).all()
+            radius = g.np.linalg.norm(s.vertices, axis=1)
+            noisy = g.np.linalg.norm(original + noise, axis=1)
+            assert radius.std() < noisy.std()
+
+        # the same topology and step should reuse a factorization
+        count = len(factors)
+        lap = m.laplacian_operator
+        for _ in range(3):
+            m.vertices = original + g.np.random.random(
+                original.shape) * 0.05
+            g.trimesh.smoothing.filter_implicit(m, lamb=2.0)
+        assert m.laplacian_operator is lap
+        assert len(factors) == count + 1
+
+        # factorizations are removed with the operator
+        del lap
+        m.faces = m.faces[:, ::-1]
+        assert m.laplacian_operator is not None
+        assert len(factors) == count
+
+    def test_stack(self):
+        """
+        Smoothing a stack of frames should match smoothing
+        each frame as its own mesh.
+        """
+        m = g.trimesh.creation.icosphere(3)
+        frames = g.np.array([m.vertices + g.np.random.random(
+            m.vertices.shape) * 0.05 for _ in range(5)])
+
+        for method, function, kwargs in [
+                ('laplacian', 'filter_laplacian', {'lamb': 0.3}),
+                ('humphrey', 'filter_humphrey', {'iterations': 4}),
+                ('taubin', 'filter_taubin', {'nu': 0.53}),
+                ('implicit', 'filter_implicit', {'lamb': 5.0})]:
+            smoothed = g.trimesh.smoothing.filter_stack(
+                frames, faces=m.faces, method=method, **kwargs)
+            assert smoothed.shape == frames.shape
+            for frame, check in zip(frames, smoothed):
+                truth = g.trimesh.Trimesh(frame, m.faces, process=False)
+                getattr(g.trimesh.smoothing, function)(truth, **kwargs)
+                assert g.np.allclose(truth.vertices, check)
+
+        # an operator can be passed instead of faces
+        smoothed = g.trimesh.smoothing.filter_stack(
+            frames, laplacian_operator=m.laplacian_operator)
+        assert g.np.allclose(smoothed, g.trimesh.smoothing.filter_stack(
+            frames, faces=m.faces))
+
+        with self.assertRaises(ValueError):
+            g.trimesh.smoothing.filter_stack(frames)
+        with self.assertRaises(ValueError):
+            g.trimesh.smoothing.filter_stack(frames, m.faces, 'wat')
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -140,6 +140,34 @@ class UtilTests(unittest.TestCase):
                             a.volume * count)
         assert a.md5() == hA
 
+    def test_concat_many(self):
+        """
+        Benchmark concatenating many small meshes.
+        """
+        count = 5000
+        box = g.trimesh.creation.box()
+        box.visual.face_colors = [255, 0, 0, 255]
+        meshes = [box.copy() for i in range(count)]
+        for i, m in enumerate(meshes):
+            m.apply_translation([i * 2.0, 0, 0])
+
+        tic = g.time.time()
+        r = g.trimesh.util.concatenate(meshes)
+        g.log.info('concatenated %d meshes in %.3fs',
+                   count, g.time.time() - tic)
+
+        assert r.faces.shape == (count * 12, 3)
+        assert r.vertices.shape == (count * 8, 3)
+        assert r.visual.face_colors.shape == (count * 12, 4)
+        assert g.np.isclose(r.volume, box.volume * count)
+        assert g.np.allclose(r.faces[-12:] - (count - 1) * 8,
+                             box.faces)
+
+        # a single mesh shouldn't share vertices with the result
+        single = g.trimesh.util.concatenate(box)
+        single.vertices[0] += 1.0
+        assert not g.np.allclose(single.vertices, box.vertices)
+
 
 class IOTest(unittest.TestCase):
 
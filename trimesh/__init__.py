@@ -11,10 +11,12 @@ and analysis, in the style of the Polygon object in the Shapely library.
 # current version
 from .version import __version__
 
+# private so it isn't exported as `trimesh.sys`
+from sys import version_info as _version_info
+
 # geometry objects
 from .base import Trimesh
 from .points import PointCloud
-from .scene.scene import Scene
 
 # utility functions
 from .util import unitize
@@ -23,28 +25,71 @@ from .transformations import transform_points
 # general numeric tolerances
 from .constants import tol
 
-# loader functions
-from .exchange.load import (load,
-                            load_mesh,
-                            load_path,
-                            load_remote,
-                            available_formats)
+# names which are imported from a submodule
+# only when they are first accessed
+_lazy = {'Scene': '.scene.scene',
+         'load': '.exchange.load',
+         'load_mesh': '.exchange.load',
+         'load_many': '.exchange.load',
+         'load_path': '.exchange.load',
+         'load_remote': '.exchange.load',
+         'available_formats': '.exchange.load'}
+
+
+def __getattr__(name):
+    """
+    Import submodules and the objects in `_lazy` on first
+    access, so `import trimesh` doesn't have to import every
+    module and optional dependency.
+    """
+    import importlib
+    import importlib.util
+    if name in _lazy:
+        value = getattr(importlib.import_module(
+            _lazy[name], __name__), name)
+    elif (not name.startswith('_') and
+          importlib.util.find_spec('.' + name, __name__) is not None):
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError(
+            "module 'trimesh' has no attribute '{}'".format(name))
+    # store the value so we are only called once per name
+    globals()[name] = value
+    return value
+
 
-# avoid a circular import in trimesh.base
-from . import primitives
+if _version_info < (3, 7):
+    # module level __getattr__ requires PEP 562
+    from .scene.scene import Scene
+    from .exchange.load import (load,
+                                load_mesh,
+                                load_many,
+                                load_path,
+                                load_remote,
+                                available_formats)
+    from .exchange import export
+    # import submodules which used to be imported by base
+    from . import (ray, poses, graph, voxel, repair, convex,
+                   remesh, bounds, nsphere, boolean, permutate,
+                   proximity, collision, curvature, smoothing,
+                   comparison, registration, decomposition,
+                   intersections)
+    # avoid a circular import in trimesh.base
+    from . import primitives
 
 # explicitly list imports in __all__
 # as otherwise flake8 gets mad
-__all__ = [__version__,
-           Trimesh,
-           PointCloud,
-           Scene,
-           unitize,
-           tol,
-           load,
-           load_mesh,
-           load_path,
-           load_remote,
-           primitives,
-           transform_points,
-           available_formats]
+__all__ = ['__version__',
+           'Trimesh',
+           'PointCloud',
+           'Scene',
+           'unitize',
+           'tol',
+           'load',
+           'load_mesh',
+           'load_many',
+           'load_path',
+           'load_remote',
+           'primitives',
+           'transform_points',
+           'available_formats']
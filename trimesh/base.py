@@ -9,42 +9,43 @@ import numpy as np
 
 import copy
 
-from . import ray
 from . import util
 from . import units
-from . import poses
-from . import graph
-from . import voxel
 from . import sample
-from . import repair
-from . import convex
-from . import remesh
-from . import bounds
 from . import caching
 from . import inertia
-from . import nsphere
-from . import boolean
 from . import grouping
 from . import geometry
-from . import permutate
-from . import proximity
 from . import triangles
-from . import collision
-from . import curvature
-from . import smoothing
-from . import comparison
-from . import registration
-from . import decomposition
-from . import intersections
 from . import transformations
 
 from .visual import create_visual
-from .exchange.export import export_mesh
 from .constants import log, log_time, tol
 
-from .scene import Scene
 from .parent import Geometry
 
+# modules which are slow to import or import optional
+# dependencies are only imported when they are first used
+ray = util.LazyModule('.ray', __package__)
+poses = util.LazyModule('.poses', __package__)
+graph = util.LazyModule('.graph', __package__)
+voxel = util.LazyModule('.voxel', __package__)
+repair = util.LazyModule('.repair', __package__)
+convex = util.LazyModule('.convex', __package__)
+remesh = util.LazyModule('.remesh', __package__)
+bounds = util.LazyModule('.bounds', __package__)
+nsphere = util.LazyModule('.nsphere', __package__)
+boolean = util.LazyModule('.boolean', __package__)
+permutate = util.LazyModule('.permutate', __package__)
+proximity = util.LazyModule('.proximity', __package__)
+collision = util.LazyModule('.collision', __package__)
+curvature = util.LazyModule('.curvature', __package__)
+smoothing = util.LazyModule('.smoothing', __package__)
+comparison = util.LazyModule('.comparison', __package__)
+registration = util.LazyModule('.registration', __package__)
+decomposition = util.LazyModule('.decomposition', __package__)
+intersections = util.LazyModule('.intersections', __package__)
+
 
 class Trimesh(Geometry):
 
@@ -108,7 +109,12 @@ class Trimesh(Geometry):
         # regenerated from self._data, but may be slow to calculate.
         # In order to maintain consistency
         # the cache is cleared when self._data.crc() changes
-        self._cache = caching.Cache(id_function=self._data.fast_hash)
+        # although values which declare that they only depend on
+        # faces or vertices are kept if only the other changed
+        self._cache = caching.Cache(
+            id_function=self._data.fast_hash,
+            id_parts=self._data.hashes,
+            depends=caching.depends_table(type(self)))
         self._cache.update(initial_cache)
 
         # if validate we are allowed to alter the mesh silently
@@ -287,7 +293,7 @@ class Trimesh(Geometry):
             values = geometry.triangulate_quads(values)
         self._data['faces'] = values
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def faces_sparse(self):
         """
         A sparse matrix representation of the faces.
@@ -653,7 +659,7 @@ class Trimesh(Geometry):
         populate = self.principal_inertia_components
         return self._cache['principal_inertia_vectors']
 
-    @caching.cache_decorator
+    @caching.cache_decorator(persist=True)
     def principal_inertia_transform(self):
         """
         A transform which moves the current mesh so the principal
@@ -678,7 +684,8 @@ class Trimesh(Geometry):
 
         return transform
 
-    @caching.cache_decorator
+    @caching.cache_decorator(persist=['symmetry_axis',
+                                      'symmetry_section'])
     def symmetry(self):
         """
         Check whether a mesh has rotational symmetry.
@@ -752,6 +759,23 @@ class Trimesh(Geometry):
         tree = triangles.bounds_tree(self.triangles)
         return tree
 
+    @caching.cache_decorator
+    def triangles_bvh(self):
+        """
+        A flattened, array- backed bounding volume hierarchy
+        containing each face of the mesh.
+
+        Returns
+        ----------
+        bvh : trimesh.ray.ray_bvh.BVH
+          Tree of the axis aligned bounds of each triangle
+        """
+        triangles = self.triangles.view(np.ndarray)
+        bvh = ray.ray_bvh.BVH(np.stack((triangles.min(axis=1),
+                                        triangles.max(axis=1)),
+                                       axis=1))
+        return bvh
+
     @caching.cache_decorator
     def triangles_center(self):
         """
@@ -778,7 +802,7 @@ class Trimesh(Geometry):
         crosses = triangles.cross(self.triangles)
         return crosses
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def edges(self):
         """
         Edges of the mesh (derived from faces).
@@ -793,7 +817,7 @@ class Trimesh(Geometry):
         self._cache['edges_face'] = index
         return edges
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def edges_face(self):
         """
         Which face does each edge belong to.
@@ -806,7 +830,7 @@ class Trimesh(Geometry):
         populate = self.edges
         return self._cache['edges_face']
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def edges_unique(self):
         """
         The unique edges of the mesh.
@@ -838,7 +862,7 @@ class Trimesh(Geometry):
         length = np.linalg.norm(vector, axis=1)
         return length
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def edges_unique_inverse(self):
         """
         Return the inverse required to reproduce
@@ -855,7 +879,7 @@ class Trimesh(Geometry):
         populate = self.edges_unique
         return self._cache['edges_unique_inverse']
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def edges_sorted(self):
         """
         Edges sorted along axis 1
@@ -868,7 +892,7 @@ class Trimesh(Geometry):
         edges_sorted = np.sort(self.edges, axis=1)
         return edges_sorted
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def edges_sparse(self):
         """
         Edges in sparse bool COO graph format where connected
@@ -883,7 +907,7 @@ class Trimesh(Geometry):
                                     count=len(self.vertices))
         return sparse
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def body_count(self):
         """
         How many connected groups of vertices exist in this mesh.
@@ -904,7 +928,7 @@ class Trimesh(Geometry):
         self._cache['vertices_component_label'] = labels
         return count
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def faces_unique_edges(self):
         """
         For each face return which indexes in mesh.unique_edges constructs
@@ -938,7 +962,7 @@ class Trimesh(Geometry):
         result = self._cache['edges_unique_inverse'].reshape((-1, 3))
         return result
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def euler_number(self):
         """
         Return the Euler characteristic (a topological invariant) for the mesh
@@ -955,7 +979,7 @@ class Trimesh(Geometry):
                     len(self.faces))
         return euler
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def referenced_vertices(self):
         """
         Which vertices in the current mesh are referenced by a face.
@@ -1180,7 +1204,8 @@ class Trimesh(Geometry):
                              **kwargs)
         return meshes
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'],
+                             persist=['face_adjacency_edges'])
     def face_adjacency(self):
         """
         Find faces that share an edge, which we call here 'adjacent'.
@@ -1221,7 +1246,7 @@ class Trimesh(Geometry):
         self._cache['face_adjacency_edges'] = edges
         return adjacency
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def face_adjacency_edges(self):
         """
         Returns the edges that are shared by the adjacent faces.
@@ -1282,7 +1307,7 @@ class Trimesh(Geometry):
         are_convex = self.face_adjacency_projections < tol.merge
         return are_convex
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def face_adjacency_unshared(self):
         """
         Return the vertex index of the two vertices not in the shared
@@ -1325,7 +1350,7 @@ class Trimesh(Geometry):
         populate = self.face_adjacency_radius
         return self._cache['face_adjacency_span']
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def vertex_adjacency_graph(self):
         """
         Returns a networkx graph representing the vertices and their connections
@@ -1351,17 +1376,17 @@ class Trimesh(Geometry):
         adjacency_g = graph.vertex_adjacency_graph(mesh=self)
         return adjacency_g
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def vertex_neighbors(self):
         """
-        The vertex neighbors of each vertex of the mesh, determined from
-        the cached vertex_adjacency_graph, if already existent.
+        The vertex neighbors of each vertex of the mesh, determined
+        from vertex_neighbors_csr.
 
         Returns
         ----------
-        vertex_neighbors : (len(self.vertices),) int
+        vertex_neighbors : (len(self.vertices),) list of lists of int
           Represents immediate neighbors of each vertex along
-          the edge of a triangle
+          the edge of a triangle, sorted by index
 
         Examples
         ----------
@@ -1372,12 +1397,86 @@ class Trimesh(Geometry):
         >>> mesh.vertex_neighbors[0]
         [1,2,3,4]
         """
-        graph = self.vertex_adjacency_graph
-        neighbors = [list(graph.neighbors(i)) for
-                     i in range(len(self.vertices))]
-        return np.array(neighbors)
+        offsets, indices = self.vertex_neighbors_csr
+        indices = indices.tolist()
+        neighbors = [indices[a:b] for a, b in
+                     zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        return neighbors
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
+    def vertex_neighbors_csr(self):
+        """
+        The neighbors of each vertex in compressed sparse row
+        form, which is much smaller and faster to create than
+        lists or a graph for large meshes.
+
+        Returns
+        ----------
+        offsets : (len(self.vertices) + 1,) int
+          Neighbors of vertex i are indices[offsets[i]:offsets[i + 1]]
+        indices : (2 * len(self.edges_unique),) int
+          Neighbors of every vertex, sorted by vertex then index
+
+        Examples
+        ----------
+        >>> mesh = trimesh.primitives.Box()
+        >>> offsets, indices = mesh.vertex_neighbors_csr
+        >>> indices[offsets[0]:offsets[1]]
+        array([1, 2, 3, 4])
+        """
+        csr = graph.neighbors_csr(edges=self.edges_unique,
+                                  count=len(self.vertices))
+        return csr
+
+    @caching.cache_decorator(depends=['faces'])
+    def vertex_faces_csr(self):
+        """
+        The faces which include each vertex in compressed
+        sparse row form.
+
+        Returns
+        ----------
+        offsets : (len(self.vertices) + 1,) int
+          Faces of vertex i are indices[offsets[i]:offsets[i + 1]]
+        indices : (3 * len(self.faces),) int
+          Index of faces, sorted by vertex then face
+
+        Examples
+        ----------
+        >>> mesh = trimesh.primitives.Box()
+        >>> offsets, indices = mesh.vertex_faces_csr
+        >>> mesh.faces[indices[offsets[0]:offsets[1]]]
+        """
+        csr = graph.vertex_faces_csr(faces=self.faces,
+                                     count=len(self.vertices))
+        return csr
+
+    @caching.cache_decorator(depends=['faces'])
+    def laplacian_operator(self):
+        """
+        A sparse operator which replaces every vertex with the
+        average of its neighbors, used for smoothing.
+
+        Only depends on faces so it is kept when vertices are
+        changed, along with any implicit smoothing systems
+        factorized from it.
+
+        Returns
+        ----------
+        laplacian : (len(self.vertices), len(self.vertices)) float
+          Laplacian operator as a scipy.sparse.csr_matrix
+
+        Examples
+        ----------
+        >>> mesh = trimesh.primitives.Box()
+        >>> smoothed = mesh.laplacian_operator.dot(mesh.vertices)
+        """
+        laplacian = smoothing.edges_to_laplacian(
+            edges=self.edges_unique,
+            count=len(self.vertices))
+        return laplacian
+
+    @caching.cache_decorator(depends=['faces'])
     def is_winding_consistent(self):
         """
         Does the mesh have consistent winding or not.
@@ -1395,7 +1494,7 @@ class Trimesh(Geometry):
         populate = self.is_watertight
         return self._cache['is_winding_consistent']
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['faces'])
     def is_watertight(self):
         """
         Check if a mesh is watertight by making sure every edge is
@@ -1461,7 +1560,7 @@ class Trimesh(Geometry):
         is_convex = bool(convex.is_convex(self))
         return is_convex
 
-    @caching.cache_decorator
+    @caching.cache_decorator(depends=['vertices'])
     def kdtree(self):
         """
         Return a scipy.spatial.cKDTree of the vertices of the mesh.
@@ -1477,6 +1576,21 @@ class Trimesh(Geometry):
         tree = KDTree(self.vertices.view(np.ndarray))
         return tree
 
+    @caching.cache_decorator
+    def distance_field(self):
+        """
+        A sparse grid of signed distance and closest faces in
+        a narrow band around the surface, which can answer
+        repeated proximity queries such as those from ICP.
+
+        Returns
+        ---------
+        field : trimesh.proximity.DistanceField
+          Built with the default pitch and band
+        """
+        field = proximity.DistanceField(self)
+        return field
+
     def remove_degenerate_faces(self, height=tol.merge):
         """
         Remove degenerate faces (faces without 3 unique vertex indices)
@@ -1505,7 +1619,7 @@ class Trimesh(Geometry):
 
         return nondegenerate
 
-    @caching.cache_decorator
+    @caching.cache_decorator(persist=True)
     def facets(self):
         """
         Return a list of face indices for coplanar adjacent faces.
@@ -1865,7 +1979,8 @@ class Trimesh(Geometry):
     def section_multiplane(self,
                            plane_origin,
                            plane_normal,
-                           heights):
+                           heights,
+                           workers=None):
         """
         Return multiple parallel cross sections of the current
         mesh in 2D.
@@ -1879,6 +1994,8 @@ class Trimesh(Geometry):
         heights : (n,) float
           Each section is offset by height along
           the plane normal.
+        workers : None or int
+          Number of threads to slice ranges of layers with
 
         Returns
         ---------
@@ -1894,7 +2011,8 @@ class Trimesh(Geometry):
             mesh=self,
             plane_normal=plane_normal,
             plane_origin=plane_origin,
-            heights=heights)
+            heights=heights,
+            workers=workers)
 
         # turn the line segments into Path2D objects
         paths = [None] * len(lines)
@@ -1936,7 +2054,7 @@ class Trimesh(Geometry):
 
         return new_mesh
 
-    @caching.cache_decorator
+    @caching.cache_decorator(persist=True)
     def convex_hull(self):
         """
         Get a new Trimesh object representing the convex hull of
@@ -2061,23 +2179,34 @@ class Trimesh(Geometry):
                 np.array([self._center_mass, ]),
                 matrix)[0]
 
+        # normals are transformed by the inverse transpose
+        # which is correct for non- uniform scaling, but a
+        # singular transform has no inverse so the normals
+        # are dropped and recomputed from the new vertices
+        normal_matrix = None
+        if (('face_normals' in self._cache or
+             'vertex_normals' in self._cache) and
+                abs(np.linalg.det(matrix[:3, :3])) > tol.zero):
+            normal_matrix = np.eye(4)
+            normal_matrix[:3, :3] = np.linalg.inv(matrix[:3, :3]).T
+
         # preserve face normals if we have them stored
         new_face_normals = None
-        if 'face_normals' in self._cache:
-            # transform face normals by rotation component
+        if normal_matrix is not None and 'face_normals' in self._cache:
             new_face_normals = util.unitize(
                 transformations.transform_points(
                     self.face_normals,
-                    matrix=matrix,
+                    matrix=normal_matrix,
                     translate=False))
 
         # preserve vertex normals if we have them stored
         new_vertex_normals = None
-        if 'vertex_normals' in self._cache:
+        if (normal_matrix is not None and
+                'vertex_normals' in self._cache):
             new_vertex_normals = util.unitize(
                 transformations.transform_points(
                     self.vertex_normals,
-                    matrix=matrix,
+                    matrix=normal_matrix,
                     translate=False))
 
         # a test triangle pre and post transform
@@ -2112,27 +2241,25 @@ class Trimesh(Geometry):
 
         # assign the new values
         self.vertices = new_vertices
-        # may be None if we didn't have them previously
-        self.face_normals = new_face_normals
-        self.vertex_normals = new_vertex_normals
-
-        # preserve normals and topology in cache
-        # while dumping everything else
-        self._cache.clear(exclude=[
-            'face_normals',   # transformed by us
-            'face_adjacency',  # topological
-            'face_adjacency_edges',
-            'face_adjacency_unshared',
-            'edges',
-            'edges_sorted',
-            'edges_unique',
-            'edges_sparse',
-            'body_count',
-            'faces_unique_edges',
-            'euler_number',
-            'vertex_normals'])
-        # set the cache ID with the current hash value
-        self._cache.id_set()
+
+        # the cache keeps values which only depend on faces, such
+        # as `face_adjacency`, unless the winding was flipped
+        self._cache.verify()
+
+        # a reflection reverses normals computed from the faces
+        # unless the winding was flipped to compensate
+        if (np.linalg.det(matrix[:3, :3]) < 0) == (pre == post):
+            if new_face_normals is not None:
+                new_face_normals *= -1.0
+            if new_vertex_normals is not None:
+                new_vertex_normals *= -1.0
+
+        # store the transformed normals after the cache has dumped
+        # values that depend on vertices so they are kept
+        if new_face_normals is not None:
+            self._cache['face_normals'] = new_face_normals
+        if new_vertex_normals is not None:
+            self._cache['vertex_normals'] = new_vertex_normals
 
         log.debug('mesh transformed by matrix')
         return self
@@ -2146,6 +2273,11 @@ class Trimesh(Geometry):
         ----------
         pitch : float
           The edge length of a single voxel
+        method : str
+          How to find cells on the surface:
+            'subdivide': round vertices of a subdivided mesh
+            'triangle': every cell which overlaps a triangle
+            'ray': cells hit by a grid of rays
 
         Returns
         ----------
@@ -2289,6 +2421,7 @@ class Trimesh(Geometry):
         scene : trimesh.scene.scene.Scene
           Contains just the current mesh
         """
+        from .scene import Scene
         return Scene(self, **kwargs)
 
     def show(self, **kwargs):
@@ -2332,7 +2465,7 @@ class Trimesh(Geometry):
                             faces_sequence=faces_sequence,
                             **kwargs)
 
-    @caching.cache_decorator
+    @caching.cache_decorator(persist=True)
     def identifier(self):
         """
         Return a float vector which is unique to the mesh
@@ -2375,7 +2508,16 @@ class Trimesh(Geometry):
         file_type: str
           Which file type to export as.
           If file name is passed this is not required
+        kwargs: passed to `trimesh.exchange.export.export_mesh`
+          and the exporter, i.e. `stream=True` to write STL and
+          PLY files in chunks rather than all at once
+
+        Returns
+        ---------
+        export: bytes, str, or dict of the exported data,
+          or None if `stream=True` wrote it to `file_obj`
         """
+        from .exchange.export import export_mesh
         return export_mesh(mesh=self,
                            file_obj=file_obj,
                            file_type=file_type,
@@ -8,14 +8,18 @@ and clearing cached values based on those changes.
 
 import numpy as np
 
+import os
 import zlib
 import time
+import json
 import hashlib
+import itertools
 
 from functools import wraps
 
 from .constants import log
-from .util import is_sequence
+from .util import is_sequence, is_instance_named
+from .version import __version__
 
 try:
     # xxhash is roughly 5x faster than zlib.adler32 but is only
@@ -23,9 +27,23 @@ try:
     # so we keep it a soft dependency
     import xxhash
     hasX = True
+    # xxh3 is substantially faster than xxh64 on large
+    # buffers but only exists in newer versions of xxhash
+    if hasattr(xxhash, 'xxh3_64_intdigest'):
+        _xx_digest = xxhash.xxh3_64_intdigest
+    else:
+        def _xx_digest(data):
+            return xxhash.xxh64(data).intdigest()
 except ImportError:
     hasX = False
 
+# blake2b is in hashlib on Python 3.6+
+hasB = hasattr(hashlib, 'blake2b')
+
+# a counter which every `generation` hash is taken from
+# so every mutation of any array gets a unique value
+_generation = itertools.count(1)
+
 
 def tracked_array(array, dtype=None):
     """
@@ -58,7 +76,7 @@ def tracked_array(array, dtype=None):
     return tracked
 
 
-def cache_decorator(function):
+def cache_decorator(function=None, depends=None, persist=False):
     """
     A decorator for class methods, replaces @property
     but will store and retrieve function return values
@@ -73,7 +91,43 @@ def cache_decorator(function):
       def foo(self, things):
         return 'happy days'
       ```
+    depends : None or (n,) str
+      Keys of the data the value is derived from:
+      ```
+      @cache_decorator(depends=['faces'])
+      def edges(self):
+        return 'happy days'
+      ```
+      If a Cache was created with `depends_table` the value
+      will be kept when only other keys of the data change.
+      If None the value depends on everything.
+    persist : bool or (n,) str
+      If True and a disk cache has been enabled with
+      `set_disk_cache` the value will be stored on disk keyed
+      by the MD5 of the object and loaded from there rather
+      than being recomputed. If a sequence it is the keys of
+      byproducts the function stores in the cache which should
+      be stored with the value:
+      ```
+      @cache_decorator(persist=['symmetry_axis'])
+      def symmetry(self):
+        self._cache['symmetry_axis'] = [0, 0, 1]
+        return 'radial'
+      ```
     """
+    if function is None:
+        # we were called with arguments so return a decorator
+        def decorator(function):
+            return cache_decorator(function,
+                                   depends=depends,
+                                   persist=persist)
+        return decorator
+
+    # byproducts to store with a persistent value
+    if is_sequence(persist):
+        extra = tuple(persist)
+    else:
+        extra = ()
 
     # use wraps to preseve docstring
     @wraps(function)
@@ -93,6 +147,11 @@ def cache_decorator(function):
             # already stored so return value
             return self._cache.cache[name]
 
+        if persist and _disk_cache is not None:
+            # check the disk cache before computing
+            # and compute and store the value if it isn't there
+            return _disk_cache.fetch(self, name, function, extra)
+
         # time execution
         tic = time.time()
         # value not in cache so execute the function
@@ -107,12 +166,58 @@ def cache_decorator(function):
                   time.time() - tic)
         return value
 
+    # store the dependencies so they can be found by `depends_table`
+    if depends is not None:
+        get_cached.depends = tuple(depends)
+    # mark values which can be stored in a DiskCache
+    get_cached.persist = bool(persist)
+    get_cached.function = function
+    get_cached.extra = extra
+
     # all cached values are also properties
     # so they can be accessed like value attributes
     # rather than functions
     return property(get_cached)
 
 
+# keep the dependency table for every class we've seen
+_depends_tables = {}
+
+
+def depends_table(cls):
+    """
+    Find the declared data dependencies of every cached
+    property of a class.
+
+    Parameters
+    ------------
+    cls : class
+      Class with properties from `cache_decorator`
+
+    Returns
+    ------------
+    table : dict
+      Property name : (n,) str, data keys it depends on
+    """
+    if cls in _depends_tables:
+        return _depends_tables[cls]
+
+    table = {}
+    # go through the MRO in reverse so subclasses override
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if not isinstance(value, property):
+                continue
+            depends = getattr(value.fget, 'depends', None)
+            if depends is None:
+                # an override with no declaration depends on everything
+                table.pop(name, None)
+            else:
+                table[name] = depends
+    _depends_tables[cls] = table
+    return table
+
+
 class TrackedArray(np.ndarray):
     """
     Subclass of numpy.ndarray that provides hash methods
@@ -130,7 +235,8 @@ class TrackedArray(np.ndarray):
     ----------
     md5 :       str, hexadecimal MD5 of array
     crc :       int, zlib crc32/adler32 checksum
-    fast_hash : int, CRC or xxhash.xx64
+    fast_hash : int, xxhash, blake2b, CRC or generation
+                counter as selected by `set_fast_hash`
     """
 
     def __array_finalize__(self, obj):
@@ -142,10 +248,33 @@ class TrackedArray(np.ndarray):
         self._modified_c = True
         self._modified_m = True
         self._modified_x = True
+        self._modified_b = True
+        self._modified_g = True
+        self._parent = None
         if isinstance(obj, type(self)):
             obj._modified_c = True
             obj._modified_m = True
             obj._modified_x = True
+            obj._modified_b = True
+            # the generation counter is only bumped by writes
+            # so remember the parent of a view to mark it if
+            # the view is later modified in place
+            if np.may_share_memory(self, obj):
+                self._parent = obj
+
+    def _mark_modified(self):
+        """
+        Set every modified flag after an in- place operation,
+        including on any arrays this is a view of.
+        """
+        array = self
+        while array is not None:
+            array._modified_c = True
+            array._modified_m = True
+            array._modified_x = True
+            array._modified_b = True
+            array._modified_g = True
+            array = getattr(array, '_parent', None)
 
     def md5(self):
         """
@@ -194,30 +323,63 @@ class TrackedArray(np.ndarray):
 
     def _xxhash(self):
         """
-        An xxhash.b64 hash of the array.
+        An xxhash.xxh3_64 or xxhash.xxh64 hash of the array.
 
         Returns
         -------------
-        xx: int, xxhash.xxh64 hash of array.
+        xx: int, xxhash of array.
         """
         # repeat the bookkeeping to get a contiguous array inside
         # the function to avoid additional function calls
         # these functions are called millions of times so everything helps
         if self._modified_x or not hasattr(self, '_hashed_xx'):
             if self.flags['C_CONTIGUOUS']:
-                hasher = xxhash.xxh64(self)
-                self._hashed_xx = hasher.intdigest()
+                self._hashed_xx = _xx_digest(self)
             else:
                 # the case where we have sliced our nice
                 # contiguous array into a non- contiguous block
                 # for example (note slice *after* track operation):
                 # t = util.tracked_array(np.random.random(10))[::-1]
                 contiguous = np.ascontiguousarray(self)
-                hasher = xxhash.xxh64(contiguous)
-                self._hashed_xx = hasher.intdigest()
+                self._hashed_xx = _xx_digest(contiguous)
         self._modified_x = False
         return self._hashed_xx
 
+    def _blake2b(self):
+        """
+        An 8 byte hashlib.blake2b hash of the array.
+
+        Returns
+        -------------
+        blake: int, blake2b hash of array
+        """
+        if self._modified_b or not hasattr(self, '_hashed_blake'):
+            if self.flags['C_CONTIGUOUS']:
+                hasher = hashlib.blake2b(self, digest_size=8)
+            else:
+                hasher = hashlib.blake2b(
+                    np.ascontiguousarray(self), digest_size=8)
+            self._hashed_blake = int(hasher.hexdigest(), 16)
+        self._modified_b = False
+        return self._hashed_blake
+
+    def _generation(self):
+        """
+        A generation counter which is incremented when the
+        array is modified rather than a hash of the data.
+
+        This is O(1) but is only an ID for change detection:
+        arrays with identical data will have different values.
+
+        Returns
+        -------------
+        generation: int, unique value for current data
+        """
+        if self._modified_g or not hasattr(self, '_hashed_gen'):
+            self._hashed_gen = next(_generation)
+        self._modified_g = False
+        return self._hashed_gen
+
     def __hash__(self):
         """
         Hash is required to return an int.
@@ -235,112 +397,80 @@ class TrackedArray(np.ndarray):
         The i* operations are in- place and modify the array,
         so we better catch all of them.
         """
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__iadd__(*args,
                                                     **kwargs)
 
     def __isub__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__isub__(*args,
                                                     **kwargs)
 
     def __imul__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__imul__(*args,
                                                     **kwargs)
 
     def __idiv__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__idiv__(*args,
                                                     **kwargs)
 
     def __itruediv__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__itruediv__(*args,
                                                         **kwargs)
 
     def __imatmul__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__imatmul__(*args,
                                                        **kwargs)
 
     def __ipow__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__ipow__(*args, **kwargs)
 
     def __imod__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__imod__(*args, **kwargs)
 
     def __ifloordiv__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__ifloordiv__(*args,
                                                          **kwargs)
 
     def __ilshift__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__ilshift__(*args,
                                                        **kwargs)
 
     def __irshift__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__irshift__(*args,
                                                        **kwargs)
 
     def __iand__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__iand__(*args,
                                                     **kwargs)
 
     def __ixor__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__ixor__(*args,
                                                     **kwargs)
 
     def __ior__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         return super(self.__class__, self).__ior__(*args,
                                                    **kwargs)
 
     def __setitem__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         super(self.__class__, self).__setitem__(*args,
                                                 **kwargs)
 
     def __setslice__(self, *args, **kwargs):
-        self._modified_c = True
-        self._modified_m = True
-        self._modified_x = True
+        self._mark_modified()
         super(self.__class__, self).__setslice__(*args,
                                                  **kwargs)
 
@@ -348,29 +478,87 @@ class TrackedArray(np.ndarray):
         # if xxhash is installed use it
         fast_hash = _xxhash
     else:
-        # otherwise use our fastest CRC
+        # otherwise use our fastest CRC as blake2b is slower
+        # and is only available through `set_fast_hash`
         fast_hash = crc
 
 
+def set_fast_hash(mode):
+    """
+    Set which function `TrackedArray.fast_hash` uses, and so
+    what every `Cache` checks to see if data has changed.
+
+    Every mode tracks modifications with its own flag so it
+    may be switched at any time, although values stored in a
+    `Cache` under the previous mode will be recomputed once.
+
+    Parameters
+    ------------
+    mode : str
+      'xxhash' : xxhash.xxh3_64 if available, otherwise xxh64
+      'blake2b' : an 8 byte hashlib.blake2b, slower than
+        CRC so it is never the default
+      'crc' : zlib.crc32 or zlib.adler32
+      'generation' : O(1) counter incremented on every in- place
+        mutation made through the array API or a view of the
+        array, not a hash of the data
+    """
+    methods = {'xxhash': '_xxhash',
+               'blake2b': '_blake2b',
+               'crc': 'crc',
+               'generation': '_generation'}
+    if mode not in methods:
+        raise ValueError('mode must be one of: {}'.format(
+            ', '.join(sorted(methods.keys()))))
+    if mode == 'xxhash' and not hasX:
+        raise ValueError('xxhash is not installed!')
+    if mode == 'blake2b' and not hasB:
+        raise ValueError('blake2b is not available!')
+    # use the function from the class dict to avoid Python 2
+    # unbound methods which can't be reassigned
+    TrackedArray.fast_hash = vars(TrackedArray)[methods[mode]]
+
+
 class Cache:
     """
     Class to cache values which will be stored until the
     result of an ID function changes.
+
+    If created with `id_parts` and `depends` values will only be
+    removed if the parts of the data they depend on have changed.
     """
 
-    def __init__(self, id_function):
+    def __init__(self, id_function, id_parts=None, depends=None):
         """
         Create a cache object.
 
         Parameters
         ------------
-        id_function: function, that returns hashable value
+        id_function : function
+          Returns hashable value
+        id_parts : None or function
+          Returns a dict of {key : (shape, hash)} for every
+          part of the data, i.e. `DataStore.hashes`
+        depends : None or dict
+          Cache key : (n,) str, keys of `id_parts` the value
+          is derived from, i.e. the result of `depends_table`
         """
         self._id_function = id_function
+        self._id_parts = id_parts
+        # without part hashes we can't check dependencies
+        if id_parts is None:
+            depends = None
+        self._depends = depends
+        # every key of the data which something depends on
+        self._depends_keys = set()
+        if depends:
+            for value in depends.values():
+                self._depends_keys.update(value)
 
         self.id_current = self._id_function()
         self._lock = 0
         self.cache = {}
+        self._parts_set()
 
     def delete(self, key):
         """
@@ -394,17 +582,77 @@ class Cache:
 
         # things changed
         if id_new != self.id_current:
-            if len(self.cache) > 0:
+            if self._depends and len(self.cache) > 0:
+                # only dump values whose dependencies changed
+                self.cache = self._partial()
+            elif len(self.cache) > 0:
                 log.debug('%d items cleared from cache: %s',
                           len(self.cache),
                           str(list(self.cache.keys())))
-            # hash changed, so dump the cache
-            # do it manually rather than calling clear()
-            # as we are internal logic and can avoid function calls
-            self.cache = {}
+                # hash changed, so dump the cache
+                # do it manually rather than calling clear()
+                # as we are internal logic and can avoid function calls
+                self.cache = {}
+            elif self._depends:
+                self._parts_set()
             # set the id to the new data hash
             self.id_current = id_new
 
+    def _parts_set(self):
+        """
+        Store the current hash of each part of the data.
+        """
+        if self._depends:
+            self.parts_current = self._id_parts()
+
+    def _partial(self):
+        """
+        Find the cached values which only depend on parts
+        of the data that haven't changed, and store the
+        current hash of each part of the data.
+
+        Returns
+        ------------
+        kept : dict
+          Subset of self.cache which is still valid
+        """
+        parts_new = self._id_parts()
+        parts_old = self.parts_current
+        self.parts_current = parts_new
+
+        keys = set(parts_new.keys())
+        keys.update(parts_old.keys())
+        changed = set()
+        for key in keys:
+            new = parts_new.get(key)
+            old = parts_old.get(key)
+            if new == old:
+                continue
+            if new is None or old is None or new[0] != old[0]:
+                # an array changed shape or was added or removed
+                # so values like per- vertex lists are invalid
+                log.debug('%d items cleared from cache: %s',
+                          len(self.cache),
+                          str(list(self.cache.keys())))
+                return {}
+            changed.add(key)
+
+        if not changed.issubset(self._depends_keys):
+            # a part nothing declared a dependency on changed
+            # so we have to assume everything depends on it
+            log.debug('%d items cleared from cache: %s',
+                      len(self.cache),
+                      str(list(self.cache.keys())))
+            return {}
+
+        kept = {k: v for k, v in self.cache.items()
+                if k in self._depends and
+                changed.isdisjoint(self._depends[k])}
+        log.debug('%d items cleared from cache, %d kept',
+                  len(self.cache) - len(kept),
+                  len(kept))
+        return kept
+
     def clear(self, exclude=None):
         """
         Remove all elements in the cache.
@@ -428,6 +676,7 @@ class Cache:
         Set the current ID to the value of the ID function.
         """
         self.id_current = self._id_function()
+        self._parts_set()
 
     def __getitem__(self, key):
         """
@@ -477,6 +726,7 @@ class Cache:
     def __exit__(self, *args):
         self._lock -= 1
         self.id_current = self._id_function()
+        self._parts_set()
 
 
 class DataStore:
@@ -597,6 +847,517 @@ class DataStore:
         fast = sum(i.fast_hash() for i in self.data.values())
         return fast
 
+    def hashes(self):
+        """
+        Get the shape and fast hash of each array in the DataStore.
+
+        Returns
+        ------------
+        hashes : dict
+          Key : (shape, int) shape and checksum of array
+        """
+        return {k: (v.shape, v.fast_hash())
+                for k, v in self.data.items()}
+
+
+class DiskCache(object):
+    """
+    Store cached values on disk keyed by the MD5 of the object
+    they were computed from and the name of the value, so they
+    can be reused between processes and sessions.
+
+    Entries are evicted least- recently- used first once the
+    total size of the directory is larger than `max_size`.
+    """
+
+    def __init__(self, path, max_size=2 ** 30, mmap=False):
+        """
+        Create a disk cache in a directory.
+
+        Parameters
+        ------------
+        path : str
+          Directory to store values in, created if it doesn't exist
+        max_size : int
+          Maximum size of the directory in bytes
+        mmap : bool
+          If True values which are a single array will be stored
+          as .npy and loaded as read- only memory maps
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        self.max_size = int(max_size)
+        self.mmap = bool(mmap)
+        # total size of entries, None until the directory is scanned
+        self._size = None
+
+    @property
+    def size(self):
+        """
+        The total size of every entry in the cache.
+
+        Returns
+        ------------
+        size : int
+          Size in bytes
+        """
+        if self._size is None:
+            self._size = sum(i[1] for i in self._entries())
+        return self._size
+
+    def key(self, obj, name):
+        """
+        Get the key for a value of an object, which changes if
+        the data of the object, its type, the trimesh version, or
+        overrides of its mass properties change.
+
+        Parameters
+        ------------
+        obj : object
+          Object with an `md5` method, i.e. Trimesh
+        name : str
+          Name of cached value
+
+        Returns
+        ------------
+        key : str
+          Key which is also the file name of the entry
+        """
+        # values like `Trimesh.density` are set as attributes
+        # rather than stored in the data but change results
+        overrides = []
+        for attr in ['_density', '_center_mass']:
+            value = getattr(obj, attr, None)
+            if value is not None:
+                value = np.asanyarray(value, dtype=np.float64).tolist()
+            overrides.append(value)
+
+        hasher = hashlib.md5()
+        hasher.update('{} {} {} {}'.format(
+            __version__,
+            type(obj).__name__,
+            obj.md5(),
+            overrides).encode('utf-8'))
+        return '{}_{}'.format(hasher.hexdigest(), name)
+
+    def fetch(self, obj, name, function, extra=None):
+        """
+        Get a value from disk or compute and store it, and put the
+        value and any byproducts into the cache of `obj`.
+
+        Parameters
+        ------------
+        obj : object
+          Object with `md5` method and `_cache`
+        name : str
+          Name of value
+        function : function
+          Computes value from `obj`
+        extra : None or (n,) str
+          Keys of byproducts `function` stores in the cache
+
+        Returns
+        ------------
+        value : any
+          Value of `function(obj)`
+        """
+        key = self.key(obj, name)
+
+        stored = self.get(key, name)
+        if stored is not None:
+            log.debug('%s loaded from disk cache', name)
+            for k, v in stored.items():
+                obj._cache.cache.setdefault(k, v)
+            return stored[name]
+
+        tic = time.time()
+        value = function(obj)
+        # the function may have replaced the cache dict
+        cache = obj._cache.cache
+        cache[name] = value
+        log.debug('%s was not in disk cache, executed in %.6f',
+                  name,
+                  time.time() - tic)
+
+        items = {name: value}
+        if extra is not None:
+            items.update({k: cache.get(k) for k in extra})
+        self.put(key, name, items)
+
+        return value
+
+    def get(self, key, name):
+        """
+        Load an entry from disk.
+
+        Parameters
+        ------------
+        key : str
+          Key from `DiskCache.key`
+        name : str
+          Name of the value
+
+        Returns
+        ------------
+        items : dict or None
+          Name : value, including any byproducts,
+          or None if the entry doesn't exist
+        """
+        for extension in ['.npy', '.npz']:
+            path = os.path.join(self.path, key + extension)
+            if not os.path.isfile(path):
+                continue
+            try:
+                if extension == '.npy':
+                    mode = 'r' if self.mmap else None
+                    items = {name: np.load(path, mmap_mode=mode)}
+                else:
+                    with np.load(path) as archive:
+                        items = _unpack(archive)
+                # update modification time for LRU eviction
+                os.utime(path, None)
+            except BaseException:
+                log.warning('unable to load %s from disk cache',
+                            path,
+                            exc_info=True)
+                continue
+            if name in items:
+                return items
+        return None
+
+    def put(self, key, name, items):
+        """
+        Store an entry on disk.
+
+        Parameters
+        ------------
+        key : str
+          Key from `DiskCache.key`
+        name : str
+          Name of the value
+        items : dict
+          Name : value, including any byproducts
+
+        Returns
+        ------------
+        stored : bool
+          False if values couldn't be stored
+        """
+        packed = _pack(items)
+        if packed is None:
+            log.debug('%s can\'t be stored on disk', name)
+            return False
+
+        if (self.mmap and len(items) == 1 and
+                isinstance(items[name], np.ndarray) and
+                items[name].dtype.kind in 'biufc'):
+            extension = '.npy'
+        else:
+            extension = '.npz'
+        path = os.path.join(self.path, key + extension)
+
+        # write to a temporary file and rename it into place
+        # so other processes never see a partial entry
+        temp = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            with open(temp, 'wb') as f:
+                if extension == '.npy':
+                    np.save(f, np.asarray(items[name]))
+                else:
+                    np.savez(f, **packed)
+            if hasattr(os, 'replace'):
+                os.replace(temp, path)
+            else:
+                # Python 2 can't rename over an existing file
+                if os.path.exists(path):
+                    os.remove(path)
+                os.rename(temp, path)
+        except BaseException:
+            log.warning('unable to write %s to disk cache',
+                        path,
+                        exc_info=True)
+            if os.path.exists(temp):
+                os.remove(temp)
+            return False
+
+        self._size = self.size + os.path.getsize(path)
+        if self._size > self.max_size:
+            self.evict()
+        return True
+
+    def evict(self):
+        """
+        Remove the least recently used entries until
+        the cache is smaller than `max_size`.
+        """
+        # rescan as other processes may be sharing the directory
+        entries = sorted(self._entries())
+        total = sum(i[1] for i in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        for mtime, size, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = 0
+
+    def warm(self, directory, names=None):
+        """
+        Load every mesh in a directory and store its
+        persistent cached values.
+
+        Parameters
+        ------------
+        directory : str
+          Directory containing model files
+        names : None or (n,) str
+          Names of values to store, if None every
+          value marked with `persist`
+
+        Returns
+        ------------
+        count : int
+          Number of meshes that were processed
+        """
+        # avoid a circular import
+        from .exchange.load import load, available_formats
+        formats = set(available_formats())
+
+        count = 0
+        for file_name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, file_name)
+            extension = file_name.split('.')[-1].lower()
+            if not os.path.isfile(path) or extension not in formats:
+                continue
+            try:
+                loaded = load(path)
+            except BaseException:
+                log.warning('unable to load %s', path, exc_info=True)
+                continue
+
+            if hasattr(loaded, 'geometry'):
+                meshes = list(loaded.geometry.values())
+            else:
+                meshes = [loaded]
+
+            for mesh in meshes:
+                properties = persistent(type(mesh))
+                if len(properties) == 0:
+                    continue
+                for name, (function, extra) in properties.items():
+                    if names is not None and name not in names:
+                        continue
+                    if self.get(self.key(mesh, name), name) is not None:
+                        continue
+                    try:
+                        self.fetch(mesh, name, function, extra)
+                    except BaseException:
+                        log.debug('unable to compute %s for %s',
+                                  name, path, exc_info=True)
+                count += 1
+        return count
+
+    def _entries(self):
+        """
+        Find every entry in the cache directory.
+
+        Returns
+        ------------
+        entries : (n,) list
+          (modification time, size, path)
+        """
+        entries = []
+        for file_name in os.listdir(self.path):
+            if not file_name.endswith(('.npz', '.npy')):
+                continue
+            path = os.path.join(self.path, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+
+def persistent(cls):
+    """
+    Find the cached properties of a class marked with `persist`.
+
+    Parameters
+    ------------
+    cls : class
+      Class with properties from `cache_decorator`
+
+    Returns
+    ------------
+    functions : dict
+      Property name : (function, extra) which computes
+      value and the keys of byproducts it stores
+    """
+    functions = {}
+    for name in dir(cls):
+        fget = getattr(getattr(cls, name, None), 'fget', None)
+        if getattr(fget, 'persist', False):
+            functions[name] = (fget.function, fget.extra)
+    return functions
+
+
+# the DiskCache used by `cache_decorator` or None if disabled
+_disk_cache = None
+
+
+def set_disk_cache(path=None, max_size=2 ** 30, mmap=False):
+    """
+    Enable or disable storing cached values marked with
+    `persist` on disk, i.e. `Trimesh.convex_hull`.
+
+    Parameters
+    ------------
+    path : None, str, or DiskCache
+      Directory to store values in, or None to disable
+    max_size : int
+      Maximum size of the directory in bytes
+    mmap : bool
+      Load single arrays as read- only memory maps
+
+    Returns
+    ------------
+    disk : DiskCache or None
+      The cache now in use
+    """
+    global _disk_cache
+    if path is None or isinstance(path, DiskCache):
+        _disk_cache = path
+    else:
+        _disk_cache = DiskCache(path=path,
+                                max_size=max_size,
+                                mmap=mmap)
+    return _disk_cache
+
+
+def _pack(items):
+    """
+    Convert a dict of values into arrays for `np.savez`.
+
+    Parameters
+    ------------
+    items : dict
+      Name : value, where values are None, str, numbers,
+      numeric arrays, sequences of 1D numeric arrays or Trimesh
+
+    Returns
+    ------------
+    packed : dict or None
+      Name : np.ndarray, or None if a value isn't supported
+    """
+    meta = {}
+    packed = {}
+    for index, (name, value) in enumerate(items.items()):
+        prefix = 'v{}_'.format(index)
+        if value is None:
+            kind = 'none'
+        elif isinstance(value, (str, type(u''))):
+            kind = 'str'
+            packed[prefix + 'data'] = np.array(value)
+        elif isinstance(value, (bool, int, float, np.number, np.bool_)):
+            kind = 'scalar'
+            packed[prefix + 'data'] = np.array(value)
+        elif (isinstance(value, np.ndarray) and
+              value.dtype.kind in 'biufc'):
+            kind = 'array'
+            packed[prefix + 'data'] = np.asarray(value)
+        elif is_instance_named(value, 'Trimesh'):
+            kind = 'trimesh'
+            packed[prefix + 'vertices'] = np.asarray(value.vertices)
+            packed[prefix + 'faces'] = np.asarray(value.faces)
+        elif (isinstance(value, (list, tuple, np.ndarray)) and
+              all(isinstance(i, np.ndarray) and
+                  i.dtype.kind in 'biuf' and
+                  len(i.shape) == 1 for i in value)):
+            # a ragged sequence, i.e. `Trimesh.facets`
+            if isinstance(value, np.ndarray):
+                kind = 'ragged_array'
+            else:
+                kind = 'ragged_list'
+            lengths = np.array([len(i) for i in value], dtype=np.int64)
+            if len(value) > 0:
+                data = np.concatenate(value)
+            else:
+                data = np.zeros(0, dtype=np.int64)
+            packed[prefix + 'data'] = data
+            packed[prefix + 'lengths'] = lengths
+        else:
+            return None
+        meta[name] = [kind, prefix]
+
+    packed['meta'] = np.array(json.dumps(meta))
+    return packed
+
+
+def _unpack(archive):
+    """
+    Convert arrays loaded from an npz archive created
+    by `_pack` back into values.
+
+    Parameters
+    ------------
+    archive : dict- like
+      Name : np.ndarray
+
+    Returns
+    ------------
+    items : dict
+      Name : value
+    """
+    meta = json.loads(str(archive['meta']))
+    items = {}
+    for name, (kind, prefix) in meta.items():
+        if kind == 'none':
+            value = None
+        elif kind == 'str':
+            value = str(archive[prefix + 'data'])
+        elif kind == 'scalar':
+            value = archive[prefix + 'data'][()]
+        elif kind == 'array':
+            value = archive[prefix + 'data']
+        elif kind == 'trimesh':
+            # avoid a circular import
+            from .base import Trimesh
+            value = Trimesh(vertices=archive[prefix + 'vertices'],
+                            faces=archive[prefix + 'faces'],
+                            process=False)
+        elif kind in ('ragged_array', 'ragged_list'):
+            lengths = archive[prefix + 'lengths']
+            value = np.split(archive[prefix + 'data'],
+                             np.cumsum(lengths)[:-1])
+            if len(lengths) == 0:
+                value = []
+            if kind == 'ragged_array':
+                # fill an object array to avoid numpy
+                # stacking equal length groups into 2D
+                array = np.empty(len(value), dtype=object)
+                for i, v in enumerate(value):
+                    array[i] = v
+                value = array
+        else:
+            raise ValueError('unknown kind: {}'.format(kind))
+        items[name] = value
+    return items
+
 
 def _fast_crc(count=50):
     """
@@ -0,0 +1,23 @@
+"""
+exchange
+-------------
+
+Load and export meshes and scenes in many file formats.
+"""
+
+
+def __getattr__(name):
+    """
+    Import format submodules like `trimesh.exchange.stl` on
+    first access, as `import trimesh` no longer imports the
+    loaders until they are used.
+    """
+    import importlib
+    import importlib.util
+    if (name.startswith('_') or
+            importlib.util.find_spec('.' + name, __name__) is None):
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name))
+    # importing a submodule binds it as an attribute of the
+    # package so we are only called once per name
+    return importlib.import_module('.' + name, __name__)
@@ -12,7 +12,7 @@ from .ply import _ply_exporters
 from .dae import _collada_exporters
 
 
-def export_mesh(mesh, file_obj, file_type=None, **kwargs):
+def export_mesh(mesh, file_obj, file_type=None, stream=False, **kwargs):
     """
     Export a Trimesh object to a file- like object, or to a filename
 
@@ -22,11 +22,16 @@ def export_mesh(mesh, file_obj, file_type=None, **kwargs):
       Where should mesh be exported to
     file_type : str or None
       Represents file type (eg: 'stl')
+    stream : bool
+      If True and the format supports it ('stl', 'stl_ascii'
+      and 'ply') write chunks directly to a file name or binary
+      file object rather than assembling the whole export in
+      memory, in which case nothing is returned
 
     Returns
     ----------
-    exported : bytes or str
-      Result of exporter
+    exported : bytes, str, or None
+      Result of exporter, or None if it was streamed
     """
     # if we opened a file object in this function
     # we will want to close it when we're done
@@ -52,12 +57,22 @@ def export_mesh(mesh, file_obj, file_type=None, **kwargs):
     else:
         log.debug('Exporting %d faces as %s', len(mesh.faces),
                   file_type.upper())
-    export = _mesh_exporters[file_type](mesh, **kwargs)
-
-    if hasattr(file_obj, 'write'):
-        result = util.write_encoded(file_obj, export)
+    if (stream and
+            file_type in _stream_exporters and
+            hasattr(file_obj, 'write') and
+            'b' in getattr(file_obj, 'mode', 'b')):
+        # write chunks directly to the file object rather
+        # than assembling the whole export in memory
+        _mesh_exporters[file_type](mesh, file_obj=file_obj, **kwargs)
+        file_obj.flush()
+        result = None
     else:
-        result = export
+        export = _mesh_exporters[file_type](mesh, **kwargs)
+
+        if hasattr(file_obj, 'write'):
+            result = util.write_encoded(file_obj, export)
+        else:
+            result = export
 
     if was_opened:
         file_obj.close()
@@ -176,3 +191,6 @@ _mesh_exporters = {
 _mesh_exporters.update(_ply_exporters)
 _mesh_exporters.update(_obj_exporters)
 _mesh_exporters.update(_collada_exporters)
+
+# exporters which accept a `file_obj` and write it in chunks
+_stream_exporters = set(['stl', 'stl_ascii', 'ply'])
@@ -1,4 +1,7 @@
 import os
+import pickle
+
+import numpy as np
 
 from .. import util
 from .. import visual
@@ -361,6 +364,177 @@ def load_remote(url, **kwargs):
     return loaded
 
 
+def load_many(file_objs, workers=None, **kwargs):
+    """
+    Load many files in a pool of processes, yielding each
+    result as soon as it has loaded.
+
+    Meshes are sent back from workers as their data arrays
+    and visuals rather than pickling the whole object with
+    its cache, and are not processed again.
+
+    Parameters
+    ------------
+    file_objs : str or (n,) str
+      File names, or a directory to load every file
+      with a supported extension from
+    workers : None or int
+      Number of processes, None for one per CPU and
+      zero or one to load in the current process
+    kwargs : **
+      Passed to `load`
+
+    Yields
+    ------------
+    file_obj : str
+      File name which was loaded
+    loaded : Trimesh, Path2D, Path3D, Scene or None
+      Loaded geometry, or None if loading failed
+    error : None or Exception
+      What was raised while loading the file
+    """
+    if util.is_string(file_objs) and os.path.isdir(file_objs):
+        # every file in the directory we have a loader for
+        supported = set(available_formats())
+        file_objs = [os.path.join(file_objs, name) for name in
+                     sorted(os.listdir(file_objs)) if
+                     util.split_extension(name).lower() in supported]
+    file_objs = [str(f) for f in util.make_sequence(file_objs)]
+
+    if workers is None:
+        import multiprocessing
+        workers = multiprocessing.cpu_count()
+    workers = min(int(workers), len(file_objs))
+
+    tasks = [(f, kwargs) for f in file_objs]
+    if workers <= 1:
+        for task in tasks:
+            yield _load_task(task, pack=False)
+        return
+
+    import multiprocessing
+    pool = multiprocessing.Pool(processes=workers)
+    try:
+        for file_obj, packed, error in pool.imap_unordered(
+                _load_task, tasks, chunksize=1):
+            yield file_obj, _unpack(packed), error
+        pool.close()
+        pool.join()
+    finally:
+        # if the caller stopped early stop the workers
+        pool.terminate()
+
+
+def _load_task(task, pack=True):
+    """
+    Load a file for `load_many` catching any error.
+
+    Parameters
+    ------------
+    task : (str, dict)
+      File name and kwargs for `load`
+    pack : bool
+      Pack the result to be sent from a worker process
+
+    Returns
+    ------------
+    file_obj : str
+      File name
+    loaded : any
+      Loaded geometry, or None
+    error : None or Exception
+      Raised exception
+    """
+    file_obj, kwargs = task
+    try:
+        loaded = load(file_obj, **kwargs)
+    except Exception as E:
+        log.debug('unable to load %s', file_obj, exc_info=True)
+        if pack:
+            # exceptions with custom arguments can't always be
+            # unpickled in the parent which would end the batch
+            try:
+                pickle.loads(pickle.dumps(E))
+            except Exception:
+                E = ValueError('{}: {}'.format(type(E).__name__, E))
+        return file_obj, None, E
+    if pack:
+        loaded = _pack(loaded)
+    return file_obj, loaded, None
+
+
+def _pack(loaded):
+    """
+    Reduce loaded geometry to a dict of the arrays and
+    objects needed to rebuild it, skipping caches.
+
+    Parameters
+    ------------
+    loaded : any
+      Result of `load`
+
+    Returns
+    ------------
+    packed : dict or any
+      Packed meshes and scenes, other objects unchanged
+    """
+    if isinstance(loaded, Trimesh):
+        return {'class': 'Trimesh',
+                'data': {k: np.asarray(v) for k, v in
+                         loaded._data.data.items()},
+                # normals may have been loaded from the file
+                'cache': {k: loaded._cache.cache[k] for k in
+                          ['face_normals', 'vertex_normals']
+                          if k in loaded._cache.cache},
+                'visual': loaded.visual.copy(),
+                'metadata': loaded.metadata}
+    elif isinstance(loaded, Scene):
+        return {'class': 'Scene',
+                'geometry': [(k, _pack(v)) for k, v in
+                             loaded.geometry.items()],
+                'graph': loaded.graph,
+                # don't create default cameras or lights
+                'camera': getattr(loaded, '_camera', None),
+                'lights': getattr(loaded, '_lights', None),
+                'metadata': loaded.metadata}
+    elif isinstance(loaded, list):
+        return [_pack(i) for i in loaded]
+    return loaded
+
+
+def _unpack(packed):
+    """
+    Rebuild geometry packed by `_pack`.
+
+    Parameters
+    ------------
+    packed : dict or any
+      Result of `_pack`
+
+    Returns
+    ------------
+    loaded : any
+      Geometry matching the input to `_pack`
+    """
+    if isinstance(packed, list):
+        return [_unpack(i) for i in packed]
+    elif not isinstance(packed, dict):
+        return packed
+    elif packed['class'] == 'Trimesh':
+        mesh = Trimesh(metadata=packed['metadata'])
+        mesh._data.update(packed['data'])
+        mesh._cache.update(packed['cache'])
+        mesh.visual = packed['visual']
+        return mesh
+    scene = Scene(graph=packed['graph'],
+                  metadata=packed['metadata'],
+                  camera=packed['camera'],
+                  lights=packed['lights'])
+    scene.geometry.update((k, _unpack(v)) for k, v in
+                          packed['geometry'])
+    return scene
+
+
 def load_kwargs(*args, **kwargs):
     """
     Load geometry from a properly formatted dict or kwargs
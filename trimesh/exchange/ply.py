@@ -93,7 +93,9 @@ def load_ply(file_obj,
 
 def export_ply(mesh,
                encoding='binary',
-               vertex_normal=None):
+               vertex_normal=None,
+               file_obj=None,
+               chunk=2**16):
     """
     Export a mesh in the PLY format.
 
@@ -102,11 +104,23 @@ def export_ply(mesh,
     mesh : Trimesh object
     encoding : ['ascii'|'binary_little_endian']
     vertex_normal : include vertex normals
+    file_obj : None, or open binary file object to write to
+    chunk : int, number of vertices or faces to write at once
 
     Returns
     ----------
-    export : bytes of result
+    export : bytes of result, or None if written to file_obj
     """
+    if file_obj is None:
+        # write into memory and return the result
+        stream = util.BytesIO()
+        export_ply(mesh,
+                   encoding=encoding,
+                   vertex_normal=vertex_normal,
+                   file_obj=stream,
+                   chunk=chunk)
+        return stream.getvalue()
+
     # evaluate input args
     # allow a shortcut for binary
     if encoding == 'binary':
@@ -143,64 +157,86 @@ def export_ply(mesh,
         header += templates['color']
         dtype_vertex.append(dtype_color)
 
-    # create and populate the custom dtype for vertices
-    vertex = np.zeros(len(mesh.vertices),
-                      dtype=dtype_vertex)
-    vertex['vertex'] = mesh.vertices
-    if vertex_normal:
-        vertex['normals'] = mesh.vertex_normals
-    if mesh.visual.kind == 'vertex':
-        vertex['rgba'] = mesh.visual.vertex_colors
-
     header += templates['face']
     if mesh.visual.kind == 'face' and encoding != 'ascii':
         header += templates['color']
         dtype_face.append(dtype_color)
 
-    # put mesh face data into custom dtype to export
-    faces = np.zeros(len(mesh.faces), dtype=dtype_face)
-    faces['count'] = 3
-    faces['index'] = mesh.faces
-    if mesh.visual.kind == 'face' and encoding != 'ascii':
-        faces['rgba'] = mesh.visual.face_colors
-
     header += templates['outro']
 
     header_params = {'vertex_count': len(mesh.vertices),
                      'face_count': len(mesh.faces),
                      'encoding': encoding}
 
-    export = Template(header).substitute(header_params).encode('utf-8')
+    file_obj.write(Template(header).substitute(
+        header_params).encode('utf-8'))
+
+    if vertex_normal:
+        vertex_normals = mesh.vertex_normals
+    vertex_colors = None
+    if mesh.visual.kind == 'vertex':
+        vertex_colors = mesh.visual.vertex_colors
+    face_colors = None
+    if mesh.visual.kind == 'face' and encoding != 'ascii':
+        face_colors = mesh.visual.face_colors
 
+    # write a fixed number of vertices and faces at a time
+    # so memory doesn't scale with the size of the mesh
     if encoding == 'binary_little_endian':
-        export += vertex.tostring()
-        export += faces.tostring()
-    elif encoding == 'ascii':
-        # ply format is: (face count, v0, v1, v2)
-        fstack = np.column_stack((np.ones(len(mesh.faces),
-                                          dtype=np.int64) * 3,
-                                  mesh.faces))
-
-        # if we're exporting vertex normals they get stacked
-        if vertex_normal:
-            vstack = np.column_stack((mesh.vertices,
-                                      mesh.vertex_normals))
-        else:
-            vstack = mesh.vertices
+        for start in range(0, len(mesh.vertices), chunk):
+            end = start + chunk
+            # populate the custom dtype for this chunk of vertices
+            vertex = np.zeros(len(mesh.vertices[start:end]),
+                              dtype=dtype_vertex)
+            vertex['vertex'] = mesh.vertices[start:end]
+            if vertex_normal:
+                vertex['normals'] = vertex_normals[start:end]
+            if vertex_colors is not None:
+                vertex['rgba'] = vertex_colors[start:end]
+            file_obj.write(vertex.tostring())
+
+        for start in range(0, len(mesh.faces), chunk):
+            end = start + chunk
+            # put mesh face data into custom dtype to export
+            faces = np.zeros(len(mesh.faces[start:end]),
+                             dtype=dtype_face)
+            faces['count'] = 3
+            faces['index'] = mesh.faces[start:end]
+            if face_colors is not None:
+                faces['rgba'] = face_colors[start:end]
+            file_obj.write(faces.tostring())
 
-        # add the string formatted vertices and faces
-        export += (util.array_to_string(vstack,
-                                        col_delim=' ',
-                                        row_delim='\n') +
-                   '\n' +
-                   util.array_to_string(fstack,
+    elif encoding == 'ascii':
+        for start in range(0, len(mesh.vertices), chunk):
+            end = start + chunk
+            # if we're exporting vertex normals they get stacked
+            if vertex_normal:
+                vstack = np.column_stack((mesh.vertices[start:end],
+                                          vertex_normals[start:end]))
+            else:
+                vstack = mesh.vertices[start:end]
+            file_obj.write((util.array_to_string(
+                vstack,
+                col_delim=' ',
+                row_delim='\n') + '\n').encode('utf-8'))
+
+        for start in range(0, len(mesh.faces), chunk):
+            end = start + chunk
+            # ply format is: (face count, v0, v1, v2)
+            fstack = np.column_stack(
+                (np.ones(len(mesh.faces[start:end]),
+                         dtype=np.int64) * 3,
+                 mesh.faces[start:end]))
+            text = util.array_to_string(fstack,
                                         col_delim=' ',
-                                        row_delim='\n')).encode('utf-8')
+                                        row_delim='\n')
+            # rows are separated but the file doesn't end in a newline
+            if end < len(mesh.faces):
+                text += '\n'
+            file_obj.write(text.encode('utf-8'))
     else:
         raise ValueError('encoding must be ascii or binary!')
 
-    return export
-
 
 def parse_header(file_obj):
     """
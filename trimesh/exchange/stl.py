@@ -1,5 +1,11 @@
+import io
+
 import numpy as np
 
+from .. import util
+
+from ..constants import log
+
 
 class HeaderError(Exception):
     # the exception raised if an STL file object doesn't match its header
@@ -18,7 +24,7 @@ _stl_dtype_header = np.dtype([('header', np.void, 80),
                               ('face_count', '<i4')])
 
 
-def load_stl(file_obj, file_type=None, **kwargs):
+def load_stl(file_obj, file_type=None, mmap=False, **kwargs):
     """
     Load an STL file from a file object.
 
@@ -26,6 +32,8 @@ def load_stl(file_obj, file_type=None, **kwargs):
     ----------
     file_obj: open file- like object
     file_type: not used
+    mmap: bool, if True memory map binary STL files rather than
+          reading them into memory, see `load_stl_binary`
 
     Returns
     ----------
@@ -41,7 +49,7 @@ def load_stl(file_obj, file_type=None, **kwargs):
         # if that is true, it is almost certainly a binary STL file
         # if the header doesn't match the file length a HeaderError will be
         # raised
-        return load_stl_binary(file_obj)
+        return load_stl_binary(file_obj, mmap=mmap)
     except HeaderError:
         # move the file back to where it was initially
         file_obj.seek(file_pos)
@@ -51,13 +59,19 @@ def load_stl(file_obj, file_type=None, **kwargs):
         return load_stl_ascii(file_obj)
 
 
-def load_stl_binary(file_obj):
+def load_stl_binary(file_obj, mmap=False):
     """
     Load a binary STL file from a file object.
 
     Parameters
     ----------
     file_obj: open file- like object
+    mmap: bool, if True and file_obj is an actual file the data
+          is memory mapped and converted directly into the
+          final arrays in chunks, so peak memory stays close
+          to the size of the returned arrays. Vertices are not
+          merged until the mesh is processed, so load with
+          `process=False` to defer merging entirely.
 
     Returns
     ----------
@@ -110,6 +124,23 @@ def load_stl_binary(file_obj):
     # so it's much better to raise an exception here.
     if len_data != len_expected:
         raise HeaderError('Binary STL has incorrect length in header!')
+
+    face_count = int(header['face_count'][0])
+    if mmap and face_count > 0 and hasattr(file_obj, 'fileno'):
+        # only mapping the file is allowed to fail, as file
+        # objects like BytesIO don't have a usable file number
+        try:
+            mapped = np.memmap(file_obj,
+                               dtype=_stl_dtype,
+                               mode='r',
+                               offset=data_start,
+                               shape=(face_count,))
+        except (ValueError, OSError, io.UnsupportedOperation):
+            log.debug('unable to memory map STL', exc_info=True)
+            file_obj.seek(data_start)
+        else:
+            return _load_stl_mmap(blob=mapped, metadata=metadata)
+
     blob = np.frombuffer(file_obj.read(), dtype=_stl_dtype)
 
     # all of our vertices will be loaded in order
@@ -123,6 +154,41 @@ def load_stl_binary(file_obj):
     return result
 
 
+def _load_stl_mmap(blob, metadata, chunk=2**18):
+    """
+    Load the data section of a memory mapped binary STL by
+    copying each chunk of faces into the final arrays.
+
+    Parameters
+    ----------
+    blob: (n,) _stl_dtype, memory mapped data section
+    metadata: dict, metadata from the header
+    chunk: int, number of faces to convert at once
+
+    Returns
+    ----------
+    loaded: kwargs for a Trimesh constructor
+    """
+    face_count = len(blob)
+    # allocate the final arrays up front
+    vertices = np.empty((face_count * 3, 3), dtype=np.float64)
+    face_normals = np.empty((face_count, 3), dtype=np.float64)
+    faces = np.arange(face_count * 3, dtype=np.int64).reshape((-1, 3))
+
+    # convert float32 records into float64 arrays in chunks
+    # so we never have a full intermediate copy in memory
+    for start in range(0, face_count, chunk):
+        end = min(start + chunk, face_count)
+        vertices[start * 3:end * 3] = blob['vertices'][
+            start:end].reshape((-1, 3))
+        face_normals[start:end] = blob['normals'][start:end]
+
+    return {'vertices': vertices,
+            'face_normals': face_normals,
+            'faces': faces,
+            'metadata': metadata}
+
+
 def load_stl_ascii(file_obj):
     """
     Load an ASCII STL file from a file object.
@@ -186,62 +252,90 @@ def load_stl_ascii(file_obj):
             'face_normals': face_normals}
 
 
-def export_stl(mesh):
+def export_stl(mesh, file_obj=None, chunk=2**16):
     """
     Convert a Trimesh object into a binary STL file.
 
     Parameters
     ---------
     mesh: Trimesh object
+    file_obj: None, or open binary file object to write to
+    chunk: int, number of faces to convert and write at once
 
     Returns
     ---------
     export: bytes, representing mesh in binary STL form
+            or None if data was written to file_obj
     """
+    if file_obj is None:
+        # write into memory and return the result
+        stream = util.BytesIO()
+        export_stl(mesh, file_obj=stream, chunk=chunk)
+        return stream.getvalue()
+
     header = np.zeros(1, dtype=_stl_dtype_header)
     header['face_count'] = len(mesh.faces)
-
-    packed = np.zeros(len(mesh.faces), dtype=_stl_dtype)
-    packed['normals'] = mesh.face_normals
-    packed['vertices'] = mesh.triangles
-
-    export = header.tostring()
-    export += packed.tostring()
-
-    return export
-
-
-def export_stl_ascii(mesh):
+    file_obj.write(header.tostring())
+
+    faces = mesh.faces
+    vertices = mesh.vertices
+    face_normals = mesh.face_normals
+    # only pack a fixed number of faces at a time so the
+    # memory used doesn't scale with the size of the mesh
+    for start in range(0, len(faces), chunk):
+        end = start + chunk
+        packed = np.zeros(len(faces[start:end]), dtype=_stl_dtype)
+        packed['normals'] = face_normals[start:end]
+        packed['vertices'] = vertices[faces[start:end]]
+        file_obj.write(packed.tostring())
+
+
+def export_stl_ascii(mesh, file_obj=None, chunk=2**14):
     """
     Convert a Trimesh object into an ASCII STL file.
 
     Parameters
     ---------
     mesh : trimesh.Trimesh
+    file_obj : None, or file object
+        Open binary file object to write to
+    chunk : int
+        Number of faces to format and write at once
 
     Returns
     ---------
     export : str
         Mesh represented as an ASCII STL file
+        or None if data was written to file_obj
     """
-
-    # move all the data that's going into the STL file into one array
-    blob = np.zeros((len(mesh.faces), 4, 3))
-    blob[:, 0, :] = mesh.face_normals
-    blob[:, 1:, :] = mesh.triangles
-
-    # create a lengthy format string for the data section of the file
-    format_string = 'facet normal {} {} {}\nouter loop\n'
-    format_string += 'vertex {} {} {}\n' * 3
-    format_string += 'endloop\nendfacet\n'
-    format_string *= len(mesh.faces)
-
-    # concatenate the header, data, and footer
-    export = 'solid \n'
-    export += format_string.format(*blob.reshape(-1))
-    export += 'endsolid'
-
-    return export
+    if file_obj is None:
+        # write into memory and return the result
+        stream = util.BytesIO()
+        export_stl_ascii(mesh, file_obj=stream, chunk=chunk)
+        return stream.getvalue().decode('utf-8')
+
+    # create a format string for the data of a single face
+    format_face = 'facet normal {} {} {}\nouter loop\n'
+    format_face += 'vertex {} {} {}\n' * 3
+    format_face += 'endloop\nendfacet\n'
+
+    file_obj.write(b'solid \n')
+
+    faces = mesh.faces
+    vertices = mesh.vertices
+    face_normals = mesh.face_normals
+    for start in range(0, len(faces), chunk):
+        end = start + chunk
+        # move the data for this chunk of faces into one array
+        blob = np.zeros((len(faces[start:end]), 4, 3))
+        blob[:, 0, :] = face_normals[start:end]
+        blob[:, 1:, :] = vertices[faces[start:end]]
+
+        format_string = format_face * len(blob)
+        file_obj.write(format_string.format(
+            *blob.reshape(-1)).encode('utf-8'))
+
+    file_obj.write(b'endsolid')
 
 
 _stl_loaders = {'stl': load_stl,
@@ -1,4 +1,4 @@
-import collections
+import re
 
 import numpy as np
 
@@ -9,6 +9,7 @@ except ImportError:
 
 from .. import util
 from .. import visual
+from .. import grouping
 
 from ..constants import log
 
@@ -88,207 +89,479 @@ def load_wavefront(file_obj, resolver=None, **kwargs):
     text = file_obj.read()
     if hasattr(text, 'decode'):
         text = text.decode('utf-8')
-    text = text.replace('\r\n', '\n').replace('\r', '\n') + ' \n'
-
-    meshes = []
-
-    def append_mesh():
-        # append kwargs for a Trimesh constructor
-        # to our list of meshes
-        if len(current['f']) > 0:
-            # get vertices as clean numpy array
-            vertices = np.array(current['v'],
-                                dtype=np.float64).reshape((-1, 3))
-            # do the same for faces
-            faces = np.array(current['f'],
-                             dtype=np.int64).reshape((-1, 3))
-
-            # get keys and values of remap as numpy arrays
-            # we are going to try to preserve the order as
-            # much as possible by sorting by remap key
-            keys, values = (np.array(list(remap.keys())),
-                            np.array(list(remap.values())))
-
-            try:
-                # if we sort keys as strings they will be an
-                # ordering like (1/1/1, 10/10/10) vs (1/1/1, 2/2/2)
-                # so try to convert to int before sorting
-                split = np.array([i.split('/')[0] for i in keys],
-                                 dtype=np.int)
-                order = split.argsort()
-            except BaseException:
-                # we can still use arbitrary order as a fallback
-                order = keys.argsort()
-
-            # new order of vertices
-            vert_order = values[order]
-
-            # we need to mask to preserve index relationship
-            # between faces and vertices
-            face_order = np.zeros(len(vertices),
-                                  dtype=np.int64)
-            face_order[vert_order] = np.arange(len(vertices),
-                                               dtype=np.int64)
-
-            # apply the ordering and put into kwarg dict
-            loaded = {'vertices': vertices[vert_order],
-                      'faces': face_order[faces],
-                      'metadata': {'object_name': object_name}}
-
-            # handle vertex normals
-            if len(current['vn']) > 0:
-                normals = np.array(current['vn'],
-                                   dtype=np.float64).reshape((-1, 3))
-                loaded['vertex_normals'] = normals[vert_order]
-
-            # build face groups information
-            # faces didn't move around so we don't have to reindex
-            if len(current['g']) > 0:
-                face_groups = np.zeros(len(current['f']) // 3,
-                                       dtype=np.int64)
-                for idx, start_f in current['g']:
-                    face_groups[start_f:] = idx
-                loaded['metadata']['face_groups'] = face_groups
-
-            if len(current['usemtl']) > 0 and any(current['vt_ok']):
-                texture = np.full((len(current['vt_ok']), 3),
-                                  np.nan,
-                                  dtype=np.float64)
-                # make sure mask is numpy array for older numpy
-                vt_ok = np.asanyarray(current['vt_ok'],
-                                      dtype=np.bool)
-                texture[vt_ok] = current['vt']
-
-                for usemtl in current['usemtl']:
-                    try:
-                        findices = usemtl_to_findices[usemtl]
-                        uv = texture[findices]
-                        # what is the file name of the texture image
-                        file_name = mtllibs[usemtl]['map_Kd']
-                        # get the data as bytes
-                        file_data = resolver.get(file_name)
-                        # load the bytes into a PIL image
-                        image = PIL.Image.open(
-                            util.wrap_as_stream(file_data))
-                        # create a texture object
-                        loaded['visual'] = visual.texture.TextureVisuals(
-                            uv=uv, image=image)
-                    except BaseException:
-                        log.error('failed to load texture: {}'.format(usemtl),
-                                  exc_info=True)
-
-            # apply the vertex order to the visual object
-            if 'visual' in loaded:
-                try:
-                    loaded['visual'].update_vertices(vert_order)
-                except BaseException:
-                    log.error('failed to update vertices',
-                              exc_info=True)
-                    loaded.pop('visual')
-
-            # this mesh is done so append the loaded mesh kwarg dict
-            meshes.append(loaded)
-
-    attribs = {k: [] for k in ['v', 'vt', 'vn']}
-    current = {k: [] for k in ['v', 'vt', 'vn',
-                               'f', 'g', 'usemtl',
-                               'vt_ok', 'vn_ok']}
-    # usemtl to 'f' indices
-    usemtl_to_findices = collections.defaultdict(list)
+    text = text.replace('\r\n', '\n').replace('\r', '\n') + '\n'
+    if '#' in text:
+        # remove comments
+        text = re.sub(r'#[^\n]*', '', text)
+
+    lines = _Lines(text)
+    if np.in1d(lines.char(0), [ord(' '), ord('\t')]).any():
+        # remove indentation so lines can be classified by
+        # their first characters, only done if necessary
+        lines = _Lines(re.sub(r'(?m)^[ \t]+', '', text))
+    # text is no longer needed as we have the encoded data
+    text = None
+
+    # classify every line at once by its first characters
+    first, second, third = lines.char(0), lines.char(1), lines.char(2)
+    kinds = {'v': (first == ord('v')) & _whitespace[second],
+             'vt': ((first == ord('v')) & (second == ord('t')) &
+                    _whitespace[third]),
+             'vn': ((first == ord('v')) & (second == ord('n')) &
+                    _whitespace[third])}
+    is_face = (first == ord('f')) & _whitespace[second]
+
+    # parse all v, vt and vn values in bulk
+    attribs = {k: _parse_values(*lines.select(mask, len(k)))
+               for k, mask in kinds.items()}
+
+    # the line index of each face line
+    face_lines = np.nonzero(is_face)[0]
+    # parse the vertex references for every face line
+    refs, sizes = _parse_faces(*lines.select(is_face, 1),
+                               prior=np.column_stack(
+                                   [np.cumsum(kinds[k])[face_lines]
+                                    for k in ['v', 'vt', 'vn']]))
+    # (n * 3, 3) int, (v, vt, vn) of every triangle corner
+    # and the index in face_lines of every triangle
+    corners, triangle_line = _triangulate(refs, sizes)
+
+    # the only lines handled one at a time are the rare lines
+    # which define objects, groups and materials
+    names = ['']
+    usemtl = [[]]
     mtllibs = {}
-    # remap vertex indexes {str key: int index}
-    remap = {}
-    next_idx = 0
-    group_idx = 0
-    object_name = ''
-
-    for line in text.split("\n"):
-        line_split = line.strip().split()
+    object_lines = []
+    group_lines = []
+    candidates = np.nonzero(np.in1d(first, np.frombuffer(
+        b'ogum', dtype=np.uint8)))[0]
+    for index in candidates:
+        line_split = lines.line(index).split()
         if len(line_split) < 2:
             continue
-        if line_split[0] in attribs:
-            # v, vt, or vn
-            # vertex, vertex texture, or vertex normal
-            # only parse 3 values, ignore colors
-            value = [float(x) for x in line_split[1:4]]
-            # vt: u [v] [w]  # v, w is optional and default value is 0
-            if line_split[0] == 'vt' and len(value) != 3:
-                for _ in range(3 - len(value)):
-                    value.append(0)
-            attribs[line_split[0]].append(value)
-        elif line_split[0] == 'f':
-            # a face
-            ft = line_split[1:]
-            if len(ft) == 4:
-                # hasty triangulation of quad
-                ft = [ft[0], ft[1], ft[2], ft[2], ft[3], ft[0]]
-            for f in ft:
-                # loop through each vertex reference of a face
-                # we are reshaping later into (n,3)
-                if f not in remap:
-                    remap[f] = next_idx
-                    next_idx += 1
-                    # faces are "vertex index"/"vertex texture"/"vertex normal"
-                    # you are allowed to leave a value blank, which .split
-                    # will handle by nicely maintaining the index
-                    f_split = f.split('/')
-                    current['v'].append(attribs['v'][int(f_split[0]) - 1])
-                    if len(f_split) > 1 and f_split[1] != '':
-                        current['vt'].append(
-                            attribs['vt'][int(f_split[1]) - 1])
-                        current['vt_ok'].append(True)
-                    else:
-                        current['vt_ok'].append(False)
-                    if len(f_split) > 2:
-                        current['vn'].append(
-                            attribs['vn'][int(f_split[2]) - 1])
-                        current['vn_ok'].append(True)
-                    else:
-                        current['vn_ok'].append(False)
-                    if len(current['usemtl']) > 0:
-                        usemtl_to_findices[current['usemtl']
-                                           [-1]].append(len(current['vt']) - 1)
-                current['f'].append(remap[f])
-        elif line_split[0] == 'o':
+        key, value = line_split[:2]
+        if key == 'o':
             # defining a new object
-            append_mesh()
-            # reset current to empty lists
-            current = {k: [] for k in current.keys()}
-            usemtl_to_findices = collections.defaultdict(list)
-            remap = {}
-            next_idx = 0
-            group_idx = 0
-            object_name = line_split[1]
-
-        elif line_split[0] == 'g':
+            object_lines.append(index)
+            names.append(value)
+            usemtl.append([])
+        elif key == 'g':
             # defining a new group
-            group_idx += 1
-            current['g'].append((group_idx, len(current['f']) // 3))
-        elif line_split[0] == 'mtllib':
-
-            # the name of the referenced material file
-            mtl_name = line_split[1]
+            group_lines.append(index)
+        elif key == 'usemtl':
+            usemtl[-1].append(value)
+        elif key == 'mtllib':
             try:
                 # fetch bytes containing MTL data
-                mtl_data = resolver.get(mtl_name)
+                mtl_data = resolver.get(value)
                 # load into a list of dict
                 for mtllib in parse_mtl(mtl_data):
                     # save new materials
                     mtllibs[mtllib['newmtl']] = mtllib
             except BaseException:
-                log.error('unable to load material: {}'.format(mtl_name),
+                log.error('unable to load material: {}'.format(value),
                           exc_info=True)
-                continue
 
-        elif line_split[0] == 'usemtl':
-            current['usemtl'].append(line_split[1])
+    # which object each face line is in
+    face_object = np.searchsorted(object_lines, face_lines)
+    # groups are counted from the start of each object
+    object_groups = np.searchsorted(
+        group_lines, np.append(0, object_lines))
+    face_group = (np.searchsorted(group_lines, face_lines) -
+                  object_groups[face_object])
+    has_groups = np.diff(np.append(object_groups, len(group_lines))) > 0
+
+    # split triangles by object keeping them in order
+    triangle_object = face_object[triangle_line]
+    order = np.argsort(triangle_object, kind='mergesort')
+    split = np.cumsum(np.bincount(triangle_object,
+                                  minlength=len(names)))[:-1]
 
-    if next_idx > 0:
-        append_mesh()
+    meshes = []
+    for object_idx, triangles in enumerate(np.split(order, split)):
+        if len(triangles) == 0:
+            continue
+        # (n * 3, 3) int, (v, vt, vn) of every face corner
+        triples = corners.reshape((-1, 3, 3))[triangles].reshape((-1, 3))
+        # find the unique triples, shifted so they are
+        # non-negative which hashable_rows requires
+        unique, inverse = grouping.unique_rows(triples + 1)
+        # preserve order as much as possible by sorting vertices by
+        # their position index and then by their first reference
+        vert_order = np.lexsort((unique, triples[unique][:, 0]))
+        unique = unique[vert_order]
+        # the new index of each unique triple
+        rank = np.zeros(len(unique), dtype=np.int64)
+        rank[vert_order] = np.arange(len(unique), dtype=np.int64)
+        # the (v, vt, vn) indexes of each final vertex
+        index = triples[unique]
+
+        loaded = {'vertices': attribs['v'][index[:, 0]],
+                  'faces': rank[inverse].reshape((-1, 3)),
+                  'metadata': {'object_name': names[object_idx]}}
+
+        # handle vertex normals
+        if len(attribs['vn']) > 0 and (index[:, 2] >= 0).all():
+            loaded['vertex_normals'] = attribs['vn'][index[:, 2]]
+
+        # build face groups information
+        # faces didn't move around so we don't have to reindex
+        if has_groups[object_idx]:
+            loaded['metadata']['face_groups'] = face_group[
+                triangle_line[triangles]]
+
+        vt_ok = index[:, 1] >= 0
+        if len(usemtl[object_idx]) > 0 and vt_ok.any():
+            uv = np.full((len(index), 3),
+                         np.nan,
+                         dtype=np.float64)
+            uv[vt_ok] = attribs['vt'][index[vt_ok, 1]]
+
+            for name in usemtl[object_idx]:
+                try:
+                    # what is the file name of the texture image
+                    file_name = mtllibs[name]['map_Kd']
+                    # get the data as bytes
+                    file_data = resolver.get(file_name)
+                    # load the bytes into a PIL image
+                    image = PIL.Image.open(
+                        util.wrap_as_stream(file_data))
+                    # create a texture object
+                    loaded['visual'] = visual.texture.TextureVisuals(
+                        uv=uv, image=image)
+                except BaseException:
+                    log.error('failed to load texture: {}'.format(name),
+                              exc_info=True)
+
+        # this mesh is done so append the loaded mesh kwarg dict
+        meshes.append(loaded)
 
     return meshes
 
 
+# lookup tables for characters by their byte value
+_whitespace = np.zeros(256, dtype=np.bool_)
+_whitespace[[9, 10, 11, 12, 13, 32]] = True
+# characters which separate integers on face lines
+_face_separators = _whitespace.copy()
+_face_separators[ord('/')] = True
+# characters which are allowed on face lines
+_face_characters = _face_separators.copy()
+_face_characters[np.frombuffer(b'0123456789-', dtype=np.uint8)] = True
+
+
+class _Lines(object):
+    """
+    The lines of a text file as one array of bytes
+    with the position and length of each line.
+    """
+
+    def __init__(self, text):
+        # text should end with a newline
+        self.data = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+        ends = np.nonzero(self.data == ord('\n'))[0]
+        self.starts = np.append(0, ends[:-1] + 1)
+        # length of each line including the newline
+        self.lengths = ends - self.starts + 1
+
+    def char(self, offset):
+        """
+        Get a character from every line.
+
+        Parameters
+        ------------
+        offset : int
+          Position of the character in each line
+
+        Returns
+        ------------
+        char : (len(self.starts),) uint8
+          Character from each line, which may be from
+          the next line if a line is too short
+        """
+        return self.data[np.minimum(self.starts + offset,
+                                    len(self.data) - 1)]
+
+    def line(self, index):
+        """
+        Get a single line as a string.
+        """
+        start = self.starts[index]
+        return self.data[start:start + self.lengths[index]].tobytes(
+        ).decode('utf-8')
+
+    def select(self, mask, skip):
+        """
+        Get the data for a subset of lines.
+
+        Parameters
+        ------------
+        mask : (len(self.starts),) bool
+          Which lines to select
+        skip : int
+          Number of characters at the start of each
+          line to replace with spaces, i.e. the key
+
+        Returns
+        ------------
+        data : (m,) uint8
+          Data of the selected lines
+        starts : (n,) int
+          Position of each line in data
+        """
+        # lines of the same kind are usually in long runs
+        # so copy the data one run of lines at a time
+        edges = np.diff(np.concatenate(
+            ([False], mask, [False])).astype(np.int8))
+        first = np.nonzero(edges == 1)[0]
+        last = np.nonzero(edges == -1)[0] - 1
+        data = np.concatenate(
+            [np.zeros(0, dtype=np.uint8)] +
+            [self.data[a:b] for a, b in zip(
+                self.starts[first],
+                self.starts[last] + self.lengths[last])])
+        lengths = self.lengths[mask]
+        starts = np.cumsum(lengths) - lengths
+        for i in range(skip):
+            data[starts + i] = ord(' ')
+        return data, starts
+
+
+def _count_tokens(data, starts, separators):
+    """
+    Count the number of tokens on each line.
+
+    Parameters
+    ------------
+    data : (m,) uint8
+      Data of lines
+    starts : (n,) int
+      Position of each line in data
+    separators : (256,) bool
+      Which characters separate tokens
+
+    Returns
+    ------------
+    count : (n,) int
+      Number of tokens on each line
+    """
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+    separator = separators[data]
+    # a token starts wherever a separator is followed by anything else
+    token = ~separator
+    token[1:] &= separator[:-1]
+    return np.add.reduceat(token, starts, dtype=np.int64)
+
+
+def _parse_values(data, starts, columns=3):
+    """
+    Parse lines of `v`, `vt`, or `vn` values in bulk.
+
+    Parameters
+    ------------
+    data : (m,) uint8
+      Data of lines with the keys replaced by spaces
+    starts : (n,) int
+      Position of each line in data
+    columns : int
+      Number of values to keep per line, lines
+      with fewer values are padded with zeros
+
+    Returns
+    ------------
+    values : (n, columns) float
+      Values from each line in order
+    """
+    values = np.zeros((len(starts), columns), dtype=np.float64)
+    if len(starts) == 0:
+        return values
+
+    # how many values are on each line
+    counts = _count_tokens(data, starts, _whitespace)
+    flat = np.fromstring(data.tobytes(), sep=' ')
+    if len(flat) != counts.sum():
+        raise ValueError('unable to parse OBJ values!')
+
+    # the position of the first value of each line
+    offset = np.append(0, np.cumsum(counts)[:-1])
+    for column in range(columns):
+        mask = counts > column
+        values[mask, column] = flat[offset[mask] + column]
+    return values
+
+
+def _parse_faces(data, starts, prior):
+    """
+    Parse the vertex references of `f` lines in bulk.
+
+    Parameters
+    ------------
+    data : (m,) uint8
+      Data of lines with the keys replaced by spaces
+    starts : (n,) int
+      Position of each line in data
+    prior : (n, 3) int
+      Number of v, vt, vn lines before each line
+      for resolving relative indexes
+
+    Returns
+    ------------
+    refs : (p, 3) int
+      Zero- indexed (v, vt, vn) of each vertex reference
+      with -1 for values that weren't specified
+    sizes : (n,) int
+      Number of vertex references on each line
+    """
+    if len(starts) == 0:
+        return (np.zeros((0, 3), dtype=np.int64),
+                np.zeros(0, dtype=np.int64))
+    if not _face_characters[data].all():
+        raise ValueError('unable to parse OBJ faces!')
+
+    # how many integers are on each line
+    counts = _count_tokens(data, starts, _face_separators)
+    # skip lines with no references like a bare `f`
+    line = np.nonzero(counts)[0]
+    if len(line) == 0:
+        return np.zeros((0, 3), dtype=np.int64), counts
+    line = line[0]
+
+    # the format of every vertex reference is determined
+    # from the first reference: 1, 1/2, 1/2/3, or 1//3
+    first = data[starts[line]:
+                 starts[line + 1] if line + 1 < len(starts) else len(data)]
+    first = first.tobytes().split()[0]
+    slashes = first.count(b'/')
+    double = int(b'//' in first)
+    if slashes > 2:
+        return _parse_faces_mixed(data, starts, prior)
+    columns = [[0], [0, 1], [0, 1, 2]][slashes]
+    if double:
+        columns = [0, 2]
+
+    total = counts.sum()
+    width = len(columns)
+    slash = data == ord('/')
+    # make sure every reference has the same format
+    if ((counts % width).any() or
+            slash.sum() != (total // width) * slashes or
+            (slash[1:] & slash[:-1]).sum() != (total // width) * double):
+        return _parse_faces_mixed(data, starts, prior)
+
+    data[slash] = ord(' ')
+    flat = np.fromstring(data.tobytes(), dtype=np.int64, sep=' ')
+    if len(flat) != total:
+        raise ValueError('unable to parse OBJ faces!')
+    flat = flat.reshape((-1, width))
+    sizes = counts // width
+
+    refs = np.full((len(flat), 3), -1, dtype=np.int64)
+    refs[:, columns] = flat - 1
+    negative = flat < 0
+    if negative.any():
+        # relative indexes count back from the current line
+        line = np.repeat(np.arange(len(sizes)), sizes)
+        for i, column in enumerate(columns):
+            mask = negative[:, i]
+            refs[mask, column] = (prior[line[mask], column] +
+                                  flat[mask, i])
+    return refs, sizes
+
+
+def _parse_faces_mixed(data, starts, prior):
+    """
+    Parse the vertex references of `f` lines one at a time
+    which handles references with different formats.
+
+    Parameters
+    ------------
+    data : (m,) uint8
+      Data of lines with the keys replaced by spaces
+    starts : (n,) int
+      Position of each line in data
+    prior : (n, 3) int
+      Number of v, vt, vn lines before each line
+      for resolving relative indexes
+
+    Returns
+    ------------
+    refs : (p, 3) int
+      Zero- indexed (v, vt, vn) of each vertex reference
+      with -1 for values that weren't specified
+    sizes : (n,) int
+      Number of vertex references on each line
+    """
+    refs = []
+    sizes = []
+    text = data.tobytes().decode('utf-8')
+    for line, count in zip(text.split('\n'), prior):
+        line_split = line.split()
+        sizes.append(len(line_split))
+        for f in line_split:
+            # faces are "vertex index"/"vertex texture"/"vertex normal"
+            # you are allowed to leave a value blank
+            ref = [-1, -1, -1]
+            for i, value in enumerate(f.split('/')[:3]):
+                if value == '':
+                    continue
+                value = int(value)
+                if value < 0:
+                    # negative indexes are relative to the end
+                    ref[i] = count[i] + value
+                else:
+                    ref[i] = value - 1
+            refs.append(ref)
+    return (np.array(refs, dtype=np.int64).reshape((-1, 3)),
+            np.array(sizes, dtype=np.int64))
+
+
+def _triangulate(refs, sizes):
+    """
+    Split polygon faces into triangles.
+
+    Parameters
+    ------------
+    refs : (p, 3) int
+      Vertex references of every face
+    sizes : (n,) int
+      Number of references in each face
+
+    Returns
+    ------------
+    corners : (m * 3, 3) int
+      Vertex references of every triangle corner
+    line : (m,) int
+      Index of the face each triangle came from
+    """
+    # the first reference and the first triangle of each face
+    ref_start = np.append(0, np.cumsum(sizes)[:-1])
+    tri_count = np.maximum(sizes - 2, 0)
+    tri_start = np.append(0, np.cumsum(tri_count)[:-1])
+
+    corners = np.zeros((tri_count.sum() * 3, 3), dtype=np.int64)
+    # triangulate every face with the same number of references
+    # at once while keeping the faces in their original order
+    for size in np.unique(sizes[tri_count > 0]):
+        if size == 4:
+            # hasty triangulation of quad
+            index = np.array([0, 1, 2, 2, 3, 0], dtype=np.int64)
+        else:
+            # otherwise use a triangle fan
+            fan = np.arange(1, size - 1, dtype=np.int64)
+            index = np.column_stack((np.zeros(len(fan), dtype=np.int64),
+                                     fan,
+                                     fan + 1)).ravel()
+        mask = sizes == size
+        target = (tri_start[mask] * 3).reshape((-1, 1)) + np.arange(
+            len(index))
+        corners[target.ravel()] = refs[(
+            ref_start[mask].reshape((-1, 1)) + index).ravel()]
+
+    line = np.repeat(np.arange(len(sizes)), tri_count)
+    return corners, line
+
+
 def export_wavefront(mesh,
                      include_normals=True,
                      include_texture=True):
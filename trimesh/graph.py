@@ -215,6 +215,92 @@ def vertex_adjacency_graph(mesh):
     return g
 
 
+def neighbors_csr(edges, count=None):
+    """
+    Find the neighbors of every node of an undirected graph
+    in compressed sparse row form, without creating a graph.
+
+    Parameters
+    ----------
+    edges : (n, 2) int
+      Unique edges of a graph
+    count : None or int
+      Number of nodes, if None edges.max() + 1
+
+    Returns
+    ---------
+    offsets : (count + 1,) int
+      Neighbors of node i are indices[offsets[i]:offsets[i + 1]]
+    indices : (2 * n,) int
+      Neighbors of every node sorted by node then neighbor
+
+    Examples
+    ----------
+    >>> offsets, indices = graph.neighbors_csr(mesh.edges_unique)
+    >>> indices[offsets[0]:offsets[1]]
+    array([1, 3, 4])
+    """
+    edges = np.asanyarray(edges, dtype=np.int64).reshape((-1, 2))
+    # every edge goes both ways
+    return _group_csr(keys=edges.ravel(),
+                      values=edges[:, ::-1].ravel(),
+                      count=count)
+
+
+def vertex_faces_csr(faces, count=None):
+    """
+    Find the faces which include every vertex in compressed
+    sparse row form.
+
+    Parameters
+    ----------
+    faces : (n, 3) int
+      Indexes of vertices
+    count : None or int
+      Number of vertices, if None faces.max() + 1
+
+    Returns
+    ---------
+    offsets : (count + 1,) int
+      Faces of vertex i are indices[offsets[i]:offsets[i + 1]]
+    indices : (3 * n,) int
+      Index of faces sorted by vertex then face
+    """
+    faces = np.asanyarray(faces, dtype=np.int64)
+    return _group_csr(keys=faces.ravel(),
+                      values=np.repeat(np.arange(len(faces)),
+                                       faces.shape[1]),
+                      count=count)
+
+
+def _group_csr(keys, values, count=None):
+    """
+    Group values by integer keys as compressed sparse rows.
+
+    Parameters
+    ----------
+    keys : (n,) int
+      Row of each value
+    values : (n,) int
+      Values to group
+    count : None or int
+      Number of rows, if None keys.max() + 1
+
+    Returns
+    ---------
+    offsets : (count + 1,) int
+      Start of every row in indices
+    indices : (n,) int
+      Values sorted by key then value
+    """
+    if count is None:
+        count = keys.max() + 1 if len(keys) > 0 else 0
+    order = np.lexsort((values, keys))
+    offsets = np.zeros(int(count) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=count), out=offsets[1:])
+    return offsets, values[order]
+
+
 def shared_edges(faces_a, faces_b):
     """
     Given two sets of faces, find the edges which are in both sets.
@@ -10,11 +10,6 @@ import numpy as np
 from . import util
 from .constants import log, tol
 
-try:
-    from scipy.spatial import cKDTree
-except ImportError:
-    log.warning('scipy unavailable')
-
 
 def merge_vertices(mesh,
                    digits=None,
@@ -543,6 +538,8 @@ def group_distance(values, distance):
         Indexes of points that make up a group
 
     """
+    from scipy.spatial import cKDTree
+
     values = np.asanyarray(values,
                            dtype=np.float64)
 
@@ -583,6 +580,7 @@ def clusters(points, radius):
         Indices of points in a cluster
 
     """
+    from scipy.spatial import cKDTree
     from . import graph
     tree = cKDTree(points)
 
@@ -46,65 +46,6 @@ def mesh_plane(mesh,
         Only returned if return_faces was True
     """
 
-    def triangle_cases(signs):
-        """
-        Figure out which faces correspond to which intersection
-        case from the signs of the dot product of each vertex.
-        Does this by bitbang each row of signs into an 8 bit
-        integer.
-
-        code : signs      : intersects
-        0    : [-1 -1 -1] : No
-        2    : [-1 -1  0] : No
-        4    : [-1 -1  1] : Yes; 2 on one side, 1 on the other
-        6    : [-1  0  0] : Yes; one edge fully on plane
-        8    : [-1  0  1] : Yes; one vertex on plane, 2 on different sides
-        12   : [-1  1  1] : Yes; 2 on one side, 1 on the other
-        14   : [0 0 0]    : No (on plane fully)
-        16   : [0 0 1]    : Yes; one edge fully on plane
-        20   : [0 1 1]    : No
-        28   : [1 1 1]    : No
-
-        Parameters
-        ----------
-        signs: (n,3) int, all values are -1,0, or 1
-               Each row contains the dot product of all three vertices
-               in a face with respect to the plane
-
-        Returns
-        ---------
-        basic:      (n,) bool, which faces are in the basic intersection case
-        one_vertex: (n,) bool, which faces are in the one vertex case
-        one_edge:   (n,) bool, which faces are in the one edge case
-        """
-
-        signs_sorted = np.sort(signs, axis=1)
-        coded = np.zeros(len(signs_sorted), dtype=np.int8) + 14
-        for i in range(3):
-            coded += signs_sorted[:, i] << 3 - i
-
-        # one edge fully on the plane
-        # note that we are only accepting *one* of the on- edge cases,
-        # where the other vertex has a positive dot product (16) instead
-        # of both on- edge cases ([6,16])
-        # this is so that for regions that are co-planar with the the section plane
-        # we don't end up with an invalid boundary
-        key = np.zeros(29, dtype=np.bool)
-        key[16] = True
-        one_edge = key[coded]
-
-        # one vertex on plane, other two on different sides
-        key[:] = False
-        key[8] = True
-        one_vertex = key[coded]
-
-        # one vertex on one side of the plane, two on the other
-        key[:] = False
-        key[[4, 12]] = True
-        basic = key[coded]
-
-        return basic, one_vertex, one_edge
-
     def handle_on_vertex(signs, faces, vertices):
         # case where one vertex is on plane, two are on different sides
         vertex_plane = faces[signs == 0]
@@ -168,7 +109,7 @@ def mesh_plane(mesh,
 
     # figure out which triangles are in the cross section,
     # and which of the three intersection cases they are in
-    cases = triangle_cases(signs)
+    cases = _triangle_cases(signs)
     # handlers for each case
     handlers = (handle_basic,
                 handle_on_vertex,
@@ -189,14 +130,82 @@ def mesh_plane(mesh,
     return lines
 
 
+def _triangle_cases(signs):
+    """
+    Figure out which faces correspond to which intersection
+    case from the signs of the dot product of each vertex.
+    Does this by bitbang each row of signs into an 8 bit
+    integer.
+
+    code : signs      : intersects
+    0    : [-1 -1 -1] : No
+    2    : [-1 -1  0] : No
+    4    : [-1 -1  1] : Yes; 2 on one side, 1 on the other
+    6    : [-1  0  0] : Yes; one edge fully on plane
+    8    : [-1  0  1] : Yes; one vertex on plane, 2 on different sides
+    12   : [-1  1  1] : Yes; 2 on one side, 1 on the other
+    14   : [0 0 0]    : No (on plane fully)
+    16   : [0 0 1]    : Yes; one edge fully on plane
+    20   : [0 1 1]    : No
+    28   : [1 1 1]    : No
+
+    Parameters
+    ----------
+    signs: (n,3) int, all values are -1,0, or 1
+           Each row contains the dot product of all three vertices
+           in a face with respect to the plane
+
+    Returns
+    ---------
+    basic:      (n,) bool, which faces are in the basic intersection case
+    one_vertex: (n,) bool, which faces are in the one vertex case
+    one_edge:   (n,) bool, which faces are in the one edge case
+    """
+
+    signs_sorted = np.sort(signs, axis=1)
+    coded = np.zeros(len(signs_sorted), dtype=np.int8) + 14
+    for i in range(3):
+        coded += signs_sorted[:, i] << 3 - i
+
+    # one edge fully on the plane
+    # note that we are only accepting *one* of the on- edge cases,
+    # where the other vertex has a positive dot product (16) instead
+    # of both on- edge cases ([6,16])
+    # this is so that for regions that are co-planar with the the section plane
+    # we don't end up with an invalid boundary
+    key = np.zeros(29, dtype=np.bool)
+    key[16] = True
+    one_edge = key[coded]
+
+    # one vertex on plane, other two on different sides
+    key[:] = False
+    key[8] = True
+    one_vertex = key[coded]
+
+    # one vertex on one side of the plane, two on the other
+    key[:] = False
+    key[[4, 12]] = True
+    basic = key[coded]
+
+    return basic, one_vertex, one_edge
+
+
 def mesh_multiplane(mesh,
                     plane_origin,
                     plane_normal,
-                    heights):
+                    heights,
+                    workers=None):
     """
     A utility function for slicing a mesh by multiple
     parallel planes, which caches the dot product operation.
 
+    Rather than slicing the mesh once per plane, the layers
+    each face crosses are found from its range of heights
+    along the normal with a binary search of the sorted
+    heights, and every face- layer pair is sliced in one
+    vectorized pass, so only faces crossing a layer are
+    visited.
+
     Parameters
     -------------
     mesh : trimesh.Trimesh
@@ -207,6 +216,8 @@ def mesh_multiplane(mesh,
         Point on a plane
     heights : (m,) float
         Offset distances from plane to slice at
+    workers : None or int
+        Number of threads to split ranges of layers between
 
     Returns
     --------------
@@ -221,66 +232,180 @@ def mesh_multiplane(mesh,
     plane_normal = util.unitize(plane_normal)
     plane_origin = np.asanyarray(plane_origin,
                                  dtype=np.float64)
-    heights = np.asanyarray(heights, dtype=np.float64)
+    heights = np.asanyarray(heights, dtype=np.float64).reshape(-1)
 
     # dot product of every vertex with plane
-    vertex_dots = np.dot(plane_normal,
-                         (mesh.vertices - plane_origin).T)
+    vertex_dots = np.dot(mesh.vertices - plane_origin, plane_normal)
 
     # reconstruct transforms for each 2D section
-    base_transform = geometry.plane_transform(origin=plane_origin,
-                                              normal=plane_normal)
-    base_transform = np.linalg.inv(base_transform)
-
-    # alter translation Z inside loop
-    translation = np.eye(4)
-
-    # store results
-    transforms = []
-    face_index = []
-    segments = []
-
-    # loop through user specified heights
-    for height in heights:
-        # offset the origin by the height
-        new_origin = plane_origin + (plane_normal * height)
-        # offset the dot products by height and index by faces
-        new_dots = (vertex_dots - height)[mesh.faces]
-        # run the intersection with the cached dot products
-        lines, index = mesh_plane(mesh=mesh,
-                                  plane_origin=new_origin,
-                                  plane_normal=plane_normal,
-                                  return_faces=True,
-                                  cached_dots=new_dots)
-
-        # get the transforms to 3D space and back
-        translation[2, 3] = height
-        to_3D = np.dot(base_transform, translation)
-        to_2D = np.linalg.inv(to_3D)
-        transforms.append(to_3D)
-
-        # transform points to 2D frame
-        lines_2D = transformations.transform_points(
-            lines.reshape((-1, 3)),
-            to_2D)
-
-        # if we didn't screw up the transform all
-        # of the Z values should be zero
-        assert np.allclose(lines_2D[:, 2], 0.0)
-
-        # reshape back in to lines and discard Z
-        lines_2D = lines_2D[:, :2].reshape((-1, 2, 2))
-        # store (n, 2, 2) float lines
-        segments.append(lines_2D)
-        # store (n,) int indexes of mesh.faces
-        face_index.append(face_index)
-
-    # (n, 4, 4) transforms from 2D to 3D
-    transforms = np.array(transforms, dtype=np.float64)
+    to_2D = geometry.plane_transform(origin=plane_origin,
+                                     normal=plane_normal)
+    base_transform = np.linalg.inv(to_2D)
+    # moving a section along the normal only changes the
+    # translation of the transform by the local Z axis
+    transforms = np.tile(base_transform, (len(heights), 1, 1))
+    transforms[:, :3, 3] += np.outer(heights, base_transform[:3, 2])
+
+    # every vertex in the 2D frame of the sections, which is
+    # affine so intersections can be interpolated in 2D
+    vertices_2D = transformations.transform_points(
+        mesh.vertices, to_2D)[:, :2]
+
+    # sort heights so the layers each face crosses are contiguous
+    order = np.argsort(heights, kind='mergesort')
+    ordered = heights[order]
+
+    # range of sorted layers which may cross each face
+    faces = mesh.faces.view(np.ndarray)
+    face_dots = vertex_dots[faces]
+    lower = np.searchsorted(
+        ordered, face_dots.min(axis=1) - tol.merge, side='left')
+    upper = np.searchsorted(
+        ordered, face_dots.max(axis=1) + tol.merge, side='right')
+
+    def chunk(bounds):
+        # slice the layers in one range of sorted layers
+        return _multiplane_chunk(faces=faces,
+                                 face_dots=face_dots,
+                                 vertices_2D=vertices_2D,
+                                 heights=ordered,
+                                 lower=np.clip(lower, *bounds),
+                                 upper=np.clip(upper, *bounds))
+
+    if workers is None or int(workers) <= 1 or len(heights) < 2:
+        results = [chunk((0, len(heights)))]
+    else:
+        split = np.linspace(0, len(heights),
+                            min(int(workers), len(heights)) + 1)
+        ranges = list(zip(split[:-1].astype(np.int64),
+                          split[1:].astype(np.int64)))
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(processes=len(ranges))
+        try:
+            results = pool.map(chunk, ranges)
+        finally:
+            pool.close()
+
+    # (n, 2, 2) segments for every layer
+    lines = np.vstack([r[0] for r in results])
+    layer = np.concatenate([r[1] for r in results])
+    face = np.concatenate([r[2] for r in results])
+    case = np.concatenate([r[3] for r in results])
+
+    # order segments by layer, then in the same order as
+    # mesh_plane returns them for each plane
+    sort = np.lexsort((face, case, layer))
+    split = np.cumsum(np.bincount(
+        layer, minlength=len(heights)))[:-1]
+    lines_split = np.split(lines[sort], split)
+    face_split = np.split(face[sort], split)
+
+    # store results in the order heights were passed
+    segments = [None] * len(heights)
+    face_index = [None] * len(heights)
+    for i, index in enumerate(order):
+        segments[index] = lines_split[i]
+        face_index[index] = face_split[i]
 
     return segments, transforms, face_index
 
 
+def _multiplane_chunk(faces,
+                      face_dots,
+                      vertices_2D,
+                      heights,
+                      lower,
+                      upper):
+    """
+    Slice every face by the sorted layers it may cross, with
+    the same cases and tolerances as `mesh_plane`.
+
+    Parameters
+    -------------
+    faces : (n, 3) int
+      Mesh faces
+    face_dots : (n, 3) float
+      Height of each vertex of each face along the normal
+    vertices_2D : (m, 2) float
+      Mesh vertices in the frame of the sections
+    heights : (p,) float
+      Sorted heights of layers
+    lower : (n,) int
+      First sorted layer each face may cross
+    upper : (n,) int
+      One past the last sorted layer each face may cross
+
+    Returns
+    -------------
+    lines : (q, 2, 2) float
+      Segment for each face and layer which intersect
+    layer : (q,) int
+      Index of sorted layer for each segment
+    face : (q,) int
+      Index of faces for each segment
+    case : (q,) int
+      Intersection case for each segment
+    """
+    counts = np.maximum(upper - lower, 0)
+    # every candidate pair of face and layer
+    face = np.repeat(np.arange(len(faces)), counts)
+    start = np.repeat(np.cumsum(counts) - counts, counts)
+    layer = np.repeat(lower, counts) + np.arange(len(face)) - start
+
+    # dot products relative to each pair's layer
+    dots = face_dots[face] - heights[layer].reshape((-1, 1))
+    signs = np.zeros(dots.shape, dtype=np.int8)
+    signs[dots < -tol.merge] = -1
+    signs[dots > tol.merge] = 1
+
+    # the other two columns for each column of a face
+    others = np.array([[1, 2], [0, 2], [0, 1]])
+
+    def interpolate(row, a, b):
+        # point on each edge at the layer height
+        va = faces[face[row], a]
+        vb = faces[face[row], b]
+        da = dots[row, a]
+        db = dots[row, b]
+        ratio = (-da / (db - da)).reshape((-1, 1))
+        return vertices_2D[va] + (vertices_2D[vb] - vertices_2D[va]) * ratio
+
+    lines = []
+    keep = []
+    for index, mask in enumerate(_triangle_cases(signs)):
+        row = np.nonzero(mask)[0]
+        if index == 0:
+            # one vertex on one side of the plane, two on the other
+            # where the unique vertex has the minority sign
+            sign = signs[row]
+            column = (sign != np.sign(
+                sign.sum(axis=1)).reshape((-1, 1))).argmax(axis=1)
+            line = np.stack((interpolate(row, column, (column + 1) % 3),
+                             interpolate(row, column, (column + 2) % 3)),
+                            axis=1)
+        elif index == 1:
+            # one vertex on plane, two on different sides
+            column = (signs[row] == 0).argmax(axis=1)
+            pair = others[column]
+            line = np.stack((
+                vertices_2D[faces[face[row], column]],
+                interpolate(row, pair[:, 0], pair[:, 1])), axis=1)
+        else:
+            # two vertices on the plane
+            column = (signs[row] != 0).argmax(axis=1)
+            pair = others[column]
+            line = np.stack((
+                vertices_2D[faces[face[row], pair[:, 0]]],
+                vertices_2D[faces[face[row], pair[:, 1]]]), axis=1)
+        lines.append(line.reshape((-1, 2, 2)))
+        keep.append(np.column_stack((
+            layer[row], face[row], np.ones(len(row), dtype=np.int64) * index)))
+
+    keep = np.vstack(keep).astype(np.int64)
+    lines = np.vstack(lines)
+    return lines, keep[:, 0], keep[:, 1], keep[:, 2]
+
+
 def plane_lines(plane_origin,
                 plane_normal,
                 endpoints,
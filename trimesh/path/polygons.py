@@ -15,6 +15,7 @@ from ..constants import tol_path as tol
 from ..constants import log
 from ..transformations import transform_points
 
+from .segments import stitch
 from .traversal import resample_path
 
 
@@ -124,6 +125,24 @@ def edges_to_polygons(edges, vertices):
         except ValueError:
             continue
 
+    return _with_interiors(polygons)
+
+
+def _with_interiors(polygons):
+    """
+    Combine polygons which only have exteriors into
+    polygons with holes using the enclosure tree.
+
+    Parameters
+    -----------
+    polygons : (n,) shapely.geometry.Polygon
+      Closed polygons with no interiors
+
+    Returns
+    ----------
+    complete : (m,) shapely.geometry.Polygon
+      Root polygons with interiors
+    """
     # if there is only one polygon, just return it
     if len(polygons) == 1:
         return polygons
@@ -142,6 +161,111 @@ def edges_to_polygons(edges, vertices):
     return complete
 
 
+def segments_to_polygons(segments, digits=5, scale=None):
+    """
+    Given an unordered soup of 2D line segments, such as
+    a single layer of `intersections.mesh_multiplane`,
+    generate a list of polygons with interiors.
+
+    Loops are stitched by hashing rounded endpoints rather
+    than building a vertex graph and a Path2D.
+
+    Parameters
+    -----------
+    segments : (n, 2, 2) float
+      Line segments in 2D space
+    digits : int
+      How many digits to consider when merging endpoints
+    scale : float or None
+      Approximate scale of drawing for precision
+
+    Returns
+    ----------
+    polygons : (p,) shapely.geometry.Polygon
+      Polygon objects with interiors
+    """
+    loops = stitch(segments, digits=digits)
+    closed = [p for p in paths_to_polygons(loops, scale=scale)
+              if p is not None]
+    return _with_interiors(closed)
+
+
+def layers_to_polygons(layers, workers=None, digits=5, scale=None):
+    """
+    Turn many layers of 2D line segments into polygons in a
+    pool of processes, yielding each layer in order as soon
+    as it is ready.
+
+    Intended for the result of `intersections.mesh_multiplane`:
+
+    lines, transforms, faces = mesh_multiplane(...)
+    for polygons, to_3D in zip(layers_to_polygons(lines), transforms):
+        ...
+
+    Parameters
+    -----------
+    layers : (n,) sequence of (m, 2, 2) float
+      Line segments in 2D space for each layer
+    workers : None or int
+      Number of processes, None for one per CPU and
+      zero or one to assemble in the current process
+    digits : int
+      How many digits to consider when merging endpoints
+    scale : float or None
+      Approximate scale of drawing for precision
+
+    Yields
+    ----------
+    polygons : (p,) shapely.geometry.Polygon
+      Polygon objects with interiors for each layer
+    """
+    tasks = [(layer, digits, scale) for layer in layers]
+
+    if workers is None:
+        import multiprocessing
+        workers = multiprocessing.cpu_count()
+    workers = min(int(workers), len(tasks))
+
+    if workers <= 1:
+        for task in tasks:
+            yield _layer_task(task)
+        return
+
+    import multiprocessing
+    pool = multiprocessing.Pool(processes=workers)
+    try:
+        # send several small layers to a worker at once
+        chunksize = max(1, len(tasks) // (workers * 8))
+        for polygons in pool.imap(
+                _layer_task, tasks, chunksize=chunksize):
+            yield polygons
+        pool.close()
+        pool.join()
+    finally:
+        # if the caller stopped early stop the workers
+        pool.terminate()
+
+
+def _layer_task(task):
+    """
+    Assemble the polygons of one layer for `layers_to_polygons`.
+
+    Parameters
+    -----------
+    task : tuple
+      (segments, digits, scale)
+
+    Returns
+    ----------
+    polygons : (p,) shapely.geometry.Polygon
+      Polygon objects with interiors
+    """
+    segments, digits, scale = task
+    if len(segments) == 0:
+        return []
+    return segments_to_polygons(segments, digits=digits, scale=scale)
+
+
 def polygons_obb(polygons):
     """
     Find the OBBs for a list of shapely.geometry.Polygons
@@ -12,7 +12,7 @@ from .. import grouping
 from .. import geometry
 from .. import interval
 
-from ..constants import tol
+from ..constants import tol, log
 
 
 def segments_to_parameters(segments):
@@ -320,3 +320,127 @@ def overlap(origins, vectors, params):
     length = new_range.ptp()
 
     return length, segments
+
+
+def stitch(segments, digits=5):
+    """
+    Stitch a soup of unordered line segments into closed
+    loops, such as the segments of a cross section.
+
+    Endpoints are merged by hashing them as rounded integer
+    rows and the segments are walked in order. Where loops
+    touch at a vertex, such as two regions of a slice which
+    share a corner, the segments at that vertex are paired
+    so each loop returning to the vertex is closed on its
+    own, and any others are paired by angle in 2D. Chains
+    which don't close are discarded and logged.
+
+    Parameters
+    ------------
+    segments : (n, 2, (2|3)) float
+      Line segments in space
+    digits : int
+      How many digits to consider when merging vertices
+
+    Returns
+    -----------
+    loops : (m,) list of (p, (2|3)) float
+      Closed loops where the first point equals the last
+    """
+    segments = np.asanyarray(segments, dtype=np.float64)
+    if len(segments) == 0:
+        return []
+    dimension = segments.shape[2]
+
+    # merge endpoints into integer vertex indexes
+    unique, inverse = grouping.unique_rows(
+        segments.reshape((-1, dimension)), digits=digits)
+    vertices = segments.reshape((-1, dimension))[unique]
+    edges = inverse.reshape((-1, 2))
+
+    # drop zero length and duplicate edges
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges.sort(axis=1)
+    edges = edges[grouping.unique_rows(edges)[0]]
+    if len(edges) == 0:
+        return []
+    count = len(edges)
+
+    # both directions of every edge sorted by source vertex
+    # so the half- edges leaving vertex `i` are a contiguous run
+    directed = np.vstack((edges, edges[:, ::-1]))
+    order = directed[:, 0].argsort(kind='mergesort')
+    source = directed[order, 0]
+    target = directed[order, 1]
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    # the half- edge going the other way along the same edge
+    twin = position[(order + count) % (2 * count)]
+    degree = np.bincount(source, minlength=len(vertices))
+    offset = np.append(0, np.cumsum(degree))
+
+    # a walk arriving at a vertex along the twin of a half- edge
+    # leaves along its partner, which is forced for two neighbors
+    partner = np.full(len(order), -1, dtype=np.int64)
+    index = np.arange(len(order))
+    first = offset[source] == index
+    two = degree[source] == 2
+    partner[two & first] = index[two & first] + 1
+    partner[two & ~first] = index[two & ~first] - 1
+
+    # walking is sequential so use plain lists
+    partner = partner.tolist()
+    twin = twin.tolist()
+    degree_list = degree.tolist()
+    source_list = source.tolist()
+
+    for junction in np.nonzero(degree > 2)[0].tolist():
+        leaving = range(offset[junction], offset[junction + 1])
+        for start in leaving:
+            if partner[start] >= 0:
+                continue
+            # follow the chain to the next vertex with more
+            # or fewer than two neighbors
+            current = twin[start]
+            while degree_list[source_list[current]] == 2:
+                current = twin[partner[current]]
+            # pair the two ends of a chain which returns here
+            if (source_list[current] == junction and
+                    current != start and partner[current] < 0):
+                partner[start] = current
+                partner[current] = start
+        # pair anything left over by angle around the vertex
+        remain = [i for i in leaving if partner[i] < 0]
+        if dimension == 2 and len(remain) > 2:
+            vector = vertices[target[remain]] - vertices[junction]
+            remain = [remain[i] for i in np.argsort(
+                np.arctan2(vector[:, 1], vector[:, 0]))]
+        for a, b in zip(remain[::2], remain[1::2]):
+            partner[a] = b
+            partner[b] = a
+
+    target_list = target.tolist()
+    used = [False] * len(order)
+    loops = []
+    for start in range(len(order)):
+        if used[start]:
+            continue
+        path = [source_list[start]]
+        current = start
+        closed = False
+        while True:
+            used[current] = used[twin[current]] = True
+            path.append(target_list[current])
+            current = partner[twin[current]]
+            if current == start:
+                closed = True
+                break
+            if current < 0 or used[current]:
+                break
+        if closed and len(path) > 3:
+            loops.append(vertices[path])
+
+    dropped = count - sum(len(loop) - 1 for loop in loops)
+    if dropped > 0:
+        log.debug('discarded %d segments not in closed loops', dropped)
+    return loops
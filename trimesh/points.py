@@ -158,17 +158,23 @@ def project_to_plane(points,
     return transformed
 
 
-def remove_close(points, radius):
+def remove_close(points, radius, passes=20):
     """
     Given an (n, m) set of points where n=(2|3) return a list of points
     where no point is closer than radius.
 
+    Points are kept greedily in order, so a point is removed if
+    it is within radius of an earlier point which was kept.
+
     Parameters
     ------------
     points : (n, dimension) float
       Points in space
     radius : float
       Minimum radius between result points
+    passes : int
+      Maximum number of vectorized passes before the
+      remaining points are decided one at a time
 
     Returns
     ------------
@@ -179,15 +185,50 @@ def remove_close(points, radius):
     """
     from scipy.spatial import cKDTree as KDTree
 
-    tree = KDTree(points)
-    consumed = np.zeros(len(points), dtype=np.bool)
-    unique = np.zeros(len(points), dtype=np.bool)
-    for i in range(len(points)):
-        if consumed[i]:
-            continue
-        neighbors = tree.query_ball_point(points[i], r=radius)
-        consumed[neighbors] = True
-        unique[i] = True
+    points = np.asanyarray(points, dtype=np.float64)
+    # the tree is only queried once so skip the slower
+    # construction options which speed up many queries
+    tree = KDTree(points, balanced_tree=False, compact_nodes=False)
+    # every (earlier, later) pair of points within radius
+    pairs = tree.query_pairs(r=radius, output_type='ndarray')
+    earlier, later = pairs.T
+
+    # a point is kept once every earlier neighbor is removed
+    # and is removed once any earlier neighbor is kept, which
+    # settles most of a random sample in a handful of passes
+    # but may only settle one point per pass on ordered input
+    unique = np.zeros(len(points), dtype=bool)
+    removed = np.zeros(len(points), dtype=bool)
+    undecided = np.ones(len(points), dtype=bool)
+    for _ in range(passes):
+        if not undecided.any():
+            break
+        # which points have an earlier neighbor kept or undecided
+        near_kept = np.zeros(len(points), dtype=bool)
+        near_kept[later[unique[earlier]]] = True
+        near_undecided = np.zeros(len(points), dtype=bool)
+        near_undecided[later[undecided[earlier]]] = True
+
+        removed[undecided & near_kept] = True
+        unique[undecided & ~near_kept & ~near_undecided] = True
+        undecided &= ~(unique | removed)
+
+        # only pairs between undecided points and earlier points
+        # which aren't removed can affect the result
+        keep = undecided[later] & ~removed[earlier]
+        earlier, later = earlier[keep], later[keep]
+
+    if undecided.any():
+        # settle the rest with a sequential greedy sweep where
+        # every earlier neighbor is decided before each point
+        order = later.argsort()
+        earlier, later = earlier[order], later[order]
+        # earlier neighbors of each undecided point
+        index = np.nonzero(undecided)[0]
+        starts = np.searchsorted(later, index, side='left')
+        ends = np.searchsorted(later, index, side='right')
+        for i, start, end in zip(index, starts, ends):
+            unique[i] = not unique[earlier[start:end]].any()
 
     return points[unique], unique
 
@@ -555,6 +596,21 @@ class PointCloud(Geometry):
         from . import convex
         return convex.convex_hull(self.vertices)
 
+    @caching.cache_decorator
+    def kdtree(self):
+        """
+        A scipy.spatial.cKDTree of the points, which is kept
+        until the points change.
+
+        Returns
+        ------------
+        tree : scipy.spatial.cKDTree
+          Contains self.vertices
+        """
+        from scipy.spatial import cKDTree
+        tree = cKDTree(self.vertices.view(np.ndarray))
+        return tree
+
     def scene(self):
         """
         A scene containing just the PointCloud
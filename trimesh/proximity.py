@@ -11,8 +11,8 @@ from . import util
 from .grouping import group_min
 from .constants import tol, log_time
 from .triangles import closest_point as closest_point_corresponding
+from .triangles import points_to_barycentric
 
-from collections import deque
 
 
 def nearby_faces(mesh, points):
@@ -109,7 +109,41 @@ def closest_point_naive(mesh, points):
     return closest, distance, triangle_id
 
 
-def closest_point(mesh, points):
+def nearby_faces_flat(mesh, points):
+    """
+    For each point find nearby faces as flat arrays of
+    corresponding point and face indexes, using the same
+    bounds as `nearby_faces` but querying every point at
+    once against `mesh.triangles_bvh`.
+
+    Parameters
+    ----------
+    mesh : Trimesh object
+    points : (n,3) float , points in space
+
+    Returns
+    -----------
+    candidates : (c,) int
+      Index of mesh.faces
+    point_id : (c,) int
+      Index of points for each candidate
+    """
+    points = np.asanyarray(points, dtype=np.float64)
+    if not util.is_shape(points, (-1, 3)):
+        raise ValueError('points must be (n,3)!')
+
+    # query the distance to the nearest vertex to get AABB of a sphere
+    distance_vertex = mesh.kdtree.query(points)[0].reshape((-1, 1))
+    distance_vertex += tol.merge
+
+    # (n, 2, 3) axis aligned bounds
+    bounds = np.stack((points - distance_vertex,
+                       points + distance_vertex), axis=1)
+
+    return mesh.triangles_bvh.box_candidates(bounds)
+
+
+def closest_point(mesh, points, max_candidates=None):
     """
     Given a mesh and a list of points, find the closest point on any triangle.
 
@@ -117,6 +151,10 @@ def closest_point(mesh, points):
     ----------
     mesh   : Trimesh object
     points : (m,3)   float, points in space
+    max_candidates : int or None
+      Approximate maximum number of point- triangle candidate
+      pairs to hold in memory at once. If None every point
+      is queried in a single batch.
 
     Returns
     ----------
@@ -129,71 +167,37 @@ def closest_point(mesh, points):
     if not util.is_shape(points, (-1, 3)):
         raise ValueError('points must be (n,3)!')
 
-    # do a tree- based query for faces near each point
-    candidates = nearby_faces(mesh, points)
-    # view triangles as an ndarray so we don't have to recompute
-    # the MD5 during all of the subsequent advanced indexing
-    triangles = mesh.triangles.view(np.ndarray)
-
-    # create the corresponding list of triangles
-    # and query points to send to the closest_point function
-    query_point = deque()
-    query_tri = deque()
-    for triangle_ids, point in zip(candidates, points):
-        query_point.append(np.tile(point, (len(triangle_ids), 1)))
-        query_tri.append(triangles[triangle_ids])
-
-    # stack points into an (n,3) array
-    query_point = np.vstack(query_point)
-    # stack triangles into an (n,3,3) array
-    query_tri = np.vstack(query_tri)
-
-    # do the computation for closest point
-    query_close = closest_point_corresponding(query_tri, query_point)
-    query_group = np.cumsum(np.array([len(i) for i in candidates]))[:-1]
-
-    distance_2 = ((query_close - query_point) ** 2).sum(axis=1)
-
-    # find the single closest point for each group of candidates
     result_close = np.zeros((len(points), 3), dtype=np.float64)
     result_tid = np.zeros(len(points), dtype=np.int64)
     result_distance = np.zeros(len(points), dtype=np.float64)
 
-    # go through results to get minimum distance result
-    for i, close_points, distance, candidate in zip(
-            np.arange(len(points)),
-            np.array_split(query_close, query_group),
-            np.array_split(distance_2, query_group),
-            candidates):
-
-        # unless some other check is true use the smallest distance
-        idx = distance.argmin()
-
-        # if we have multiple candidates check them
-        if len(candidate) > 1:
-            # (2, ) int, list of 2 closest candidate indices
-            idxs = distance.argsort()[:2]
-            # make sure the two distances are identical
-            check_distance = distance[idxs].ptp() < tol.merge
-            # make sure the magnitude of both distances are nonzero
-            check_magnitude = (np.abs(distance[idxs]) > tol.merge).all()
-
-            # check if query-points are actually off-surface
-            if check_distance and check_magnitude:
-                # get face normals for two points
-                normals = mesh.face_normals[np.array(candidate)[idxs]]
-                # compute normalized surface-point to query-point vectors
-                vectors = ((points[i] - close_points[idxs]) /
-                           distance[idxs, np.newaxis] ** 0.5)
-                # compare enclosed angle for both face normals
-                dots = util.diagonal_dot(normals, vectors)
-                # take the idx with the most positive angle
-                idx = idxs[dots.argmax()]
-
-        # take the single closest value from the group of values
-        result_close[i] = close_points[idx]
-        result_tid[i] = candidate[idx]
-        result_distance[i] = distance[idx]
+    if max_candidates is None:
+        chunk = len(points)
+    else:
+        max_candidates = max(int(max_candidates), 1)
+        # start with a guess of a few dozen candidates per point
+        chunk = max(max_candidates // 32, 1)
+
+    # a tree of face centers shared by every chunk which is
+    # only built if a point's nearest vertex isn't on a face
+    center_tree = {}
+
+    start = 0
+    while start < len(points):
+        stop = min(start + chunk, len(points))
+        count = _closest_chunk(mesh=mesh,
+                               points=points[start:stop],
+                               max_candidates=max_candidates,
+                               center_tree=center_tree,
+                               result_close=result_close[start:stop],
+                               result_tid=result_tid[start:stop],
+                               result_distance=result_distance[start:stop])
+        if max_candidates is not None:
+            # size the next chunk from the number of candidates
+            # per point we saw in this one
+            chunk = max(int(max_candidates * (stop - start) /
+                            max(count, 1)), 1)
+        start = stop
 
     # we were comparing the distance squared so
     # now take the square root in one vectorized operation
@@ -202,7 +206,167 @@ def closest_point(mesh, points):
     return result_close, result_distance, result_tid
 
 
-def signed_distance(mesh, points):
+def _closest_chunk(mesh,
+                   points,
+                   max_candidates,
+                   result_close,
+                   result_tid,
+                   result_distance,
+                   center_tree=None):
+    """
+    Find the closest point on a mesh for a chunk of points,
+    writing results into the passed arrays in- place.
+
+    Parameters
+    ----------
+    mesh : Trimesh object
+    points : (n,3) float
+      Points in space
+    max_candidates : int or None
+      Maximum number of candidates to compute at once
+    result_close : (n,3) float
+      Closest point on the mesh, set in- place
+    result_tid : (n,) int
+      Index of closest face, set in- place
+    result_distance : (n,) float
+      Squared distance to the closest point, set in- place
+    center_tree : None or dict
+      Stores a cKDTree of face centers under 'tree' so it
+      is built at most once across chunks
+
+    Returns
+    ----------
+    count : int
+      Number of point- triangle candidates checked
+    """
+    # do a tree- based query for faces near each point
+    candidates, point_id = nearby_faces_flat(mesh, points)
+
+    # if the nearest vertex to a point isn't used by any face
+    # the query may find nothing, so query those points again
+    # with bounds from the nearest face center which is on a face
+    missing = np.ones(len(points), dtype=np.bool_)
+    missing[point_id] = False
+    if missing.any() and len(mesh.faces) > 0:
+        if center_tree is None:
+            center_tree = {}
+        if 'tree' not in center_tree:
+            from scipy.spatial import cKDTree
+            center_tree['tree'] = cKDTree(mesh.triangles_center)
+        index = np.nonzero(missing)[0]
+        radius = center_tree['tree'].query(
+            points[index])[0].reshape((-1, 1)) + tol.merge
+        extra, extra_id = mesh.triangles_bvh.box_candidates(
+            np.stack((points[index] - radius,
+                      points[index] + radius), axis=1))
+        candidates = np.append(candidates, extra)
+        point_id = np.append(point_id, index[extra_id])
+
+    if len(candidates) == 0:
+        return 0
+
+    # view triangles as an ndarray so we don't have to recompute
+    # the MD5 during all of the subsequent advanced indexing
+    triangles = mesh.triangles.view(np.ndarray)
+
+    # compute the squared distance for every candidate
+    # in slices so temporary arrays stay bounded
+    distance_2 = np.zeros(len(candidates), dtype=np.float64)
+    step = len(candidates) if max_candidates is None else max_candidates
+    for i in range(0, len(candidates), step):
+        query_tri = triangles[candidates[i:i + step]]
+        query_point = points[point_id[i:i + step]]
+        query_close = closest_point_corresponding(query_tri, query_point)
+        distance_2[i:i + step] = ((query_close - query_point) ** 2).sum(axis=1)
+
+    # group candidates by point, which is much faster than
+    # a lexsort with distance as the minor key
+    order = np.argsort(point_id, kind='mergesort')
+    ordered = point_id[order]
+    distance_ordered = distance_2[order]
+    # the start position of each group of candidates
+    first_pos = np.nonzero(np.append(True, ordered[1:] != ordered[:-1]))[0]
+    counts = np.diff(np.append(first_pos, len(order)))
+    # which group each sorted candidate belongs to
+    group = np.repeat(np.arange(len(first_pos)), counts)
+    # index of each queried point
+    pid = ordered[first_pos]
+
+    # position in the sorted candidates of the closest
+    # candidate for each point
+    best_pos = _group_argmin(distance_ordered, first_pos, counts, group)
+    best = order[best_pos]
+
+    # if the two closest candidates are the same distance and
+    # the point is off- surface use the face normal which
+    # points most towards the query point to break the tie
+    check = counts > 1
+    if check.any():
+        distance_ordered[best_pos] = np.inf
+        second = order[_group_argmin(
+            distance_ordered, first_pos, counts, group)]
+        d_first = distance_2[best]
+        d_second = distance_2[second]
+        check = np.logical_and(check, np.logical_and(
+            np.abs(d_first - d_second) < tol.merge,
+            np.logical_and(np.abs(d_first) > tol.merge,
+                           np.abs(d_second) > tol.merge)))
+
+    if check.any():
+        # (k, 2) candidate index for the two closest
+        pair = np.column_stack((best[check], second[check]))
+        pair_point = points[pid[check]]
+        pair_tri = candidates[pair]
+        close = closest_point_corresponding(
+            triangles[pair_tri.ravel()],
+            np.repeat(pair_point, 2, axis=0)).reshape((-1, 2, 3))
+        # compute normalized surface-point to query-point vectors
+        vectors = ((pair_point.reshape((-1, 1, 3)) - close) /
+                   (distance_2[pair] ** .5).reshape((-1, 2, 1)))
+        # compare enclosed angle for both face normals
+        dots = (mesh.face_normals[pair_tri] * vectors).sum(axis=2)
+        # take the candidate with the most positive angle
+        best[check] = pair[np.arange(len(pair)), dots.argmax(axis=1)]
+
+    # closest point for only the winning candidates
+    result_close[pid] = closest_point_corresponding(
+        triangles[candidates[best]], points[pid])
+    result_tid[pid] = candidates[best]
+    result_distance[pid] = distance_2[best]
+
+    return len(candidates)
+
+
+def _group_argmin(data, start, counts, group):
+    """
+    Find the position of the minimum value in each
+    contiguous group of an array.
+
+    Parameters
+    ----------
+    data : (n,) float
+      Values sorted by group
+    start : (g,) int
+      Position of the first value of each group
+    counts : (g,) int
+      Number of values in each group
+    group : (n,) int
+      Index of group for each value
+
+    Returns
+    ----------
+    argmin : (g,) int
+      Position in data of the first minimum of each group
+    """
+    minimum = np.minimum.reduceat(data, start)
+    # every position which is equal to the group minimum
+    is_min = np.nonzero(data == np.repeat(minimum, counts))[0]
+    # positions are sorted so take the first one per group
+    first = np.append(True, np.diff(group[is_min]) != 0)
+    return is_min[first]
+
+
+def signed_distance(mesh, points, field=None):
     """
     Find the signed distance from a mesh to a list of points.
 
@@ -214,11 +378,19 @@ def signed_distance(mesh, points):
     -----------
     mesh   : Trimesh object
     points : (n,3) float, list of points in space
+    field  : None, True, or DistanceField
+      If passed answer queries near the surface from a
+      distance field, where True uses mesh.distance_field
 
     Returns
     ----------
     signed_distance : (n,3) float, signed distance from point to mesh
     """
+    if field is True:
+        field = mesh.distance_field
+    if field is not None and field is not False:
+        return field.signed_distance(points)
+
     # make sure we have a numpy array
     points = np.asanyarray(points, dtype=np.float64)
 
@@ -249,7 +421,7 @@ class ProximityQuery(object):
         self._mesh = mesh
 
     @log_time
-    def on_surface(self, points):
+    def on_surface(self, points, field=None):
         """
         Given list of points, for each point find the closest point
         on any triangle of the mesh.
@@ -257,6 +429,9 @@ class ProximityQuery(object):
         Parameters
         ----------
         points : (m,3) float, points in space
+        field  : None, True, or DistanceField
+          If passed answer queries near the surface from a
+          distance field, where True uses mesh.distance_field
 
         Returns
         ----------
@@ -264,6 +439,10 @@ class ProximityQuery(object):
         distance    : (m,)  float, distance
         triangle_id : (m,)  int, index of closest triangle for each point
         """
+        if field is True:
+            field = self._mesh.distance_field
+        if field is not None and field is not False:
+            return field.on_surface(points)
         return closest_point(mesh=self._mesh,
                              points=points)
 
@@ -283,7 +462,7 @@ class ProximityQuery(object):
         tree = self._mesh.kdtree
         return tree.query(points)
 
-    def signed_distance(self, points):
+    def signed_distance(self, points, field=None):
         """
         Find the signed distance from a mesh to a list of points.
 
@@ -294,12 +473,361 @@ class ProximityQuery(object):
         Parameters
         -----------
         points : (n,3) float, list of points in space
+        field  : None, True, or DistanceField
+          If passed answer queries near the surface from a
+          distance field, where True uses mesh.distance_field
 
         Returns
         ----------
         signed_distance : (n,3) float, signed distance from point to mesh
         """
-        return signed_distance(self._mesh, points)
+        return signed_distance(self._mesh, points, field=field)
+
+
+class DistanceField(object):
+    """
+    Signed distance and candidate faces stored at the nodes of
+    a sparse grid in a narrow band around the surface of a
+    mesh, so repeated proximity queries against the same
+    mesh skip the tree- based broad phase.
+
+    Nodes are at integer multiples of `pitch` and are only
+    created within `band` cells of a cell the surface passes
+    through. Every node stores each face which could be the
+    closest face to a point within half a cell diagonal of it,
+    so a query point whose nearest node exists is answered
+    exactly, and other points fall back to a full query.
+    """
+
+    def __init__(self, mesh, pitch=None, band=2):
+        """
+        Build the field for a mesh.
+
+        Parameters
+        ------------
+        mesh : Trimesh object
+          Mesh to query
+        pitch : float or None
+          Distance between nodes, if None mesh.scale / 64
+        band : int
+          How many cells away from the surface to create nodes
+        """
+        from .voxel import voxelize_triangles
+
+        if pitch is None:
+            pitch = mesh.scale / 64.0
+        self.mesh = mesh
+        self.pitch = float(pitch)
+        self.band = max(int(band), 1)
+
+        # cells the surface passes through where the
+        # center of cell (i, j, k) is at (i, j, k) * pitch
+        cells, origin = voxelize_triangles(mesh, pitch=self.pitch)
+        cells = cells + np.round(origin / self.pitch).astype(np.int64)
+        if len(cells) == 0:
+            cells = np.zeros((1, 3), dtype=np.int64)
+
+        # pad the grid so the dilated keys can't wrap around
+        self._lower = cells.min(axis=0) - self.band - 1
+        self._shape = cells.max(axis=0) - self._lower + self.band + 2
+        self._strides = np.array([self._shape[1] * self._shape[2],
+                                  self._shape[2],
+                                  1], dtype=np.int64)
+
+        # dilate the surface cells one axis at a time
+        # where keys are sorted and unique after every axis
+        keys = np.dot(cells - self._lower, self._strides)
+        step = np.arange(-self.band, self.band + 1)
+        for stride in self._strides:
+            keys = np.unique((keys.reshape((-1, 1)) +
+                              step * stride).ravel())
+        self._keys = keys
+
+        # angle- weighted pseudo- normals of every vertex and
+        # edge which give the correct sign for points whose
+        # closest point is on an edge or a vertex
+        normals = mesh.face_normals
+        self._vertex_normals = np.zeros((len(mesh.vertices), 3))
+        np.add.at(self._vertex_normals,
+                  mesh.faces.ravel(),
+                  (normals.reshape((-1, 1, 3)) *
+                   mesh.face_angles.reshape((-1, 3, 1))).reshape((-1, 3)))
+        self._edge_normals = np.zeros((len(mesh.edges_unique), 3))
+        np.add.at(self._edge_normals,
+                  mesh.faces_unique_edges.ravel(),
+                  np.repeat(normals, 3, axis=0))
+
+        # exact values at every node
+        nodes = (np.column_stack(np.unravel_index(keys, self._shape)) +
+                 self._lower) * self.pitch
+        closest, distance, triangle_id = closest_point(mesh, nodes)
+        self._distance = distance * self._sign(
+            nodes, closest, distance, triangle_id)
+
+        # a face closest to a point p is within d(p) + |p - c|
+        # of a node c, and d(p) <= d(c) + |p - c| where |p - c|
+        # is at most half a cell diagonal for the nearest node
+        radius = distance + self.pitch * 3 ** .5 + tol.merge
+        self._offsets, self._candidates = self._nearby(nodes, radius)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _nearby(self, nodes, radius, chunk=4096):
+        """
+        Find every face within a radius of each node.
+
+        Parameters
+        ------------
+        nodes : (n, 3) float
+          Node positions
+        radius : (n,) float
+          Distance to include faces within
+        chunk : int
+          Number of nodes to check at once
+
+        Returns
+        ----------
+        offsets : (n + 1,) int
+          Start of the faces for each node in candidates
+        candidates : (c,) int
+          Index of mesh.faces grouped by node
+        """
+        triangles = self.mesh.triangles.view(np.ndarray)
+        bvh = self.mesh.triangles_bvh
+        candidates = []
+        node_id = []
+        for start in range(0, len(nodes), chunk):
+            query = nodes[start:start + chunk]
+            extent = radius[start:start + chunk].reshape((-1, 1))
+            faces, index = bvh.box_candidates(
+                np.stack((query - extent, query + extent), axis=1))
+            # keep faces which are inside the sphere
+            close = closest_point_corresponding(triangles[faces],
+                                                query[index])
+            keep = (((close - query[index]) ** 2).sum(axis=1) <=
+                    extent[index, 0] ** 2)
+            candidates.append(faces[keep])
+            node_id.append(index[keep] + start)
+        candidates = np.concatenate(candidates)
+        node_id = np.concatenate(node_id)
+
+        order = np.argsort(node_id, kind='mergesort')
+        offsets = np.append(0, np.cumsum(
+            np.bincount(node_id, minlength=len(nodes))))
+        return offsets, candidates[order]
+
+    def _sign(self, points, closest, distance, triangle_id):
+        """
+        Sign of distance from the angle- weighted pseudo- normal
+        at the closest point, which is the face normal when the
+        closest point is inside a face.
+
+        Returns
+        ----------
+        sign : (n,) float
+          -1.0 for points outside the mesh, otherwise 1.0
+        """
+        mesh = self.mesh
+        normals = mesh.face_normals[triangle_id]
+        barycentric = points_to_barycentric(
+            mesh.triangles.view(np.ndarray)[triangle_id], closest)
+        zero = barycentric < 1e-6
+        count = zero.sum(axis=1)
+
+        # on an edge use the edge opposite the zero weight vertex
+        edge = count == 1
+        if edge.any():
+            column = (zero[edge].argmax(axis=1) + 1) % 3
+            normals[edge] = self._edge_normals[
+                mesh.faces_unique_edges[triangle_id[edge], column]]
+        # on a vertex use the vertex with a non- zero weight
+        vertex = count > 1
+        if vertex.any():
+            column = (~zero[vertex]).argmax(axis=1)
+            normals[vertex] = self._vertex_normals[
+                mesh.faces[triangle_id[vertex], column]]
+
+        dot = ((points - closest) * normals).sum(axis=1)
+        sign = np.ones(len(points))
+        sign[np.logical_and(dot > 0, distance > tol.merge)] = -1.0
+        return sign
+
+    def _nodes(self, index):
+        """
+        Find the position of integer node indexes in the field.
+
+        Parameters
+        ------------
+        index : (..., 3) int
+          Node indexes where node (i, j, k) is at (i, j, k) * pitch
+
+        Returns
+        ----------
+        position : (...) int
+          Index of each node
+        found : (...) bool
+          Whether each node exists in the field
+        """
+        inside = np.logical_and(
+            index >= self._lower,
+            index < self._lower + self._shape).all(axis=-1)
+        keys = np.dot(index - self._lower, self._strides)
+        position = np.searchsorted(self._keys, keys).clip(
+            0, len(self._keys) - 1)
+        found = np.logical_and(inside, self._keys[position] == keys)
+        return position, found
+
+    def _corners(self, points):
+        """
+        Find the nodes at the corners of the cell containing
+        each point and their trilinear weights.
+
+        Returns
+        ----------
+        position : (n, 8) int
+          Index of each corner node
+        weights : (n, 8) float
+          Trilinear weight of each corner
+        valid : (n,) bool
+          Whether every corner of the cell is a node
+        """
+        scaled = points / self.pitch
+        base = np.floor(scaled).astype(np.int64)
+        fraction = scaled - base
+        # (8, 3) offsets to the corners of a cell
+        offsets = np.indices((2, 2, 2)).reshape((3, -1)).T
+        position, found = self._nodes(base.reshape((-1, 1, 3)) + offsets)
+
+        weights = np.where(offsets.astype(bool),
+                           fraction.reshape((-1, 1, 3)),
+                           1.0 - fraction.reshape((-1, 1, 3))).prod(axis=2)
+        return position, weights, found.all(axis=1)
+
+    def _query(self, points):
+        """
+        Find the closest point on the mesh for each point.
+
+        Returns
+        ----------
+        closest : (n, 3) float
+        distance : (n,) float
+        triangle_id : (n,) int
+        valid : (n,) bool
+          Which points were answered from the field
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+
+        closest = np.zeros((len(points), 3), dtype=np.float64)
+        distance = np.zeros(len(points), dtype=np.float64)
+        triangle_id = np.zeros(len(points), dtype=np.int64)
+
+        position, valid = self._nodes(
+            np.round(points / self.pitch).astype(np.int64))
+
+        if valid.any():
+            # check every candidate face of the nearest node
+            index = np.nonzero(valid)[0]
+            node = position[index]
+            counts = self._offsets[node + 1] - self._offsets[node]
+            first_pos = np.append(0, np.cumsum(counts)[:-1])
+            group = np.repeat(np.arange(len(index)), counts)
+            candidates = self._candidates[
+                np.arange(counts.sum()) - first_pos[group] +
+                self._offsets[node][group]]
+            query = points[index][group]
+
+            triangles = self.mesh.triangles.view(np.ndarray)
+            close = closest_point_corresponding(triangles[candidates],
+                                                query)
+            distance_2 = ((close - query) ** 2).sum(axis=1)
+            best = _group_argmin(distance_2, first_pos, counts, group)
+
+            closest[index] = close[best]
+            distance[index] = distance_2[best] ** .5
+            triangle_id[index] = candidates[best]
+
+        if not valid.all():
+            # points away from the surface get a full query
+            missing = ~valid
+            (closest[missing],
+             distance[missing],
+             triangle_id[missing]) = closest_point(self.mesh,
+                                                   points[missing])
+
+        return closest, distance, triangle_id, valid
+
+    def on_surface(self, points):
+        """
+        For each point find the closest point on the mesh.
+
+        Parameters
+        ----------
+        points : (m,3) float, points in space
+
+        Returns
+        ----------
+        closest     : (m,3) float, closest point on triangles for each point
+        distance    : (m,)  float, distance
+        triangle_id : (m,)  int, index of closest triangle for each point
+        """
+        return self._query(points)[:3]
+
+    def signed_distance(self, points):
+        """
+        Find the signed distance from the mesh to a list of
+        points, with the same sign convention as
+        `proximity.signed_distance`.
+
+        Parameters
+        -----------
+        points : (n,3) float, list of points in space
+
+        Returns
+        ----------
+        signed_distance : (n,) float, signed distance from point to mesh
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        closest, distance, triangle_id, valid = self._query(points)
+
+        # near the surface use the normal of the closest face
+        sign = self._sign(points[valid],
+                          closest[valid],
+                          distance[valid],
+                          triangle_id[valid])
+        distance[valid] *= sign
+
+        # away from the surface use the more expensive ray test
+        check = np.logical_and(~valid, distance > tol.merge)
+        if check.any():
+            inside = self.mesh.ray.contains_points(points[check])
+            distance[check] *= (inside.astype(int) * 2) - 1
+
+        return distance
+
+    def interpolate(self, points):
+        """
+        Approximate signed distance by trilinear interpolation
+        of the values at the nodes, without refinement.
+
+        Parameters
+        -----------
+        points : (n,3) float, list of points in space
+
+        Returns
+        ----------
+        signed_distance : (n,) float
+          Interpolated signed distance, NaN outside of band
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+        position, weights, valid = self._corners(points)
+        result = (self._distance[position] * weights).sum(axis=1)
+        result[~valid] = np.nan
+        return result
 
 
 def longest_ray(mesh, points, directions):
@@ -0,0 +1,329 @@
+"""
+ray_bvh.py
+-------------
+
+A flattened, array- backed bounding volume hierarchy which
+can do broad- phase ray and box queries for many queries at
+once using only vectorized numpy operations.
+
+The tree is built over primitives sorted along a Morton
+(Z- order) curve and stored as a complete binary tree in
+heap order, so node `i` has children `2i + 1` and `2i + 2`
+and every leaf is at the same depth. This means traversal
+can be done level- by- level for a whole packet of rays
+without any per- query Python loops.
+"""
+import numpy as np
+
+from .. import util
+
+
+class BVH(object):
+    """
+    An array- backed bounding volume hierarchy.
+    """
+
+    def __init__(self, bounds, leaf_size=8, buffer_dist=1e-5):
+        """
+        Build a BVH from the axis aligned bounding boxes
+        of a set of primitives.
+
+        Parameters
+        ------------
+        bounds : (n, 2, 3) float
+          Axis aligned bounding box for each primitive
+        leaf_size : int
+          Maximum number of primitives in each leaf
+        buffer_dist : float
+          Distance to pad every box by so that zero
+          width boxes are still hit by rays
+        """
+        bounds = np.asanyarray(bounds, dtype=np.float64)
+        if not util.is_shape(bounds, (-1, 2, 3)):
+            raise ValueError('bounds must be (n, 2, 3)!')
+        if len(bounds) == 0:
+            raise ValueError('can\'t build BVH with no primitives!')
+
+        count = len(bounds)
+        # the number of leaves is always a power of two
+        # so we can use a complete binary tree in heap order
+        leaf_count = int(np.ceil(count / float(max(int(leaf_size), 1))))
+        self.depth = int(np.ceil(np.log2(max(leaf_count, 1))))
+        leaf_count = 2 ** self.depth
+
+        # if there are fewer primitives than leaves clip the depth
+        while leaf_count > count and self.depth > 0:
+            self.depth -= 1
+            leaf_count = 2 ** self.depth
+
+        # sort primitives along a Morton curve so that each
+        # contiguous range is spatially coherent
+        self.order = np.argsort(morton(bounds.mean(axis=1)),
+                                kind='mergesort')
+        # distribute the sorted primitives evenly over the leaves
+        # so no leaf is ever empty: leaf i has primitives
+        # order[leaf_start[i]:leaf_start[i + 1]]
+        self.leaf_start = (np.arange(leaf_count + 1,
+                                     dtype=np.int64) * count) // leaf_count
+
+        # bounds of every node in heap order
+        nodes = np.zeros((2 * leaf_count - 1, 2, 3), dtype=np.float64)
+        ordered = bounds[self.order]
+        leaf_offset = leaf_count - 1
+        nodes[leaf_offset:, 0] = np.minimum.reduceat(
+            ordered[:, 0], self.leaf_start[:-1], axis=0)
+        nodes[leaf_offset:, 1] = np.maximum.reduceat(
+            ordered[:, 1], self.leaf_start[:-1], axis=0)
+
+        # merge child bounds pairwise to get each level up to the root
+        for level in range(self.depth - 1, -1, -1):
+            start = 2 ** level - 1
+            stop = 2 ** (level + 1) - 1
+            children = nodes[stop:2 * stop + 1].reshape((-1, 2, 2, 3))
+            nodes[start:stop, 0] = children[:, :, 0].min(axis=1)
+            nodes[start:stop, 1] = children[:, :, 1].max(axis=1)
+
+        # pad every box so rays still hit degenerate boxes
+        nodes[:, 0] -= buffer_dist
+        nodes[:, 1] += buffer_dist
+
+        self.node_bounds = nodes
+        self.leaf_offset = leaf_offset
+
+    @property
+    def bounds(self):
+        """
+        The padded bounding box of the root node.
+
+        Returns
+        ------------
+        bounds : (2, 3) float
+          Bounding box containing every primitive
+        """
+        return self.node_bounds[0]
+
+    def ray_candidates(self,
+                       ray_origins,
+                       ray_directions,
+                       packet_size=16384):
+        """
+        Do a broad- phase search for the primitives that
+        each ray may intersect.
+
+        Rays are processed in packets, and each packet is
+        walked down the tree one level at a time.
+
+        Parameters
+        ------------
+        ray_origins : (m, 3) float
+          Ray origin points
+        ray_directions : (m, 3) float
+          Ray direction vectors
+        packet_size : int
+          Number of rays to traverse at once, which
+          bounds the peak memory of the query
+
+        Returns
+        ------------
+        candidates : (c,) int
+          Index of primitive
+        ray_id : (c,) int
+          Index of ray for each candidate
+        """
+        ray_origins = np.asanyarray(ray_origins, dtype=np.float64)
+        ray_directions = np.asanyarray(ray_directions, dtype=np.float64)
+
+        # avoid a division by zero for axis aligned rays by
+        # replacing zero components with a tiny value
+        safe = ray_directions.copy()
+        tiny = np.abs(safe) < 1e-12
+        safe[tiny] = 1e-12
+        ray_inverse = 1.0 / safe
+
+        def test(index, node):
+            return slab_test(origins=ray_origins[index],
+                             inverse=ray_inverse[index],
+                             bounds=self.node_bounds[node])
+
+        return self._traverse(count=len(ray_origins),
+                              test=test,
+                              packet_size=packet_size)
+
+    def box_candidates(self, bounds, packet_size=16384):
+        """
+        Do a broad- phase search for the primitives whose
+        bounding boxes overlap each query box.
+
+        Parameters
+        ------------
+        bounds : (m, 2, 3) float
+          Axis aligned query boxes
+        packet_size : int
+          Number of boxes to traverse at once, which
+          bounds the peak memory of the query
+
+        Returns
+        ------------
+        candidates : (c,) int
+          Index of primitive
+        box_id : (c,) int
+          Index of query box for each candidate
+        """
+        bounds = np.asanyarray(bounds, dtype=np.float64)
+        if not util.is_shape(bounds, (-1, 2, 3)):
+            raise ValueError('bounds must be (n, 2, 3)!')
+
+        def test(index, node):
+            node_bounds = self.node_bounds[node]
+            return np.logical_and(
+                (node_bounds[:, 0] <= bounds[index, 1]).all(axis=1),
+                (node_bounds[:, 1] >= bounds[index, 0]).all(axis=1))
+
+        return self._traverse(count=len(bounds),
+                              test=test,
+                              packet_size=packet_size)
+
+    def _traverse(self, count, test, packet_size):
+        """
+        Walk queries down the tree in packets.
+
+        Parameters
+        ------------
+        count : int
+          Number of queries
+        test : function
+          Takes (p,) query index and (p,) node index and
+          returns (p,) bool, whether the query hits the node
+        packet_size : int
+          Number of queries to traverse at once
+
+        Returns
+        ------------
+        candidates : (c,) int
+          Index of primitive
+        query_id : (c,) int
+          Index of query for each candidate
+        """
+        candidates = []
+        query_id = []
+        packet_size = max(int(packet_size), 1)
+        for start in range(0, count, packet_size):
+            c, q = self._packet(
+                index=np.arange(start,
+                                min(start + packet_size, count),
+                                dtype=np.int64),
+                test=test)
+            candidates.append(c)
+            query_id.append(q)
+
+        if len(candidates) == 0:
+            return (np.array([], dtype=np.int64),
+                    np.array([], dtype=np.int64))
+
+        return np.concatenate(candidates), np.concatenate(query_id)
+
+    def _packet(self, index, test):
+        """
+        Traverse the tree for a single packet of queries.
+
+        Parameters
+        ------------
+        index : (p,) int
+          Index of each query in the packet
+        test : function
+          Takes (p,) query index and (p,) node index and
+          returns (p,) bool, whether the query hits the node
+
+        Returns
+        ------------
+        candidates : (c,) int
+          Index of primitive
+        query_id : (c,) int
+          Index of query for each candidate
+        """
+        # every query starts at the root node
+        query_id = index
+        node = np.zeros(len(index), dtype=np.int64)
+
+        for level in range(self.depth + 1):
+            if level > 0:
+                # expand every surviving pair to both children
+                query_id = np.repeat(query_id, 2)
+                node = (node.reshape((-1, 1)) * 2 +
+                        [1, 2]).reshape(-1)
+            hit = test(query_id, node)
+            query_id = query_id[hit]
+            node = node[hit]
+            if len(query_id) == 0:
+                break
+
+        # convert leaf nodes into ranges of primitives
+        leaf = node - self.leaf_offset
+        start = self.leaf_start[leaf]
+        counts = self.leaf_start[leaf + 1] - start
+        total = counts.sum()
+        # offset of each candidate from the start of its leaf
+        offset = np.arange(total, dtype=np.int64) - np.repeat(
+            np.cumsum(counts) - counts, counts)
+        candidates = self.order[np.repeat(start, counts) + offset]
+        query_id = np.repeat(query_id, counts)
+
+        return candidates, query_id
+
+
+def slab_test(origins, inverse, bounds):
+    """
+    Check whether rays intersect axis aligned boxes using
+    the slab method, ignoring hits behind the ray origin.
+
+    Parameters
+    ------------
+    origins : (n, 3) float
+      Ray origin points
+    inverse : (n, 3) float
+      Reciprocal of ray direction vectors
+    bounds : (n, 2, 3) float
+      Axis aligned bounding boxes
+
+    Returns
+    ------------
+    hit : (n,) bool
+      Whether each ray hits the corresponding box
+    """
+    t_a = (bounds[:, 0] - origins) * inverse
+    t_b = (bounds[:, 1] - origins) * inverse
+    t_min = np.minimum(t_a, t_b).max(axis=1)
+    t_max = np.maximum(t_a, t_b).min(axis=1)
+    return np.logical_and(t_max >= t_min, t_max >= 0.0)
+
+
+def morton(points, bits=10):
+    """
+    Find the Morton (Z- order) code for a set of 3D points
+    quantized inside their bounding box.
+
+    Parameters
+    ------------
+    points : (n, 3) float
+      Points in space
+    bits : int
+      Number of bits per axis, at most 21
+
+    Returns
+    ------------
+    codes : (n,) uint64
+      Morton code for each point
+    """
+    points = np.asanyarray(points, dtype=np.float64)
+    lower = points.min(axis=0)
+    extents = points.ptp(axis=0)
+    extents[extents < 1e-12] = 1.0
+    scale = (2 ** bits) - 1
+    quantized = ((points - lower) / extents * scale).astype(np.uint64)
+
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((quantized[:, axis] >> np.uint64(bit)) &
+                      np.uint64(1)) << np.uint64(3 * bit + axis)
+    return codes
@@ -5,6 +5,7 @@ import numpy as np
 
 
 from .ray_util import contains_points
+from .ray_bvh import BVH
 
 from ..constants import tol
 
@@ -18,13 +19,42 @@ from .. import triangles as triangles_mod
 class RayMeshIntersector(object):
     """
     An object to query a mesh for ray intersections.
-    Precomputes an r-tree for each triangle on the mesh.
+    Precomputes a flattened BVH or an r-tree for the
+    triangles on the mesh.
     """
 
-    def __init__(self, mesh):
+    def __init__(self, mesh, broad_phase='bvh'):
+        """
+        Do ray- mesh queries.
+
+        Parameters
+        -------------
+        mesh : Trimesh object
+          Mesh to do ray tests on
+        broad_phase : str
+          Either 'bvh' for a vectorized array- backed BVH
+          or 'rtree' for per- ray r-tree queries
+        """
+        if broad_phase not in ('bvh', 'rtree'):
+            raise ValueError('broad_phase must be `bvh` or `rtree`!')
         self.mesh = mesh
+        self.broad_phase = broad_phase
         self._cache = caching.Cache(self.mesh.crc)
 
+    @property
+    def tree(self):
+        """
+        The tree used for broad- phase queries.
+
+        Returns
+        -----------
+        tree : trimesh.ray.ray_bvh.BVH or rtree.Index
+          Bounds of each triangle in the mesh
+        """
+        if self.broad_phase == 'bvh':
+            return self.mesh.triangles_bvh
+        return self.mesh.triangles_tree
+
     def intersects_id(self,
                       ray_origins,
                       ray_directions,
@@ -52,7 +82,7 @@ class RayMeshIntersector(object):
          locations) = ray_triangle_id(triangles=self.mesh.triangles,
                                       ray_origins=ray_origins,
                                       ray_directions=ray_directions,
-                                      tree=self.mesh.triangles_tree,
+                                      tree=self.tree,
                                       multiple_hits=multiple_hits,
                                       triangles_normal=self.mesh.face_normals)
         if return_locations:
@@ -159,8 +189,8 @@ def ray_triangle_id(triangles,
       Ray direction vectors
     triangles_normal : (n, 3) float
       Normal vector of triangles, optional
-    tree : rtree.Index
-      Rtree object holding triangle bounds
+    tree : trimesh.ray.ray_bvh.BVH or rtree.Index
+      Tree holding triangle bounds
 
     Returns
     -----------
@@ -175,13 +205,14 @@ def ray_triangle_id(triangles,
     ray_origins = np.asanyarray(ray_origins, dtype=np.float64)
     ray_directions = np.asanyarray(ray_directions, dtype=np.float64)
 
-    # if we didn't get passed an r-tree for the bounds of each
+    # if we didn't get passed a tree for the bounds of each
     # triangle create one here
     if tree is None:
-        tree = triangles_mod.bounds_tree(triangles)
+        tree = BVH(np.stack((triangles.min(axis=1),
+                             triangles.max(axis=1)), axis=1))
 
     # find the list of likely triangles and which ray they
-    # correspond with, via rtree queries
+    # correspond with, via tree queries
     ray_candidates, ray_id = ray_triangle_candidates(
         ray_origins=ray_origins,
         ray_directions=ray_directions,
@@ -252,11 +283,12 @@ def ray_triangle_id(triangles,
     if len(index_ray) == 0:
         return index_tri, index_ray, location
 
-    first = np.zeros(len(index_ray), dtype=np.bool)
-    groups = grouping.group(index_ray)
-    for group in groups:
-        index = group[distance[group].argmin()]
-        first[index] = True
+    # sort by ray index and then distance and take the
+    # first hit for each ray
+    order = np.lexsort((distance, index_ray))
+    # use a mask so hits are returned in candidate order
+    first = np.zeros(len(index_ray), dtype=np.bool_)
+    first[order[np.append(True, np.diff(index_ray[order]) != 0)]] = True
 
     return index_tri[first], index_ray[first], location[first]
 
@@ -275,13 +307,18 @@ def ray_triangle_candidates(ray_origins,
     ----------
     ray_origins:      (m,3) float, ray origin points
     ray_directions:   (m,3) float, ray direction vectors
-    tree:             rtree object, contains AABB of each triangle
+    tree:             BVH or rtree object, contains AABB of each triangle
 
     Returns
     ----------
     ray_candidates: (n,) int, triangle indexes
     ray_id:         (n,) int, corresponding ray index for a triangle candidate
     """
+    if isinstance(tree, BVH):
+        # traverse the BVH with packets of rays
+        return tree.ray_candidates(ray_origins=ray_origins,
+                                   ray_directions=ray_directions)
+
     ray_bounding = ray_bounds(ray_origins=ray_origins,
                               ray_directions=ray_directions,
                               bounds=tree.bounds)
@@ -21,7 +21,11 @@ def mesh_other(mesh,
                samples=500,
                scale=False,
                icp_first=10,
-               icp_final=50):
+               icp_final=50,
+               field=None,
+               batch=False,
+               prune=4.0,
+               workers=None):
     """
     Align a mesh with another mesh or a PointCloud using
     the principal axes of inertia as a starting point which
@@ -43,6 +47,19 @@ def mesh_other(mesh,
     icp_final : int
       How many ICP iterations for the closest
       candidate from the wider search
+    field : None or bool
+      If True answer closest point queries from the
+      cached distance field of whichever mesh is searched
+    batch : bool
+      If True run the first ICP pass for every sign flip
+      at once, with one closest point query per iteration
+      for all candidates and a stacked SVD
+    prune : None or float
+      With batch, stop iterating candidates whose cost is
+      more than this multiple of the best candidate's
+    workers : None or int
+      With batch, number of threads to split closest
+      point queries between
 
     Returns
     -----------
@@ -122,36 +139,57 @@ def mesh_other(mesh,
                                    [1, -1, -1],
                                    [-1, -1, -1]]])
 
-    # loop through permutations and run iterative closest point
-    costs = np.ones(len(cubes)) * np.inf
-    transforms = [None] * len(cubes)
+    # transform from points to search mesh
+    # flipped around the centroid of search
     centroid = search.centroid
-
-    for i, flip in enumerate(cubes):
-        # transform from points to search mesh
-        # flipped around the centroid of search
-        a_to_b = np.dot(
-            transformations.transform_around(flip, centroid),
-            np.linalg.inv(search_to_points))
-
-        # run first pass ICP
+    initials = [np.dot(transformations.transform_around(flip, centroid),
+                       np.linalg.inv(search_to_points))
+                for flip in cubes]
+
+    if batch:
+        # run first pass ICP for every candidate at once
+        transforms, costs = _icp_batch(a=points,
+                                       b=search,
+                                       initials=initials,
+                                       max_iterations=int(icp_first),
+                                       prune=prune,
+                                       field=field,
+                                       workers=workers,
+                                       scale=scale)
+        # run a final ICP refinement step
+        final, cost = _icp_batch(a=points,
+                                 b=search,
+                                 initials=transforms[[np.argmin(costs)]],
+                                 max_iterations=int(icp_final),
+                                 field=field,
+                                 workers=workers,
+                                 scale=scale)
+        matrix, cost = final[0], cost[0]
+    else:
+        # loop through permutations and run iterative closest point
+        costs = np.ones(len(cubes)) * np.inf
+        transforms = [None] * len(cubes)
+        for i, a_to_b in enumerate(initials):
+            # run first pass ICP
+            matrix, junk, cost = icp(a=points,
+                                     b=search,
+                                     initial=a_to_b,
+                                     max_iterations=int(icp_first),
+                                     field=field,
+                                     scale=scale)
+
+            # save transform and costs from ICP
+            transforms[i] = matrix
+            costs[i] = cost
+
+        # run a final ICP refinement step
         matrix, junk, cost = icp(a=points,
                                  b=search,
-                                 initial=a_to_b,
-                                 max_iterations=int(icp_first),
+                                 initial=transforms[np.argmin(costs)],
+                                 max_iterations=int(icp_final),
+                                 field=field,
                                  scale=scale)
 
-        # save transform and costs from ICP
-        transforms[i] = matrix
-        costs[i] = cost
-
-    # run a final ICP refinement step
-    matrix, junk, cost = icp(a=points,
-                             b=search,
-                             initial=transforms[np.argmin(costs)],
-                             max_iterations=int(icp_final),
-                             scale=scale)
-
     # convert to per- point distance average
     cost /= len(points)
 
@@ -171,7 +209,8 @@ def procrustes(a,
                reflection=True,
                translation=True,
                scale=True,
-               return_cost=True):
+               return_cost=True,
+               weights=None):
     """
     Perform Procrustes' analysis subject to constraints. Finds the
     transformation T mapping a to b which minimizes the square sum
@@ -191,6 +230,8 @@ def procrustes(a,
       If the transformation is allowed scaling
     return_cost : bool
       Whether to return the cost and transformed a as well
+    weights : None or (n,) float
+      Weight of each pair of points in the sum
 
     Returns
     ----------
@@ -210,18 +251,27 @@ def procrustes(a,
     if len(a) != len(b):
         raise ValueError('a and b must contain same number of points!')
 
+    if weights is None:
+        weights = np.ones(len(a))
+    else:
+        weights = np.asanyarray(weights, dtype=np.float64)
+        if weights.shape != (len(a),):
+            raise ValueError('weights must be (n,)!')
+    # normalize so weighted sums are weighted means
+    weights = weights / weights.sum()
+
     # Remove translation component
     if translation:
-        acenter = a.mean(axis=0)
-        bcenter = b.mean(axis=0)
+        acenter = np.dot(weights, a)
+        bcenter = np.dot(weights, b)
     else:
         acenter = np.zeros(a.shape[1])
         bcenter = np.zeros(b.shape[1])
 
     # Remove scale component
     if scale:
-        ascale = np.sqrt(((a - acenter)**2).sum() / len(a))
-        bscale = np.sqrt(((b - bcenter)**2).sum() / len(b))
+        ascale = np.sqrt(np.dot(weights, ((a - acenter)**2).sum(axis=1)))
+        bscale = np.sqrt(np.dot(weights, ((b - bcenter)**2).sum(axis=1)))
     else:
         ascale = 1
         bscale = 1
@@ -229,7 +279,8 @@ def procrustes(a,
     # Use SVD to find optimal orthogonal matrix R
     # constrained to det(R) = 1 if necessary.
     u, s, vh = np.linalg.svd(
-        np.dot(((b - bcenter) / bscale).T, ((a - acenter) / ascale)))
+        np.dot(((b - bcenter) / bscale).T * weights,
+               ((a - acenter) / ascale)))
     if reflection:
         R = np.dot(u, vh)
     else:
@@ -246,7 +297,8 @@ def procrustes(a,
 
     if return_cost:
         transformed = transform_points(a, matrix)
-        cost = ((b - transformed)**2).mean()
+        # weighted mean of squared distance per coordinate
+        cost = np.dot(weights, ((b - transformed)**2).sum(axis=1)) / 3.0
         return matrix, transformed, cost
     else:
         return matrix
@@ -257,6 +309,11 @@ def icp(a,
         initial=np.identity(4),
         threshold=1e-5,
         max_iterations=20,
+        field=None,
+        method='point',
+        kernel=None,
+        kernel_scale=None,
+        trim=None,
         **kwargs):
     """
     Apply the iterative closest point algorithm to align a point cloud with
@@ -269,16 +326,35 @@ def icp(a,
     ----------
     a : (n,3) float
       List of points in space.
-    b : (m,3) float or Trimesh
-      List of points in space or mesh.
+    b : (m,3) float, PointCloud or Trimesh
+      List of points in space or mesh. The KD-tree of a
+      PointCloud is cached so it is reused across calls.
     initial : (4,4) float
       Initial transformation.
     threshold : float
-      Stop when change in cost is less than threshold
+      Stop when change in cost is less than threshold, or
+      with a kernel or trim when the root mean square
+      motion of the points in an iteration is below it
     max_iterations : int
       Maximum number of iterations
+    field : None, True, or trimesh.proximity.DistanceField
+      If b is a mesh answer closest point queries from a
+      distance field, where True uses b.distance_field
+    method : str
+      'point' minimizes the distance to the closest points
+      and 'plane' minimizes the distance to the planes of
+      the closest faces, which requires b to be a mesh
+    kernel : None, 'huber' or 'tukey'
+      Robust weighting of correspondences by residual
+    kernel_scale : None or float
+      Residual scale for the kernel, if None estimated
+      each iteration from the median absolute residual
+      and for Tukey kept above 1% of the size of b
+    trim : None or float
+      Fraction of correspondences with the smallest
+      residuals to use each iteration
     kwargs : dict
-      Args to pass to procrustes
+      Args to pass to procrustes for the point method
 
     Returns
     ----------
@@ -295,12 +371,32 @@ def icp(a,
         raise ValueError('points must be (n,3)!')
 
     is_mesh = util.is_instance_named(b, 'Trimesh')
-    if not is_mesh:
+    if util.is_instance_named(b, 'PointCloud'):
+        # use the tree cached on the point cloud
+        btree = b.kdtree
+        b = b.vertices.view(np.ndarray)
+    elif not is_mesh:
         b = np.asanyarray(b, dtype=np.float64)
         if not util.is_shape(b, (-1, 3)):
             raise ValueError('points must be (n,3)!')
         btree = cKDTree(b)
 
+    if method not in ['point', 'plane']:
+        raise ValueError('method must be point or plane!')
+    if method == 'plane' and not is_mesh:
+        raise ValueError('point to plane requires a mesh!')
+
+    # an estimated kernel scale can collapse when most
+    # residuals are near zero so keep it above a fraction
+    # of the size of the target
+    if is_mesh:
+        scale_floor = b.scale * 1e-2
+    else:
+        scale_floor = np.linalg.norm(np.ptp(b, axis=0)) * 1e-2
+    # reweighted costs change as correspondences are rejected
+    # so robust alignments converge when the points stop moving
+    robust = kernel is not None or trim is not None
+
     # transform a under initial_transformation
     a = transform_points(a, initial)
     total_matrix = initial
@@ -312,23 +408,348 @@ def icp(a,
     for n_iteration in range(max_iterations):
         # Closest point in b to each point in a
         if is_mesh:
-            closest, distance, faces = b.nearest.on_surface(a)
+            closest, distance, faces = b.nearest.on_surface(
+                a, field=field)
         else:
             distances, ix = btree.query(a, 1)
             closest = b[ix]
 
+        if method == 'plane':
+            normals = b.face_normals[faces]
+            residual = ((a - closest) * normals).sum(axis=1)
+        else:
+            residual = np.linalg.norm(a - closest, axis=1)
+        weights = _robust_weights(residual,
+                                  kernel=kernel,
+                                  kernel_scale=kernel_scale,
+                                  trim=trim,
+                                  scale_floor=scale_floor)
+
         # align a with closest points
-        matrix, transformed, cost = procrustes(a=a,
-                                               b=closest,
-                                               **kwargs)
+        if method == 'plane':
+            matrix, transformed, cost = _point_to_plane(
+                a=a, b=closest, normals=normals, weights=weights)
+        else:
+            matrix, transformed, cost = procrustes(a=a,
+                                                   b=closest,
+                                                   weights=weights,
+                                                   **kwargs)
+
+        # root mean square distance this iteration moved the points
+        motion = np.sqrt(((transformed - a) ** 2).sum(axis=1).mean())
 
         # update a with our new transformed points
         a = transformed
         total_matrix = np.dot(matrix, total_matrix)
 
-        if old_cost - cost < threshold:
+        if robust:
+            # the reweighted cost can drop below the threshold
+            # while the alignment is still moving
+            if motion < threshold:
+                break
+        elif old_cost - cost < threshold:
             break
         else:
             old_cost = cost
 
     return total_matrix, transformed, cost
+
+
+def _robust_weights(residual,
+                    kernel=None,
+                    kernel_scale=None,
+                    trim=None,
+                    scale_floor=0.0):
+    """
+    Weight correspondences by their residual.
+
+    Parameters
+    ----------
+    residual : (n,) float
+      Distance for each correspondence
+    kernel : None, 'huber' or 'tukey'
+      Robust kernel to weight by
+    kernel_scale : None or float
+      Scale of residuals, if None from the median
+      absolute residual
+    trim : None or float
+      Fraction of the smallest residuals to keep
+    scale_floor : float
+      Minimum estimated scale for the Tukey kernel,
+      which rejects everything above a multiple of it
+
+    Returns
+    ----------
+    weights : (n,) float
+      Weight of each correspondence
+    """
+    residual = np.abs(residual)
+    weights = np.ones(len(residual))
+
+    if kernel is not None:
+        estimated = kernel_scale is None
+        if estimated:
+            # a robust estimate of standard deviation
+            kernel_scale = 1.4826 * np.median(residual)
+        kernel_scale = max(float(kernel_scale), 1e-12)
+        if kernel == 'huber':
+            limit = 1.345 * kernel_scale
+            large = residual > limit
+            weights[large] = limit / residual[large]
+        elif kernel == 'tukey':
+            if estimated:
+                # if most residuals are near zero the estimate
+                # collapses and would reject every correspondence
+                # which is carrying the remaining offset
+                kernel_scale = max(kernel_scale, float(scale_floor))
+            limit = 4.685 * kernel_scale
+            weights = (1.0 - (residual / limit) ** 2).clip(0.0) ** 2
+        else:
+            raise ValueError('kernel must be huber or tukey!')
+
+    if trim is not None:
+        # only keep the closest fraction of correspondences
+        keep = max(int(np.ceil(len(residual) * float(trim))), 1)
+        if keep < len(residual):
+            weights[np.argsort(residual)[keep:]] = 0.0
+
+    if weights.sum() <= 0.0:
+        # every correspondence was rejected
+        weights[:] = 1.0
+
+    return weights
+
+
+def _point_to_plane(a, b, normals, weights=None):
+    """
+    Find the rigid transform minimizing the weighted sum of
+    squared distances from points to planes, linearized for
+    small rotations.
+
+    Parameters
+    ----------
+    a : (n,3) float
+      Points to move
+    b : (n,3) float
+      A point on the plane for each point in a
+    normals : (n,3) float
+      Unit normal of the plane for each point in a
+    weights : None or (n,) float
+      Weight of each correspondence
+
+    Returns
+    ----------
+    matrix : (4,4) float
+      The transformation matrix sending a to the planes
+    transformed : (n,3) float
+      The image of a under the transformation
+    cost : float
+      Weighted mean squared distance to the planes
+    """
+    if weights is None:
+        weights = np.ones(len(a))
+    weights = weights / weights.sum()
+
+    # rotate and translate around the weighted center
+    # so the linear system is better conditioned
+    center = np.dot(weights, a)
+    centered = a - center
+
+    # residual is linear in the rotation vector and translation
+    jacobian = np.column_stack((np.cross(centered, normals), normals))
+    residual = ((b - a) * normals).sum(axis=1)
+    weighted = jacobian * weights.reshape((-1, 1))
+    x = np.linalg.lstsq(np.dot(weighted.T, jacobian),
+                        np.dot(weighted.T, residual),
+                        rcond=None)[0]
+
+    # turn the rotation vector into an exact rotation
+    angle = np.linalg.norm(x[:3])
+    if angle > 1e-12:
+        matrix = transformations.rotation_matrix(
+            angle, x[:3] / angle, point=center)
+    else:
+        matrix = np.eye(4)
+    matrix[:3, 3] += x[3:]
+
+    transformed = transform_points(a, matrix)
+    cost = np.dot(weights, ((b - transformed) * normals).sum(axis=1) ** 2)
+    return matrix, transformed, cost
+
+
+def _procrustes_batch(a, b, scale=True):
+    """
+    Perform Procrustes' analysis on stacked sets of points
+    with a single stacked SVD, allowing reflections like
+    `procrustes` does by default.
+
+    Parameters
+    ----------
+    a : (k, n, 3) float
+      Sets of points in space
+    b : (k, n, 3) float
+      Sets of points in space
+    scale : bool
+      If the transformation is allowed scaling
+
+    Returns
+    ----------
+    matrix : (k, 4, 4) float
+      The transformation matrices sending each a to b
+    transformed : (k, n, 3) float
+      The image of each a under its transformation
+    cost : (k,) float
+      The cost of each transformation
+    """
+    count = a.shape[1]
+    acenter = a.mean(axis=1)
+    bcenter = b.mean(axis=1)
+    a_zero = a - acenter.reshape((-1, 1, 3))
+    b_zero = b - bcenter.reshape((-1, 1, 3))
+
+    if scale:
+        ascale = np.sqrt((a_zero ** 2).sum(axis=(1, 2)) / count)
+        bscale = np.sqrt((b_zero ** 2).sum(axis=(1, 2)) / count)
+    else:
+        ascale = np.ones(len(a))
+        bscale = np.ones(len(b))
+
+    # (k, 3, 3) covariance of each pair of sets
+    covariance = np.einsum('kni,knj->kij',
+                           b_zero / bscale.reshape((-1, 1, 1)),
+                           a_zero / ascale.reshape((-1, 1, 1)))
+    u, s, vh = np.linalg.svd(covariance)
+    ratio = (bscale / ascale).reshape((-1, 1, 1))
+    rotation = np.matmul(u, vh) * ratio
+
+    matrix = np.tile(np.eye(4), (len(a), 1, 1))
+    matrix[:, :3, :3] = rotation
+    matrix[:, :3, 3] = bcenter - np.einsum('kij,kj->ki', rotation, acenter)
+
+    transformed = (np.einsum('kij,knj->kni', rotation, a) +
+                   matrix[:, :3, 3].reshape((-1, 1, 3)))
+    cost = ((b - transformed) ** 2).mean(axis=(1, 2))
+
+    return matrix, transformed, cost
+
+
+def _icp_batch(a,
+               b,
+               initials,
+               threshold=1e-5,
+               max_iterations=20,
+               prune=None,
+               field=None,
+               workers=None,
+               scale=True):
+    """
+    Run iterative closest point from several initial
+    transforms at once, querying the closest points for
+    every candidate in one call per iteration.
+
+    Parameters
+    ----------
+    a : (n,3) float
+      List of points in space
+    b : Trimesh
+      Mesh to align points with
+    initials : (k, 4, 4) float
+      Initial transformation for each candidate
+    threshold : float
+      Stop a candidate when its change in cost is less
+    max_iterations : int
+      Maximum number of iterations
+    prune : None or float
+      Stop candidates whose cost is more than this
+      multiple of the lowest cost
+    field : None, True, or trimesh.proximity.DistanceField
+      Passed to b.nearest.on_surface
+    workers : None or int
+      Number of threads to split closest point queries
+    scale : bool
+      If the transformation is allowed scaling
+
+    Returns
+    ----------
+    matrices : (k, 4, 4) float
+      The transformation sending a to b for each candidate
+    costs : (k,) float
+      The cost of each candidate when it stopped
+    """
+    a = np.asanyarray(a, dtype=np.float64)
+    if not util.is_shape(a, (-1, 3)):
+        raise ValueError('points must be (n,3)!')
+
+    total = np.array(initials, dtype=np.float64).reshape((-1, 4, 4))
+    # (k, n, 3) points transformed by each candidate
+    current = (np.einsum('kij,nj->kni', total[:, :3, :3], a) +
+               total[:, :3, 3].reshape((-1, 1, 3)))
+    costs = np.ones(len(total)) * np.inf
+    # index of candidates which are still iterating
+    active = np.arange(len(total))
+
+    for n_iteration in range(max_iterations):
+        if len(active) == 0:
+            break
+        # closest points for every active candidate at once
+        closest = _closest_threaded(
+            mesh=b,
+            points=current[active].reshape((-1, 3)),
+            field=field,
+            workers=workers).reshape((len(active), -1, 3))
+
+        matrix, transformed, cost = _procrustes_batch(
+            current[active], closest, scale=scale)
+        current[active] = transformed
+        total[active] = np.matmul(matrix, total[active])
+
+        # candidates stop when their cost stops improving
+        keep = (costs[active] - cost) >= threshold
+        costs[active] = cost
+        if prune is not None:
+            # or when they are clearly worse than the best
+            keep &= cost <= costs.min() * float(prune)
+        active = active[keep]
+
+    return total, costs
+
+
+def _closest_threaded(mesh, points, field=None, workers=None):
+    """
+    Find the closest point on a mesh for each point,
+    splitting the points between a pool of threads.
+
+    Parameters
+    ----------
+    mesh : Trimesh
+      Mesh to query
+    points : (n, 3) float
+      Points in space
+    field : None, True, or trimesh.proximity.DistanceField
+      Passed to mesh.nearest.on_surface
+    workers : None or int
+      Number of threads, None or one to run in this thread
+
+    Returns
+    ----------
+    closest : (n, 3) float
+      Closest point on mesh to each point
+    """
+    if workers is None or int(workers) <= 1 or len(points) < 2:
+        return mesh.nearest.on_surface(points, field=field)[0]
+
+    chunks = np.array_split(points, int(workers))
+    # query the first chunk in this thread so values
+    # cached on the mesh exist before threads read them
+    closest = [mesh.nearest.on_surface(chunks[0], field=field)[0]]
+
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(processes=len(chunks) - 1)
+    try:
+        closest.extend(pool.map(
+            lambda chunk: mesh.nearest.on_surface(
+                chunk, field=field)[0],
+            chunks[1:]))
+    finally:
+        pool.close()
+    return np.vstack(closest)
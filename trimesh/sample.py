@@ -10,7 +10,7 @@ from . import util
 from . import transformations
 
 
-def sample_surface(mesh, count):
+def sample_surface(mesh, count, seed=None):
     """
     Sample the surface of a mesh, returning the specified
     number of points
@@ -22,6 +22,8 @@ def sample_surface(mesh, count):
     ---------
     mesh: Trimesh object
     count: number of points to return
+    seed: None or int, seed for a random state so samples
+          are reproducible, or None for np.random
 
     Returns
     ---------
@@ -29,6 +31,11 @@ def sample_surface(mesh, count):
     face_index: (count,) indices of faces for each sampled point
     """
 
+    if seed is None:
+        random = np.random.random
+    else:
+        random = np.random.RandomState(seed).random_sample
+
     # len(mesh.faces) float, array of the areas
     # of each face of the mesh
     area = mesh.area_faces
@@ -36,7 +43,7 @@ def sample_surface(mesh, count):
     area_sum = np.sum(area)
     # cumulative area (len(mesh.faces))
     area_cum = np.cumsum(area)
-    face_pick = np.random.random(count) * area_sum
+    face_pick = random(count) * area_sum
     face_index = np.searchsorted(area_cum, face_pick)
 
     # pull triangles into the form of an origin + 2 vectors
@@ -49,7 +56,7 @@ def sample_surface(mesh, count):
     tri_vectors = tri_vectors[face_index]
 
     # randomly generate two 0-1 scalar components to multiply edge vectors by
-    random_lengths = np.random.random((len(tri_vectors), 2, 1))
+    random_lengths = random((len(tri_vectors), 2, 1))
 
     # points will be distributed on a quadrilateral if we use 2 0-1 samples
     # if the two scalar components sum less than 1.0 the point will be
@@ -114,16 +121,21 @@ def volume_rectangular(extents,
     return samples
 
 
-def sample_surface_even(mesh, count):
+def sample_surface_even(mesh, count, radius=None, seed=None):
     """
     Sample the surface of a mesh, returning samples which are
-    approximately evenly spaced.
+    approximately evenly spaced, as a Poisson disk sample where
+    no two points are closer than radius.
 
+    May return fewer than count points.
 
     Parameters
     ---------
     mesh: Trimesh object
     count: number of points to return
+    radius: None or float, minimum distance between samples,
+            if None it is picked from the area and count
+    seed: None or int, seed for reproducible samples
 
     Returns
     ---------
@@ -132,12 +144,14 @@ def sample_surface_even(mesh, count):
     """
     from .points import remove_close
 
-    radius = np.sqrt(mesh.area / (2 * count))
+    if radius is None:
+        radius = np.sqrt(mesh.area / (2 * count))
 
-    samples, ids = sample_surface(mesh, count * 5)
+    # oversample and then remove points which are too close
+    samples, ids = sample_surface(mesh, count * 5, seed=seed)
     result, mask = remove_close(samples, radius)
 
-    return result, ids[mask]
+    return result[:count], ids[mask][:count]
 
 
 def sample_surface_sphere(count):
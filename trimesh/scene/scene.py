@@ -540,24 +540,132 @@ class Scene(Geometry):
                           matrix=matrix)
         self.graph.base_frame = new_base
 
-    def dump(self):
+    def dump(self, concatenate=False, lazy=False):
         """
         Append all meshes in scene to a list of meshes.
 
+        Parameters
+        ------------
+        concatenate : bool
+          If True return a single Trimesh with every instance
+          of every mesh in the scene, transformed in bulk
+          without copying each node's mesh
+        lazy : bool
+          If True return a generator which transforms a copy
+          of each node's geometry only when it is requested
+
         Returns
         ----------
-        dumped: (n,) list, of Trimesh objects transformed to their
+        dumped : (n,) list, of Trimesh objects transformed to their
                            location the scene.graph
+                 or Trimesh if concatenate
+                 or generator of Trimesh if lazy
         """
-        result = collections.deque()
+        if concatenate:
+            return self._dump_instanced()
+        if lazy:
+            return self._dump_lazy()
+        return np.array(list(self._dump_lazy()))
 
+    def _dump_lazy(self):
+        """
+        Yield a transformed copy of the geometry at each node.
+        """
         for node_name in self.graph.nodes_geometry:
             transform, geometry_name = self.graph[node_name]
 
             current = self.geometry[geometry_name].copy()
             current.apply_transform(transform)
-            result.append(current)
-        return np.array(result)
+            yield current
+
+    def _dump_instanced(self):
+        """
+        Concatenate every mesh instance in the scene into one
+        mesh, transforming every instance of a geometry in a
+        single vectorized operation on its shared vertices.
+
+        Geometry without faces, such as paths, is skipped.
+
+        Returns
+        ----------
+        dumped : Trimesh or None
+          All mesh instances in the scene
+        """
+        # geometry name : list of (4, 4) transforms
+        instances = collections.OrderedDict()
+        for node_name in self.graph.nodes_geometry:
+            transform, geometry_name = self.graph[node_name]
+            if not hasattr(self.geometry[geometry_name], 'faces'):
+                continue
+            if geometry_name not in instances:
+                instances[geometry_name] = []
+            instances[geometry_name].append(transform)
+
+        if len(instances) == 0:
+            return None
+
+        vertices = []
+        faces = []
+        normals = []
+        colors = []
+        # which kind of colors are defined for every mesh
+        kinds = {self.geometry[name].visual.kind
+                 for name in instances}
+        kind = kinds.pop() if len(kinds) == 1 else None
+        if kind not in ('face', 'vertex'):
+            kind = None
+
+        offset = 0
+        for name, transforms in instances.items():
+            mesh = self.geometry[name]
+            transforms = np.array(transforms, dtype=np.float64)
+            count = len(transforms)
+            rotation = transforms[:, :3, :3]
+
+            # (count, len(mesh.vertices), 3) transformed vertices
+            vertices.append(
+                np.einsum('kij,nj->kni', rotation, mesh.vertices) +
+                transforms[:, None, :3, 3])
+
+            # offset the faces of every instance
+            stacked = (mesh.faces[None, :, :] + (
+                offset + np.arange(count) * len(mesh.vertices)
+            ).reshape((-1, 1, 1)))
+            # a reflection flips the winding
+            flip = np.linalg.det(rotation) < 0
+            stacked[flip] = stacked[flip][:, :, ::-1]
+            faces.append(stacked)
+            offset += count * len(mesh.vertices)
+
+            if normals is not None and 'face_normals' in mesh._cache:
+                # normals are transformed by the inverse transpose
+                normal = np.einsum(
+                    'kji,nj->kni',
+                    np.linalg.inv(rotation),
+                    mesh.face_normals)
+                normals.append(util.unitize(normal.reshape((-1, 3))))
+            else:
+                normals = None
+
+            if kind is not None:
+                colors.append(np.tile(
+                    getattr(mesh.visual, kind + '_colors'),
+                    (count, 1)))
+
+        visual = None
+        if kind is not None:
+            visual = type(mesh.visual)(
+                **{kind + '_colors': np.vstack(colors)})
+        if normals is not None:
+            normals = np.vstack(normals)
+
+        dumped = util.type_named(mesh, 'Trimesh')(
+            vertices=np.vstack([v.reshape((-1, 3)) for v in vertices]),
+            faces=np.vstack([f.reshape((-1, 3)) for f in faces]),
+            face_normals=normals,
+            visual=visual,
+            process=False)
+        return dumped
 
     @caching.cache_decorator
     def convex_hull(self):
@@ -10,14 +10,20 @@ from .. import transformations
 
 
 class TransformForest(object):
-    def __init__(self, base_frame='world'):
-        self.transforms = EnforcedForest()
-        self.base_frame = base_frame
+    """
+    A forest of coordinate frames where every frame has at most
+    one parent and a transform from its parent's frame.
 
-        self._paths = {}
-        self._updated = time.time()
+    Frames are stored in flat arrays of parent indexes and local
+    matrices, and the transform of every frame relative to the
+    root of its tree is evaluated for whole levels of the forest
+    at once. Updating a frame only invalidates its subtree.
+    """
 
-        self._cache = caching.Cache(id_function=self.md5)
+    def __init__(self, base_frame='world'):
+        self.base_frame = base_frame
+        self.clear()
+        self._cache = caching.Cache(id_function=self._structure_id)
 
     def update(self, frame_to, frame_from=None, **kwargs):
         """
@@ -41,21 +47,27 @@ class TransformForest(object):
         if frame_from is None:
             frame_from = self.base_frame
         matrix = kwargs_to_matrix(**kwargs)
+        self._updated = time.time()
 
-        attr = {'matrix': matrix, 'time': time.time()}
+        if frame_from == frame_to:
+            return
 
-        if 'geometry' in kwargs:
-            attr['geometry'] = kwargs['geometry']
+        parent = self._add_node(frame_from)
+        child = self._add_node(frame_to)
+
+        if self._parent[child] != parent:
+            if parent in self._subtree(child):
+                # the new edge would close a loop so cut the
+                # parent away from the rest of its tree
+                self._set_parent(parent, -1)
+            self._set_parent(child, parent)
+
+        self._local[child] = matrix
+        self._invalidate(child)
 
-        changed = self.transforms.add_edge(frame_from, frame_to, **attr)
         if 'geometry' in kwargs:
-            nx.set_node_attributes(
-                self.transforms,
-                name='geometry',
-                values={frame_to: kwargs['geometry']})
-        if changed:
-            self._paths = {}
-        self._updated = time.time()
+            self._geometry[frame_to] = kwargs['geometry']
+            self._modified += 1
 
     def md5(self):
         """
@@ -63,7 +75,9 @@ class TransformForest(object):
 
         Currently only hashing update time.
         """
-        result = str(int(self._updated * 1000)) + str(self.base_frame)
+        result = '{}{}{}'.format(int(self._updated * 1000),
+                                 self._modified,
+                                 self.base_frame)
         return result
 
     def copy(self):
@@ -76,8 +90,16 @@ class TransformForest(object):
         """
         copied = TransformForest()
         copied.base_frame = copy.deepcopy(self.base_frame)
-        copied.transforms = copy.deepcopy(self.transforms)
-
+        copied._names = list(self._names)
+        copied._index = self._index.copy()
+        copied._geometry = self._geometry.copy()
+        copied._children = {k: v.copy() for k, v in self._children.items()}
+        copied._parent = self._parent.copy()
+        copied._local = self._local.copy()
+        copied._world = self._world.copy()
+        copied._dirty = self._dirty.copy()
+        copied._any_dirty = self._any_dirty
+        copied._updated = self._updated
         return copied
 
     def to_flattened(self, base_frame=None):
@@ -155,16 +177,15 @@ class TransformForest(object):
         """
         # save cleaned edges
         export = []
-        # loop through (node, node, edge attributes)
-        for edge in nx.to_edgelist(self.transforms):
-            a, b, c = edge
+        for child in np.nonzero(self._parent[:len(self._names)] >= 0)[0]:
+            b = self._names[child]
+            # save the matrix as a float list
+            c = {'matrix': self._local[child].tolist()}
             # geometry is a node property but save it to the
             # edge so we don't need two dictionaries
-            if 'geometry' in self.transforms.node[b]:
-                c['geometry'] = self.transforms.node[b]['geometry']
-            # save the matrix as a float list
-            c['matrix'] = np.asanyarray(c['matrix'], dtype=np.float64).tolist()
-            export.append((a, b, c))
+            if b in self._geometry:
+                c['geometry'] = self._geometry[b]
+            export.append((self._names[self._parent[child]], b, c))
         return export
 
     def from_edgelist(self, edges, strict=True):
@@ -213,7 +234,7 @@ class TransformForest(object):
         -------------
         nodes: (n,) array, of node names
         """
-        nodes = np.array(list(self.transforms.nodes()))
+        nodes = np.array(self._names)
         return nodes
 
     @caching.cache_decorator
@@ -225,20 +246,36 @@ class TransformForest(object):
         ------------
         nodes_geometry: (m,) array, of node names
         """
+        nodes = np.array([n for n in self._names
+                          if n in self._geometry])
+        return nodes
 
-        nodes = np.array([
-            n for n in self.transforms.nodes()
-            if 'geometry' in self.transforms.node[n]
-        ])
+    @property
+    def transforms(self):
+        """
+        The forest as a networkx.DiGraph, created on demand.
 
-        return nodes
+        Returns
+        ------------
+        graph : networkx.DiGraph
+          Edges from parent to child with a 'matrix' attribute
+          and nodes with a 'geometry' attribute if they have it
+        """
+        import networkx as nx
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._names)
+        graph.add_edges_from(self.to_edgelist())
+        nx.set_node_attributes(graph,
+                               name='geometry',
+                               values=self._geometry)
+        return graph
 
     def get(self, frame_to, frame_from=None):
         """
         Get the transform from one frame to another, assuming they are connected
         in the transform tree.
 
-        If the frames are not connected a NetworkXNoPath error will be raised.
+        If the frames are not connected a ValueError will be raised.
 
         Parameters
         ---------
@@ -249,40 +286,53 @@ class TransformForest(object):
         Returns
         ---------
         transform:  (4,4) homogenous transformation matrix
+        geometry:   the name of geometry at frame_to or None
         """
-
         if frame_from is None:
             frame_from = self.base_frame
 
-        cache_key = str(frame_from) + ':' + str(frame_to)
-        cached = self._cache[cache_key]
-        if cached is not None:
-            return cached
+        index_to = self._index[frame_to]
+        geometry = self._geometry.get(frame_to)
+        if frame_from == frame_to:
+            return np.eye(4), geometry
+        index_from = self._index[frame_from]
 
-        transform = np.eye(4)
-        path = self._get_path(frame_from, frame_to)
+        if self._root(index_to) != self._root(index_from):
+            raise ValueError('no path between {} and {}'.format(
+                frame_from, frame_to))
 
-        for i in range(len(path) - 1):
-            data, direction = self.transforms.get_edge_data_direction(
-                path[i], path[i + 1])
-            matrix = data['matrix']
-            if direction < 0:
-                matrix = np.linalg.inv(matrix)
-            transform = np.dot(transform, matrix)
-
-        geometry = None
-        if 'geometry' in self.transforms.node[frame_to]:
-            geometry = self.transforms.node[frame_to]['geometry']
+        world = self.world
+        if self._parent[index_from] < 0:
+            # the world transform of a root is identity
+            transform = world[index_to].copy()
+        else:
+            transform = np.dot(np.linalg.inv(world[index_from]),
+                               world[index_to])
+        return transform, geometry
 
-        self._cache[cache_key] = (transform, geometry)
+    @property
+    def world(self):
+        """
+        The transform of every node relative to the root of
+        its tree, in the same order as `nodes`.
 
-        return transform, geometry
+        Returns
+        ------------
+        world : (len(self.nodes), 4, 4) float
+          Homogeneous transformation matrices
+        """
+        if self._any_dirty:
+            self._evaluate()
+        world = self._world[:len(self._names)]
+        world.flags.writeable = False
+        return world
 
     def show(self):
         """
         Plot the graph layout of the scene.
         """
         import matplotlib.pyplot as plt
+        import networkx as nx
         nx.draw(self.transforms, with_labels=True)
         plt.show()
 
@@ -293,7 +343,7 @@ class TransformForest(object):
         return graph_to_svg(self.transforms)
 
     def __contains__(self, key):
-        return key in self.transforms.node
+        return key in self._index
 
     def __getitem__(self, key):
         return self.get(key)
@@ -305,33 +355,133 @@ class TransformForest(object):
         return self.update(key, matrix=value)
 
     def clear(self):
-        self.transforms = EnforcedForest()
-        self._paths = {}
+        # node names and their index in the arrays
+        self._names = []
+        self._index = {}
+        # node name : geometry name
+        self._geometry = {}
+        # parent index : set of child indexes
+        self._children = collections.defaultdict(set)
+
+        # arrays which grow as nodes are added
+        self._parent = np.zeros(0, dtype=np.int64)
+        self._local = np.zeros((0, 4, 4))
+        self._world = np.zeros((0, 4, 4))
+        self._dirty = np.zeros(0, dtype=bool)
+        self._any_dirty = False
+
+        # incremented when nodes or edges are added or removed
+        self._modified = getattr(self, '_modified', 0) + 1
         self._updated = time.time()
 
-    def _get_path(self, frame_from, frame_to):
+    def _structure_id(self):
+        """
+        Value which changes when nodes or geometry change.
         """
-        Find a path between two frames, either from cached paths or
-        from the transform graph.
+        return self._modified
 
-        Parameters
-        ---------
-        frame_from: a frame key, usually a string
-                    eg, 'world'
-        frame_to:   a frame key, usually a string
-                    eg, 'mesh_0'
+    def _add_node(self, name):
+        """
+        Get the index of a node, adding it if it doesn't exist.
+        """
+        if name in self._index:
+            return self._index[name]
+
+        index = len(self._names)
+        if index >= len(self._parent):
+            # grow the arrays by doubling
+            size = max(16, len(self._parent) * 2)
+            grow = size - len(self._parent)
+            self._parent = np.append(
+                self._parent, -np.ones(grow, dtype=np.int64))
+            self._local = np.append(
+                self._local, np.tile(np.eye(4), (grow, 1, 1)), axis=0)
+            self._world = np.append(
+                self._world, np.tile(np.eye(4), (grow, 1, 1)), axis=0)
+            self._dirty = np.append(
+                self._dirty, np.zeros(grow, dtype=bool))
+
+        self._names.append(name)
+        self._index[name] = index
+        self._modified += 1
+        return index
+
+    def _set_parent(self, child, parent):
+        """
+        Move a node and its subtree to a new parent, or
+        make it a root if parent is -1.
+        """
+        previous = self._parent[child]
+        if previous >= 0:
+            self._children[previous].discard(child)
+        if parent >= 0:
+            self._children[parent].add(child)
+        else:
+            self._local[child] = np.eye(4)
+        self._parent[child] = parent
+        self._invalidate(child)
+        self._modified += 1
+
+    def _subtree(self, index):
+        """
+        Find a node and every node below it.
 
         Returns
         ----------
-        path: (n) list of frame keys
-              eg, ['mesh_finger', 'mesh_hand', 'world']
-        """
-        key = (frame_from, frame_to)
-        if not (key in self._paths):
-            path = self.transforms.shortest_path_undirected(
-                frame_from, frame_to)
-            self._paths[key] = path
-        return self._paths[key]
+        subtree : set of int
+          Index of nodes in the subtree
+        """
+        subtree = {index}
+        stack = [index]
+        while len(stack) > 0:
+            children = self._children.get(stack.pop())
+            if children:
+                subtree.update(children)
+                stack.extend(children)
+        return subtree
+
+    def _invalidate(self, index):
+        """
+        Mark the world transform of a subtree for evaluation.
+        """
+        if self._dirty[index]:
+            # a subtree which is already dirty is dirty below
+            return
+        self._dirty[list(self._subtree(index))] = True
+        self._any_dirty = True
+
+    def _root(self, index):
+        """
+        Find the root of the tree containing a node.
+        """
+        parent = self._parent
+        while parent[index] >= 0:
+            index = parent[index]
+        return index
+
+    def _evaluate(self):
+        """
+        Evaluate the world transform of every dirty node, one
+        level of the forest at a time.
+        """
+        dirty = self._dirty
+        pending = np.nonzero(dirty[:len(self._names)])[0]
+        while len(pending) > 0:
+            parent = self._parent[pending]
+            root = parent < 0
+            # nodes whose parent has already been evaluated
+            ready = root.copy()
+            ready[~root] = ~dirty[parent[~root]]
+
+            self._world[pending[ready & root]] = np.eye(4)
+            branch = ready & ~root
+            self._world[pending[branch]] = np.matmul(
+                self._world[parent[branch]],
+                self._local[pending[branch]])
+
+            dirty[pending[ready]] = False
+            pending = pending[~ready]
+        self._any_dirty = False
 
 
 class EnforcedForest(nx.DiGraph):
@@ -1,10 +1,20 @@
+import weakref
+
 import numpy as np
 
+from . import geometry
+from . import grouping
+
 try:
-    from scipy.sparse import coo_matrix
+    from scipy.sparse import coo_matrix, identity
+    from scipy.sparse.linalg import splu
 except ImportError:
     pass
 
+# factorized implicit smoothing systems as (solve, weakref)
+# keyed by (id(laplacian_operator), lamb), removed with the operator
+_factors = {}
+
 
 def filter_laplacian(mesh,
                      lamb=0.5,
@@ -28,27 +38,39 @@ def filter_laplacian(mesh,
       If 1.0, full diffusion
     iterations : int
       Number of passes to run filter
-    laplacian_operator : None or scipy.sparse.coo.coo_matrix
+    laplacian_operator : None or scipy.sparse matrix
       Sparse matrix laplacian operator
-      Will be autogenerated if None
+      Will be mesh.laplacian_operator if None
     """
-    # if the laplacian operator was not passed create it here
+    # if the laplacian operator was not passed use the cached one
     if laplacian_operator is None:
-        laplacian_operator = laplacian_calculation(mesh)
+        laplacian_operator = mesh.laplacian_operator
+    # CSR is much faster for repeated products
+    laplacian_operator = laplacian_operator.tocsr()
 
     # get mesh vertices as vanilla numpy array
     vertices = mesh.vertices.copy().view(np.ndarray)
-
-    # Number of passes
-    for _index in range(iterations):
-        dot = coo_matrix.dot(laplacian_operator, vertices) - vertices
-        vertices += lamb * dot
+    vertices = _laplacian_steps(vertices,
+                                laplacian_operator,
+                                lamb=lamb,
+                                iterations=iterations)
 
     # assign modified vertices back to mesh
     mesh.vertices = vertices
     return mesh
 
 
+def _laplacian_steps(vertices, laplacian_operator, lamb, iterations):
+    """
+    Run laplacian smoothing on (n, m) vertex columns in place.
+    """
+    # Number of passes
+    for _index in range(iterations):
+        dot = laplacian_operator.dot(vertices) - vertices
+        vertices += lamb * dot
+    return vertices
+
+
 def filter_humphrey(mesh,
                     alpha=0.1,
                     beta=0.5,
@@ -76,16 +98,33 @@ def filter_humphrey(mesh,
       If 1.0, full aggressiveness
     iterations : int
       Number of passes to run filter
-    laplacian_operator : None or scipy.sparse.coo.coo_matrix
+    laplacian_operator : None or scipy.sparse matrix
       Sparse matrix laplacian operator
-      Will be autogenerated if None
+      Will be mesh.laplacian_operator if None
     """
-    # if the laplacian operator was not passed create it here
+    # if the laplacian operator was not passed use the cached one
     if laplacian_operator is None:
-        laplacian_operator = laplacian_calculation(mesh)
+        laplacian_operator = mesh.laplacian_operator
+    # CSR is much faster for repeated products
+    laplacian_operator = laplacian_operator.tocsr()
 
     # get mesh vertices as vanilla numpy array
     vertices = mesh.vertices.copy().view(np.ndarray)
+    vertices = _humphrey_steps(vertices,
+                               laplacian_operator,
+                               alpha=alpha,
+                               beta=beta,
+                               iterations=iterations)
+
+    # assign modified vertices back to mesh
+    mesh.vertices = vertices
+    return mesh
+
+
+def _humphrey_steps(vertices, laplacian_operator, alpha, beta, iterations):
+    """
+    Run Humphrey filtering on (n, m) vertex columns.
+    """
     # save original unmodified vertices
     original = vertices.copy()
 
@@ -96,10 +135,7 @@ def filter_humphrey(mesh,
         vert_b = vertices - (alpha * original + (1.0 - alpha) * vert_q)
         vertices -= (beta * vert_b + (1.0 - beta) *
                      laplacian_operator.dot(vert_b))
-
-    # assign modified vertices back to mesh
-    mesh.vertices = vertices
-    return mesh
+    return vertices
 
 
 def filter_taubin(mesh,
@@ -126,17 +162,33 @@ def filter_taubin(mesh,
       Nu shall be between 0.0 < 1.0/lambda - 1.0/nu < 0.1
     iterations : int
       Number of passes to run the filter
-    laplacian_operator : None or scipy.sparse.coo.coo_matrix
+    laplacian_operator : None or scipy.sparse matrix
       Sparse matrix laplacian operator
-      Will be autogenerated if None
+      Will be mesh.laplacian_operator if None
     """
-    # if the laplacian operator was not passed create it here
+    # if the laplacian operator was not passed use the cached one
     if laplacian_operator is None:
-        laplacian_operator = laplacian_calculation(mesh)
+        laplacian_operator = mesh.laplacian_operator
+    # CSR is much faster for repeated products
+    laplacian_operator = laplacian_operator.tocsr()
 
     # get mesh vertices as vanilla numpy array
     vertices = mesh.vertices.copy().view(np.ndarray)
+    vertices = _taubin_steps(vertices,
+                             laplacian_operator,
+                             lamb=lamb,
+                             nu=nu,
+                             iterations=iterations)
+
+    # assign updated vertices back to mesh
+    mesh.vertices = vertices
+    return mesh
+
 
+def _taubin_steps(vertices, laplacian_operator, lamb, nu, iterations):
+    """
+    Run Taubin filtering on (n, m) vertex columns in place.
+    """
     # run through multiple passes of the filter
     for index in range(iterations):
         # do a sparse dot product on the vertices
@@ -146,13 +198,162 @@ def filter_taubin(mesh,
             vertices += lamb * dot
         else:
             vertices -= nu * dot
+    return vertices
 
-    # assign updated vertices back to mesh
+
+def filter_implicit(mesh,
+                    lamb=0.5,
+                    iterations=1,
+                    laplacian_operator=None):
+    """
+    Smooth a mesh in-place using implicit laplacian smoothing.
+
+    Every pass solves (I + lamb * (I - L)) v' = v for the new
+    vertices, which is stable for any value of lamb so large
+    steps can be taken. The factorization of the system is
+    kept for as long as the operator exists, so repeated calls
+    with the same operator only have to do back substitution.
+    The default mesh.laplacian_operator only depends on faces
+    and is kept when vertices are changed.
+
+    Articles
+    "Implicit Fairing of Irregular Meshes using Diffusion
+    and Curvature Flow"
+    M. Desbrun, M. Meyer, P. Schroder and A. Barr
+
+    Parameters
+    ------------
+    mesh : trimesh.Trimesh
+      Mesh to be smoothed in place
+    lamb : float
+      Diffusion time for each pass, may be larger than 1.0
+    iterations : int
+      Number of passes to run filter
+    laplacian_operator : None or scipy.sparse matrix
+      Sparse matrix laplacian operator which must not be
+      modified in place after it has been used here
+      Will be mesh.laplacian_operator if None
+    """
+    if laplacian_operator is None:
+        laplacian_operator = mesh.laplacian_operator
+
+    # get mesh vertices as vanilla numpy array
+    vertices = mesh.vertices.copy().view(np.ndarray)
+    vertices = _implicit_steps(vertices,
+                               laplacian_operator,
+                               lamb=lamb,
+                               iterations=iterations)
+
+    # assign modified vertices back to mesh
     mesh.vertices = vertices
     return mesh
 
 
-def laplacian_calculation(mesh, equal_weight=True):
+def _implicit_steps(vertices, laplacian_operator, lamb, iterations):
+    """
+    Run implicit smoothing on (n, m) vertex columns.
+    """
+    solve = _implicit_solver(laplacian_operator, lamb)
+    for _index in range(iterations):
+        vertices = solve(vertices)
+    return vertices
+
+
+def _implicit_solver(laplacian_operator, lamb):
+    """
+    Get a cached solver for an implicit smoothing step.
+
+    Parameters
+    ------------
+    laplacian_operator : scipy.sparse matrix
+      Sparse matrix laplacian operator
+    lamb : float
+      Diffusion time
+
+    Returns
+    ------------
+    solve : function
+      Solves the system for an (n, m) right hand side
+    """
+    key = (id(laplacian_operator), float(lamb))
+    if key not in _factors:
+        count = laplacian_operator.shape[0]
+        system = ((1.0 + lamb) * identity(count) -
+                  lamb * laplacian_operator).tocsc()
+        # remove the factorization when the operator is deleted
+        # so a new operator can't reuse its id, keeping the
+        # weak reference alive alongside the factorization
+        _factors[key] = (splu(system).solve,
+                         weakref.ref(laplacian_operator,
+                                     lambda ref: _factors.pop(key, None)))
+    return _factors[key][0]
+
+
+def filter_stack(vertices,
+                 faces=None,
+                 method='taubin',
+                 laplacian_operator=None,
+                 **kwargs):
+    """
+    Smooth a stack of vertex positions which share the same
+    faces, such as animation frames or registered scans.
+
+    Every frame is smoothed with a single sparse product per
+    pass by treating the stack as (n, 3 * k) columns, so the
+    operator and the loop are shared by the whole stack.
+
+    Parameters
+    ------------
+    vertices : (k, n, 3) float
+      Vertex positions of k meshes
+    faces : None or (m, 3) int
+      Faces shared by every mesh
+      Only used to create the operator if it isn't passed
+    method : str
+      Which filter to run:
+        'laplacian', 'humphrey', 'taubin' or 'implicit'
+    laplacian_operator : None or scipy.sparse matrix
+      Sparse matrix laplacian operator
+      Will be created with equal weights from faces if None
+    **kwargs : dict
+      Passed to the filter, i.e. `lamb` or `iterations`
+
+    Returns
+    ------------
+    smoothed : (k, n, 3) float
+      Smoothed vertex positions
+    """
+    vertices = np.array(vertices, dtype=np.float64)
+    if vertices.ndim != 3:
+        raise ValueError('vertices must be (k, n, 3)!')
+    shape = vertices.shape
+
+    if method not in _stack_filters:
+        raise ValueError('method must be one of: {}'.format(
+            ', '.join(sorted(_stack_filters))))
+    function, defaults = _stack_filters[method]
+    defaults = defaults.copy()
+    defaults.update(kwargs)
+
+    if laplacian_operator is None:
+        if faces is None:
+            raise ValueError('faces or laplacian_operator required!')
+        edges = np.sort(geometry.faces_to_edges(faces), axis=1)
+        edges = edges[grouping.unique_rows(edges)[0]]
+        laplacian_operator = edges_to_laplacian(edges=edges,
+                                                count=shape[1])
+    if method != 'implicit':
+        laplacian_operator = laplacian_operator.tocsr()
+
+    # (k, n, 3) to (n, 3 * k) so rows are vertices
+    columns = vertices.transpose((1, 0, 2)).reshape((shape[1], -1))
+    columns = function(columns, laplacian_operator, **defaults)
+    smoothed = columns.reshape((shape[1], shape[0], -1)).transpose(
+        (1, 0, 2))
+    return np.ascontiguousarray(smoothed)
+
+
+def laplacian_calculation(mesh, equal_weight=True, cotangent=False):
     """
     Calculate a sparse matrix for laplacian operations.
 
@@ -163,38 +364,117 @@ def laplacian_calculation(mesh, equal_weight=True):
     equal_weight : bool
       If True, all neighbors will be considered equally
       If False, all neightbors will be weighted by inverse distance
+    cotangent : bool
+      If True, neighbors will be weighted by the cotangents of
+      the angles opposite their edge, clipped to be non-negative
 
     Returns
     ----------
-    laplacian : scipy.sparse.coo.coo_matrix
+    laplacian : scipy.sparse.csr_matrix
       Laplacian operator
     """
-    # get the vertex neighbors from the cache
-    neighbors = mesh.vertex_neighbors
-    # avoid hitting crc checks in loops
-    vertices = mesh.vertices.view(np.ndarray)
-
-    # stack neighbors to 1D arrays
-    col = np.concatenate(neighbors)
-    row = np.concatenate([[i] * len(n)
-                          for i, n in enumerate(neighbors)])
-
-    if equal_weight:
-        # equal weights for each neighbor
-        data = np.concatenate([[1.0 / len(n)] * len(n)
-                               for n in neighbors])
+    if cotangent:
+        weights = _cotangent_weights(mesh)
+    elif equal_weight:
+        # only depends on topology so it's cached on the mesh
+        # copy so changes by the caller can't corrupt the cache
+        return mesh.laplacian_operator.copy()
     else:
         # umbrella weights, distance-weighted
-        # use dot product of ones to replace array.sum(axis=1)
-        ones = np.ones(3)
-        # the distance from verticesex to neighbors
-        norms = [1.0 / np.sqrt(np.dot((vertices[i] - vertices[n]) ** 2, ones))
-                 for i, n in enumerate(neighbors)]
-        # normalize group and stack into single array
-        data = np.concatenate([i / i.sum() for i in norms])
-
-    # create the sparse matrix
-    matrix = coo_matrix((data, (row, col)),
-                        shape=[len(vertices)] * 2)
+        vertices = mesh.vertices.view(np.ndarray)
+        edges = mesh.edges_unique
+        weights = 1.0 / np.linalg.norm(vertices[edges[:, 0]] -
+                                       vertices[edges[:, 1]], axis=1)
+
+    return edges_to_laplacian(edges=mesh.edges_unique,
+                              count=len(mesh.vertices),
+                              weights=weights)
+
+
+def edges_to_laplacian(edges, count, weights=None):
+    """
+    Create a laplacian operator from unique edges, which
+    replaces every vertex with the weighted average of its
+    neighbors.
+
+    Parameters
+    -------------
+    edges : (n, 2) int
+      Unique edges between vertices
+    count : int
+      Number of vertices
+    weights : None or (n,) float
+      Weight of each edge, equal if None
 
+    Returns
+    ----------
+    laplacian : (count, count) scipy.sparse.csr_matrix
+      Laplacian operator with rows summing to one
+    """
+    edges = np.asanyarray(edges, dtype=np.int64).reshape((-1, 2))
+    if weights is None:
+        weights = np.ones(len(edges))
+    weights = np.tile(np.asanyarray(weights, dtype=np.float64), 2)
+
+    # every edge is a neighbor of both of its vertices
+    row = np.concatenate((edges[:, 0], edges[:, 1]))
+    col = np.concatenate((edges[:, 1], edges[:, 0]))
+
+    # vertices whose weights are all zero use equal weights
+    total = np.bincount(row, weights=weights, minlength=count)
+    zero = total[row] <= 0.0
+    if zero.any():
+        weights[zero] = 1.0
+        total = np.bincount(row, weights=weights, minlength=count)
+
+    matrix = coo_matrix((weights / total[row], (row, col)),
+                        shape=(count, count)).tocsr()
     return matrix
+
+
+def _cotangent_weights(mesh):
+    """
+    Find the sum of the cotangents of the angles opposite
+    every unique edge of a mesh.
+
+    Parameters
+    -------------
+    mesh : trimesh.Trimesh
+      Input geometry
+
+    Returns
+    ----------
+    weights : (len(mesh.edges_unique),) float
+      Cotangent weights, clipped to be non-negative
+    """
+    triangles = mesh.triangles
+    # edges of each face are in the same order as mesh.edges
+    # and the angle opposite edge (0, 1) is at vertex 2
+    opposite = triangles[:, [2, 0, 1]]
+    a = triangles - opposite
+    b = triangles[:, [1, 2, 0]] - opposite
+    # cot = cos / sin = dot / |cross|
+    dot = (a * b).sum(axis=2)
+    cross = np.linalg.norm(np.cross(a, b), axis=2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cot = dot / cross
+    cot[~np.isfinite(cot)] = 0.0
+
+    weights = np.bincount(mesh.edges_unique_inverse,
+                          weights=cot.ravel(),
+                          minlength=len(mesh.edges_unique)) / 2.0
+    return np.clip(weights, 0.0, None)
+
+
+# functions for `filter_stack` and their default arguments
+_stack_filters = {
+    'laplacian': (_laplacian_steps, {'lamb': 0.5,
+                                     'iterations': 10}),
+    'humphrey': (_humphrey_steps, {'alpha': 0.1,
+                                   'beta': 0.5,
+                                   'iterations': 10}),
+    'taubin': (_taubin_steps, {'lamb': 0.5,
+                               'nu': 0.5,
+                               'iterations': 10}),
+    'implicit': (_implicit_steps, {'lamb': 0.5,
+                                   'iterations': 1})}
@@ -967,16 +967,17 @@ def append_faces(vertices_seq, faces_seq):
     # how much each group of faces needs to be offset
     face_offset = np.append(0, np.cumsum(vertices_len)[:-1])
 
-    new_faces = []
-    for offset, faces in zip(face_offset, faces_seq):
-        if len(faces) == 0:
-            continue
-        # apply the index offset
-        new_faces.append(faces + offset)
+    # the length of each face array
+    faces_len = np.array([len(i) for i in faces_seq])
+
     # stack to clean (n, 3) float
     vertices = vstack_empty(vertices_seq)
     # stack to clean (n, 3) int
-    faces = vstack_empty(new_faces)
+    faces = vstack_empty(faces_seq)
+    if len(faces) > 0:
+        # apply the index offset to every face at once
+        faces = faces + np.repeat(
+            face_offset, faces_len).reshape((-1, 1))
 
     return vertices, faces
 
@@ -1252,19 +1253,28 @@ def concatenate(a, b=None):
     ----------
     result: Trimesh object containing concatenated mesh
     """
-    if b is None:
-        b = []
     # stack meshes into flat list
-    meshes = np.append(a, b)
+    meshes = []
+    for value in (a, b):
+        if value is None:
+            continue
+        elif is_sequence(value):
+            meshes.extend(value)
+        else:
+            meshes.append(value)
 
     # extract the trimesh type to avoid a circular import
     # and assert that both inputs are Trimesh objects
     trimesh_type = type_named(meshes[0], 'Trimesh')
 
-    # append faces and vertices of meshes
+    # append faces and vertices of meshes with offsets
+    # from a cumulative sum rather than one mesh at a time
     vertices, faces = append_faces(
-        [m.vertices.copy() for m in meshes],
-        [m.faces.copy() for m in meshes])
+        [m.vertices for m in meshes],
+        [m.faces for m in meshes])
+    if any(vertices is m.vertices for m in meshes):
+        # a single mesh was passed so copy to avoid mutating it
+        vertices = vertices.copy()
 
     # only save face normals if already calculated
     face_normals = None
@@ -1986,3 +1996,56 @@ def isclose(a, b, atol):
     diff = a - b
     close = np.logical_and(diff > -atol, diff < atol)
     return close
+
+
+class LazyModule(object):
+    """
+    A stand-in for a module which is only imported the
+    first time one of its attributes is accessed, so that
+    modules and the optional dependencies they pull in
+    don't slow down `import trimesh`.
+    """
+
+    def __init__(self, name, package=None):
+        """
+        Parameters
+        ------------
+        name : str
+          Name of module, i.e. '.ray' or 'trimesh.ray'
+        package : str or None
+          Package to resolve a relative name against
+        """
+        self.__dict__['_name'] = name
+        self.__dict__['_package'] = package
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        """
+        Import the module if it hasn't been already.
+
+        Returns
+        ----------
+        module : module
+          The imported module
+        """
+        module = self.__dict__['_module']
+        if module is None:
+            import importlib
+            module = importlib.import_module(
+                self._name, self._package)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, key):
+        return getattr(self._load(), key)
+
+    def __setattr__(self, key, value):
+        setattr(self._load(), key, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self.__dict__['_module'] is None:
+            return '<lazy module {}>'.format(self._name)
+        return repr(self._module)
@@ -6,7 +6,6 @@ Deal with objects which hold visual properties, like
 ColorVisuals and TextureVisuals.
 """
 import numpy as np
-import collections
 
 from .color import ColorVisuals
 
@@ -57,13 +56,9 @@ def concatenate(visuals, *args):
         # arbitrarily get one of them
         mode = modes.pop()
 
-    # a linked list to store colors before stacking
-    colors = collections.deque()
-    # a string to evaluate which returns the colors we want
-    append = 'v.{}_colors'.format(mode)
-    for v in visuals:
-        # use an eval so we can use the object property
-        colors.append(eval(append))
-    # use an eval so we can use the constructor
-    concat = eval('ColorVisuals({}_colors=np.vstack(colors))'.format(mode))
+    # the property which returns the colors we want
+    attribute = '{}_colors'.format(mode)
+    # stack the colors of every visual in one pass
+    colors = np.vstack([getattr(v, attribute) for v in visuals])
+    concat = ColorVisuals(**{attribute: colors})
     return concat
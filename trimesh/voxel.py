@@ -11,7 +11,7 @@ from . import remesh
 from . import caching
 from . import grouping
 
-from .constants import log, log_time
+from .constants import log, log_time, tol
 
 
 class VoxelBase(object):
@@ -199,6 +199,8 @@ class VoxelMesh(VoxelBase):
         pitch:     float, how long should each edge of the voxel be
         size_max:  float, maximum size (in mb) of a data structure that
                           may be created before raising an exception
+        method:    str, how to find surface cells:
+                        'subdivide', 'triangle' or 'ray'
         """
         super(VoxelMesh, self).__init__()
 
@@ -216,7 +218,7 @@ class VoxelMesh(VoxelBase):
         ---------
         matrix: self.shape np.bool, if a cell is True it is occupied
         """
-        matrix = sparse_to_matrix(self.sparse_surface)
+        matrix = self.runs_surface.to_matrix()
         return matrix
 
     @caching.cache_decorator
@@ -228,7 +230,7 @@ class VoxelMesh(VoxelBase):
         ---------
         matrix: self.shape np.bool, if a cell is True it is occupied
         """
-        matrix = sparse_to_matrix(self.sparse_solid)
+        matrix = self.runs_solid.to_matrix()
         return matrix
 
     @property
@@ -248,6 +250,110 @@ class VoxelMesh(VoxelBase):
             return self.matrix_solid
         return self.matrix_surface
 
+    @property
+    def runs(self):
+        """
+        Runs of filled cells, for the solid if the source mesh
+        is watertight and the surface otherwise, like `matrix`.
+
+        Returns
+        ---------
+        runs: VoxelRuns, filled cells
+        """
+        if self._data['mesh'].is_watertight:
+            return self.runs_solid
+        return self.runs_surface
+
+    @caching.cache_decorator
+    def runs_surface(self):
+        """
+        Filled cells on the surface of the mesh as runs.
+
+        Returns
+        ---------
+        runs: VoxelRuns, filled cells on mesh surface
+        """
+        return VoxelRuns.from_sparse(self.sparse_surface)
+
+    @caching.cache_decorator
+    def runs_solid(self):
+        """
+        Filled cells inside and on the surface of mesh as runs.
+
+        Returns
+        ---------
+        runs: VoxelRuns, filled cells in or on mesh
+        """
+        return fill_runs(self.runs_surface)
+
+    @property
+    def shape(self):
+        """
+        The shape of the matrix for the current voxel object.
+
+        Returns
+        ---------
+        shape: (3,) int, what is the shape of the 3D matrix
+                         for these voxels
+        """
+        return self.runs.shape
+
+    @caching.cache_decorator
+    def filled_count(self):
+        """
+        Return the number of voxels that are occupied.
+
+        Returns
+        --------
+        filled: int, number of voxels that are occupied
+        """
+        return self.runs.filled_count
+
+    @caching.cache_decorator
+    def points(self):
+        """
+        The center of each filled cell as a list of points.
+
+        Returns
+        ----------
+        points: (self.filled, 3) float, list of points
+        """
+        points = indices_to_points(indices=self.runs.sparse,
+                                   pitch=self.pitch,
+                                   origin=self.origin)
+        return points
+
+    @caching.cache_decorator
+    def marching_cubes(self):
+        """
+        A marching cubes Trimesh representation of the voxels,
+        meshed in slabs so a dense matrix is never created.
+
+        Returns
+        ---------
+        meshed: Trimesh object representing the current voxel
+                        object, as returned by marching cubes algorithm.
+        """
+        meshed = matrix_to_marching_cubes(matrix=self.runs,
+                                          pitch=self.pitch,
+                                          origin=self.origin)
+        return meshed
+
+    def is_filled(self, point):
+        """
+        Query a point to see if the voxel cell it lies in is filled or not.
+
+        Parameters
+        ----------
+        point: (3,) float, point in space
+
+        Returns
+        ---------
+        is_filled: bool, is cell occupied or not
+        """
+        index = self.point_to_index(point)
+        return bool(self.runs.contains([index])[0])
+
     @property
     def origin(self):
         """
@@ -273,6 +379,8 @@ class VoxelMesh(VoxelBase):
             func = voxelize_ray
         elif self._method == 'subdivide':
             func = voxelize_subdivide
+        elif self._method == 'triangle':
+            func = voxelize_triangles
         else:
             raise ValueError('voxelization method incorrect')
 
@@ -293,7 +401,7 @@ class VoxelMesh(VoxelBase):
         ----------------
         filled: (n, 3) int, filled cells in or on mesh.
         """
-        filled = fill_voxelization(self.sparse_surface)
+        filled = self.runs_solid.sparse
         return filled
 
     def as_boxes(self, solid=False):
@@ -328,6 +436,311 @@ class VoxelMesh(VoxelBase):
         self.as_boxes(solid=solid).show()
 
 
+class VoxelRuns(object):
+    """
+    Filled voxel cells stored as runs along the last axis.
+
+    Every run is a column (i, j) and a half- open interval
+    [start, stop) of filled cells along k, so memory scales
+    with the number of columns crossing the surface rather
+    than with the volume of the bounding box. Runs are read-
+    only once created so lookups can reuse their search keys.
+    """
+
+    def __init__(self, runs):
+        """
+        Create runs of filled cells.
+
+        Parameters
+        ------------
+        runs : (n, 4) int
+          (i, j, start, stop) of each run in any order,
+          overlapping or adjacent runs will be merged
+        """
+        self.runs = _merge_runs(runs)
+        # runs are immutable so keep values every query needs
+        self.runs.flags.writeable = False
+
+        if len(self.runs) == 0:
+            self._shape = (0, 0, 0)
+        else:
+            self._shape = tuple(int(i) for i in np.append(
+                self.runs[:, :2].max(axis=0) + 1,
+                self.runs[:, 3].max()))
+        # runs are sorted by column then start so a single key
+        # can be searched for the last run starting before a cell
+        self._column = (self.runs[:, 0] * self._shape[1] +
+                        self.runs[:, 1])
+        self._keys = self._column * (self._shape[2] + 1) + self.runs[:, 2]
+
+    @classmethod
+    def from_sparse(cls, sparse):
+        """
+        Create runs from the indices of filled cells.
+
+        Parameters
+        ------------
+        sparse : (n, 3) int
+          Index of filled cells
+
+        Returns
+        ------------
+        runs : VoxelRuns
+          Filled cells as runs
+        """
+        sparse = np.asanyarray(sparse, dtype=np.int64)
+        if len(sparse) == 0:
+            return cls(np.zeros((0, 4), dtype=np.int64))
+        if not util.is_shape(sparse, (-1, 3)):
+            raise ValueError('sparse must be (n,3)!')
+        # every cell is a run of length one to be merged
+        return cls(np.column_stack((sparse, sparse[:, 2] + 1)))
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Create runs from a dense matrix.
+
+        Parameters
+        ------------
+        matrix : (m, o, p) bool
+          Filled cells
+
+        Returns
+        ------------
+        runs : VoxelRuns
+          Filled cells as runs
+        """
+        matrix = np.asanyarray(matrix, dtype=bool)
+        if matrix.ndim != 3:
+            raise ValueError('matrix must be 3D!')
+        # pad along the last axis so every run has an end
+        padded = np.zeros(matrix.shape[:2] + (matrix.shape[2] + 2,),
+                          dtype=np.int8)
+        padded[:, :, 1:-1] = matrix
+        i, j, k = np.nonzero(np.diff(padded, axis=2))
+        # transitions alternate between a start and a stop
+        return cls(np.column_stack((i[::2], j[::2], k[::2], k[1::2])))
+
+    @property
+    def shape(self):
+        """
+        The shape of a dense matrix containing every filled cell.
+
+        Returns
+        ------------
+        shape : (3,) int
+          Maximum index of each axis plus one
+        """
+        return self._shape
+
+    @property
+    def filled_count(self):
+        """
+        Number of filled cells.
+
+        Returns
+        ------------
+        count : int
+          Total length of every run
+        """
+        return int((self.runs[:, 3] - self.runs[:, 2]).sum())
+
+    @property
+    def sparse(self):
+        """
+        Index of every filled cell.
+
+        Returns
+        ------------
+        sparse : (filled_count, 3) int
+          Index of filled cells sorted by (i, j, k)
+        """
+        lengths = self.runs[:, 3] - self.runs[:, 2]
+        # position of every cell within its run
+        offset = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+        return np.column_stack((
+            np.repeat(self.runs[:, :2], lengths, axis=0),
+            np.repeat(self.runs[:, 2], lengths) + offset))
+
+    def to_matrix(self, start=0, stop=None):
+        """
+        Convert rows of the runs into a dense matrix.
+
+        Parameters
+        ------------
+        start : int
+          First index along the first axis
+        stop : None or int
+          Index along the first axis to stop before,
+          None for every row
+
+        Returns
+        ------------
+        matrix : (stop - start, m, n) bool
+          Filled cells
+        """
+        shape = self.shape
+        if stop is None:
+            stop = shape[0]
+        # runs are sorted so rows are a contiguous block
+        lo, hi = np.searchsorted(self.runs[:, 0], [start, stop])
+        runs = self.runs[lo:hi]
+        # mark the start and stop of every run and fill between
+        edges = np.zeros((stop - start,
+                          shape[1],
+                          shape[2] + 1), dtype=np.int8)
+        np.add.at(edges, (runs[:, 0] - start, runs[:, 1], runs[:, 2]), 1)
+        np.add.at(edges, (runs[:, 0] - start, runs[:, 1], runs[:, 3]), -1)
+        matrix = np.cumsum(edges, axis=2, dtype=np.int8)[:, :, :-1] > 0
+        return matrix
+
+    def contains(self, indices):
+        """
+        Check whether cells are filled.
+
+        Parameters
+        ------------
+        indices : (n, 3) int
+          Index of cells
+
+        Returns
+        ------------
+        filled : (n,) bool
+          Whether each cell is filled
+        """
+        indices = np.asanyarray(indices, dtype=np.int64).reshape((-1, 3))
+        filled = np.zeros(len(indices), dtype=bool)
+        if len(self.runs) == 0:
+            return filled
+
+        shape = self.shape
+        # cells outside the bounds can't be filled
+        inside = ((indices >= 0) & (indices < shape)).all(axis=1)
+        query = indices[inside]
+
+        query_column = query[:, 0] * shape[1] + query[:, 1]
+        index = np.searchsorted(
+            self._keys, query_column * (shape[2] + 1) + query[:, 2],
+            side='right') - 1
+        valid = index >= 0
+        index[~valid] = 0
+
+        filled[inside] = (valid &
+                          (self._column[index] == query_column) &
+                          (query[:, 2] < self.runs[index, 3]))
+        return filled
+
+    def boolean(self, other, operation=np.logical_and):
+        """
+        Apply a boolean operation between two sets of runs.
+
+        Parameters
+        ------------
+        other : VoxelRuns
+          Runs in the same index space
+        operation : function
+          Elementwise function of two bool arrays, ie:
+            np.logical_and
+            np.logical_or
+            np.logical_xor
+
+        Returns
+        ------------
+        result : VoxelRuns
+          Cells where operation is True
+        """
+        # evaluate the operation for every combination of inputs
+        table = np.asanyarray(operation(
+            np.array([False, False, True, True]),
+            np.array([False, True, False, True])), dtype=bool)
+        if table[0]:
+            raise ValueError('operation is True for empty cells!')
+
+        runs = [self.runs, other.runs]
+        if sum(len(r) for r in runs) == 0:
+            return VoxelRuns(np.zeros((0, 4), dtype=np.int64))
+        width = max(r[:, 1].max() for r in runs if len(r) > 0) + 1
+
+        # an event at the start and stop of every run which
+        # changes the coverage of the operand it came from
+        column = np.concatenate([np.tile(r[:, 0] * width + r[:, 1], 2)
+                                 for r in runs])
+        position = np.concatenate([r[:, 2:].T.ravel() for r in runs])
+        change = np.concatenate([np.repeat([1, -1], len(r))
+                                 for r in runs])
+        operand = np.repeat([0, 1], [len(r) * 2 for r in runs])
+
+        order = np.lexsort((position, column))
+        column, position = column[order], position[order]
+        # coverage of each operand after every event, which
+        # returns to zero at the end of every column
+        coverage = np.zeros((len(order), 2), dtype=np.int64)
+        coverage[np.arange(len(order)), operand[order]] = change[order]
+        coverage = np.cumsum(coverage, axis=0) > 0
+
+        # the state after the last event at each position holds
+        # until the next position in the same column
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = ((column[1:] != column[:-1]) |
+                     (position[1:] != position[:-1]))
+        column = column[last]
+        position = position[last]
+        coverage = coverage[last]
+        # the state after the last event in every column is empty
+        # and never filled, so the next position is in the column
+        filled = table[coverage[:, 0] * 2 + coverage[:, 1]]
+
+        index = np.nonzero(filled)[0]
+        return VoxelRuns(np.column_stack((
+            column[index] // width,
+            column[index] % width,
+            position[index],
+            position[index + 1])))
+
+
+def _merge_runs(runs):
+    """
+    Sort runs and merge any which overlap or touch.
+
+    Parameters
+    ------------
+    runs : (n, 4) int
+      (i, j, start, stop) of each run
+
+    Returns
+    ------------
+    merged : (m, 4) int
+      Sorted runs which don't touch
+    """
+    runs = np.asanyarray(runs, dtype=np.int64).reshape((-1, 4))
+    # remove empty runs
+    runs = runs[runs[:, 3] > runs[:, 2]]
+    if len(runs) == 0:
+        return runs
+    runs = runs[np.lexsort((runs[:, 2], runs[:, 1], runs[:, 0]))]
+
+    # offset positions by column so the running maximum
+    # of stops never carries over from a previous column
+    new_column = np.ones(len(runs), dtype=bool)
+    new_column[1:] = (runs[1:, :2] != runs[:-1, :2]).any(axis=1)
+    span = runs[:, 3].max() - runs[:, 2].min() + 2
+    offset = (np.cumsum(new_column) - 1) * span
+    reach = np.maximum.accumulate(runs[:, 3] + offset)
+
+    # a run starts a group if it begins after every earlier
+    # run in the same column has stopped
+    group = np.ones(len(runs), dtype=bool)
+    group[1:] = (runs[1:, 2] + offset[1:]) > reach[:-1]
+    group[new_column] = True
+    group = np.nonzero(group)[0]
+
+    merged = runs[group]
+    merged[:, 3] = np.maximum.reduceat(runs[:, 3], group)
+    return merged
+
+
 @log_time
 def voxelize_subdivide(mesh,
                        pitch,
@@ -386,6 +799,176 @@ def voxelize_subdivide(mesh,
     return voxels_sparse, origin_position
 
 
+@log_time
+def voxelize_triangles(mesh, pitch, batch=2**18, **kwargs):
+    """
+    Voxelize a surface by finding every cell which overlaps a
+    triangle, without subdividing the mesh.
+
+    Candidate cells are found in the plane of the two axes
+    the triangle is least aligned with, where each column can
+    only cross a few cells along the third axis, so the number
+    of candidates is proportional to the number of filled cells.
+    Candidates are then checked with a separating axis test.
+
+    Parameters
+    -----------
+    mesh:  Trimesh object
+    pitch: float, side length of a single voxel cube
+    batch: int, approximate number of candidate columns
+                to check at once
+
+    Returns
+    -----------
+    voxels_sparse:   (n,3) int, (m,n,p) indexes of filled cells
+    origin_position: (3,) float, position of the voxel
+                                 grid origin in space
+    """
+    # triangles in units of cells, where cell centers are integers
+    triangles = mesh.triangles / float(pitch)
+    if len(triangles) == 0:
+        return np.zeros((0, 3), dtype=np.int64), np.zeros(3)
+
+    # move the axis the normal is most aligned with to the end
+    normals = np.cross(triangles[:, 1] - triangles[:, 0],
+                       triangles[:, 2] - triangles[:, 0])
+    permutations = np.array([[1, 2, 0], [0, 2, 1], [0, 1, 2]])
+    permutation = permutations[np.abs(normals).argmax(axis=1)]
+    index = np.arange(len(triangles))
+    triangles = triangles[index[:, None, None],
+                          np.arange(3)[None, :, None],
+                          permutation[:, None, :]]
+    normals = normals[index[:, None], permutation]
+
+    # range of cells each triangle covers in the first two axes
+    # widened slightly so cells touching a triangle are included
+    lower = np.floor(triangles.min(axis=1) + 0.5 - tol.zero).astype(np.int64)
+    upper = np.floor(triangles.max(axis=1) + 0.5 + tol.zero).astype(np.int64)
+    count = np.prod(upper[:, :2] - lower[:, :2] + 1, axis=1)
+
+    # split triangles into batches of candidate columns
+    split = np.nonzero(np.diff(np.cumsum(count) // batch))[0] + 1
+    voxels = []
+    for chunk in np.array_split(index, split):
+        if len(chunk) == 0:
+            continue
+        cells, owner = _triangle_cells(triangles[chunk],
+                                       normals[chunk],
+                                       lower[chunk],
+                                       upper[chunk],
+                                       count[chunk])
+        # undo the permutation of axes for each cell
+        hit = np.zeros_like(cells)
+        hit[np.arange(len(cells))[:, None],
+            permutation[chunk][owner]] = cells
+        voxels.append(hit[grouping.unique_rows(hit)[0]])
+
+    occupied_index = np.vstack(voxels)
+    occupied_index = occupied_index[grouping.unique_rows(occupied_index)[0]]
+
+    origin_index = occupied_index.min(axis=0)
+    origin_position = origin_index * pitch
+
+    voxels_sparse = (occupied_index - origin_index)
+
+    return voxels_sparse, origin_position
+
+
+def _triangle_cells(triangles, normals, lower, upper, count):
+    """
+    Find cells which overlap triangles whose normals are most
+    aligned with the last axis.
+
+    Parameters
+    -----------
+    triangles: (n, 3, 3) float, triangles in units of cells
+    normals:   (n, 3) float, unnormalized triangle normals
+    lower:     (n, 3) int, lowest cell touched by each triangle
+    upper:     (n, 3) int, highest cell touched by each triangle
+    count:     (n,) int, number of columns in the first two axes
+
+    Returns
+    -----------
+    cells: (m, 3) int, cells overlapping a triangle
+    owner: (m,) int, index of the triangle for each cell
+    """
+    # every column in the first two axes for every triangle
+    owner = np.repeat(np.arange(len(triangles)), count)
+    local = np.arange(len(owner)) - np.repeat(np.cumsum(count) - count,
+                                              count)
+    width = (upper[:, 1] - lower[:, 1] + 1)[owner]
+    columns = lower[owner, :2] + np.column_stack((local // width,
+                                                  local % width))
+
+    # the height of the plane over the square of each column
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = -normals[:, :2] / normals[:, 2:]
+        spread = 0.5 * np.abs(slope).sum(axis=1)
+    center = triangles[owner, 0, 2] + (
+        slope[owner] * (columns - triangles[owner, 0, :2])).sum(axis=1)
+    low = center - spread[owner] - tol.zero
+    high = center + spread[owner] + tol.zero
+    # degenerate triangles check every cell of their bounds
+    flat = ~np.isfinite(low) | ~np.isfinite(high)
+    low[flat] = -np.inf
+    high[flat] = np.inf
+    low = np.maximum(np.floor(low + 0.5), lower[owner, 2]).astype(np.int64)
+    high = np.minimum(np.floor(high + 0.5), upper[owner, 2]).astype(np.int64)
+
+    # every cell along the last axis of each column
+    depth = np.maximum(high - low + 1, 0)
+    column = np.repeat(np.arange(len(owner)), depth)
+    offset = np.arange(len(column)) - np.repeat(np.cumsum(depth) - depth,
+                                                depth)
+    cells = np.column_stack((columns[column], low[column] + offset))
+    owner = owner[column]
+
+    overlap = _triangle_box_overlap(triangles[owner] - cells[:, None, :],
+                                    normals[owner])
+    return cells[overlap], owner[overlap]
+
+
+def _triangle_box_overlap(triangles, normals, half=0.5):
+    """
+    Check whether triangles overlap a cube at the origin using
+    the separating axis theorem, counting contact as overlap.
+
+    Parameters
+    -----------
+    triangles: (n, 3, 3) float, triangles relative to cube center
+    normals:   (n, 3) float, unnormalized triangle normals
+    half:      float, half the side length of the cube
+
+    Returns
+    -----------
+    overlap: (n,) bool, whether each triangle overlaps the cube
+    """
+    # the axes of the cube
+    overlap = ((triangles.min(axis=1) <= half) &
+               (triangles.max(axis=1) >= -half)).all(axis=1)
+
+    # the normal of the triangle
+    radius = half * np.abs(normals).sum(axis=1)
+    overlap &= np.abs((normals * triangles[:, 0]).sum(axis=1)) <= radius
+
+    # the cross product of each edge and each cube axis, where
+    # both ends of an edge have the same projection so only it
+    # and the opposite vertex need to be checked
+    edges = triangles[:, [1, 2, 0]] - triangles
+    opposite = triangles[:, [2, 0, 1]]
+    for a, b in [(1, 2), (2, 0), (0, 1)]:
+        # axis is (edge[b], -edge[a]) in the (a, b) plane
+        radius = half * (np.abs(edges[:, :, a]) + np.abs(edges[:, :, b]))
+        start = (edges[:, :, b] * triangles[:, :, a] -
+                 edges[:, :, a] * triangles[:, :, b])
+        end = (edges[:, :, b] * opposite[:, :, a] -
+               edges[:, :, a] * opposite[:, :, b])
+        overlap &= ((np.minimum(start, end) <= radius) &
+                    (np.maximum(start, end) >= -radius)).all(axis=1)
+
+    return overlap
+
+
 def local_voxelize(mesh, point, pitch, radius, fill=True, **kwargs):
     """
     Voxelize a mesh in the region of a cube around a point. When fill=True,
@@ -535,13 +1118,15 @@ def voxelize_ray(mesh,
     return voxels, origin
 
 
-def fill_voxelization(occupied):
+def fill_voxelization(occupied, cross_check=False):
     """
     Given a sparse surface voxelization, fill in between columns.
 
     Parameters
     --------------
     occupied: (n, 3) int, location of filled cells
+    cross_check: bool, if True fill columns with an odd number
+                 of surface crossings along a second axis
 
     Returns
     --------------
@@ -552,54 +1137,89 @@ def fill_voxelization(occupied):
     if not util.is_shape(occupied, (-1, 3)):
         raise ValueError('incorrect shape')
 
-    # create grid and mark inner voxels
-    max_value = occupied.max() + 3
-
-    grid = np.zeros((max_value,
-                     max_value,
-                     max_value),
-                    dtype=np.int64)
-    voxels_sparse = np.add(occupied, 1)
-
-    grid.__setitem__(tuple(voxels_sparse.T), 1)
-
-    for i in range(max_value):
-        check_dir2 = False
-        for j in range(0, max_value - 1):
-            idx = []
-            # find transitions first
-            # transition positions are from 0 to 1 and from 1 to 0
-            eq = np.equal(grid[i, j, :-1], grid[i, j, 1:])
-            idx = np.where(np.logical_not(eq))[0] + 1
-            c = len(idx)
-            check_dir2 = (c % 4) > 0 and c > 4
-            if c < 4:
-                continue
-            for s in range(0, c - c % 4, 4):
-                grid[i, j, idx[s]:idx[s + 3]] = 1
-        if not check_dir2:
-            continue
+    filled = fill_runs(VoxelRuns.from_sparse(occupied),
+                       cross_check=cross_check).sparse
+    return filled
 
-        # check another direction for robustness
-        for k in range(0, max_value - 1):
-            idx = []
-            # find transitions first
-            eq = np.equal(grid[i, :-1, k], grid[i, 1:, k])
-            idx = np.where(np.logical_not(eq))[0] + 1
-            c = len(idx)
-            if c < 4:
-                continue
-            for s in range(0, c - c % 4, 4):
-                grid[i, idx[s]:idx[s + 3], k] = 1
-
-    # generate new voxels
-    idx = np.where(grid == 1)
-    filled = np.array([[idx[0][i] - 1,
-                        idx[1][i] - 1,
-                        idx[2][i] - 1]
-                       for i in range(len(idx[0]))])
 
-    return filled
+def fill_runs(runs, cross_check=False):
+    """
+    Fill the inside of a surface voxelization stored as runs.
+
+    Every column along the last axis enters the solid at an
+    even numbered run of surface cells and leaves it at the
+    following run, so the parity of each run is found from a
+    cumulative sum of the transitions between columns and no
+    dense grid is created.
+
+    Parameters
+    --------------
+    runs : VoxelRuns
+      Filled cells on a closed surface
+    cross_check : bool
+      If True columns with an odd number of surface runs,
+      where the parity is ambiguous, are filled along the
+      middle axis instead
+
+    Returns
+    --------------
+    filled : VoxelRuns
+      Filled cells in or on the surface
+    """
+    filled, ambiguous = _fill_columns(runs.runs)
+    if not cross_check or len(ambiguous) == 0:
+        return VoxelRuns(filled)
+
+    # swap the last two axes and fill the other direction
+    swap = VoxelRuns.from_sparse(runs.sparse[:, [0, 2, 1]])
+    other = VoxelRuns(_fill_columns(swap.runs)[0]).sparse[:, [0, 2, 1]]
+
+    # only use the other direction for ambiguous columns
+    width = max(filled[:, 1].max(), other[:, 1].max()) + 1
+    mask = np.in1d(other[:, 0] * width + other[:, 1],
+                   ambiguous[:, 0] * width + ambiguous[:, 1])
+    other = other[mask]
+    return VoxelRuns(np.vstack((
+        filled,
+        np.column_stack((other, other[:, 2] + 1)))))
+
+
+def _fill_columns(runs):
+    """
+    Fill between pairs of runs in every column.
+
+    Parameters
+    --------------
+    runs : (n, 4) int
+      Sorted runs which don't touch
+
+    Returns
+    --------------
+    filled : (m, 4) int
+      Surface runs and the runs between them, unmerged
+    ambiguous : (p, 2) int
+      Columns with an odd number of runs greater than one
+    """
+    if len(runs) == 0:
+        return runs, np.zeros((0, 2), dtype=np.int64)
+
+    # a transition where each new column starts
+    new_column = np.ones(len(runs), dtype=bool)
+    new_column[1:] = (runs[1:, :2] != runs[:-1, :2]).any(axis=1)
+    first = np.nonzero(new_column)[0]
+    count = np.diff(np.append(first, len(runs)))
+    # index of every run within its column
+    rank = np.arange(len(runs)) - np.repeat(first, count)
+
+    # even runs enter the solid and the next run leaves it
+    # unless it is the last run in the column
+    last = np.append(new_column[1:], True)
+    enter = np.nonzero((rank % 2 == 0) & ~last)[0]
+    inside = runs[enter]
+    inside[:, 3] = runs[enter + 1, 3]
+
+    ambiguous = runs[first[(count % 2 == 1) & (count > 1)], :2]
+    return np.vstack((runs, inside)), ambiguous
 
 
 def points_to_indices(points, pitch, origin):
@@ -677,15 +1297,18 @@ def matrix_to_points(matrix, pitch, origin):
     return points
 
 
-def matrix_to_marching_cubes(matrix, pitch, origin):
+def matrix_to_marching_cubes(matrix, pitch, origin, max_cells=2**24):
     """
     Convert an (n,m,p) matrix into a mesh, using marching_cubes.
 
     Parameters
     -----------
-    matrix: (n,m,p) bool, voxel matrix
+    matrix: (n,m,p) bool, voxel matrix, or VoxelRuns which are
+            meshed in slabs of the first axis so a dense
+            matrix of every cell is never created
     pitch: float, what pitch was the voxel matrix computed with
     origin: (3,) float, what is the origin of the voxel matrix
+    max_cells: int, approximate number of cells in each slab
 
     Returns
     ----------
@@ -695,43 +1318,88 @@ def matrix_to_marching_cubes(matrix, pitch, origin):
     from skimage import measure
     from .base import Trimesh
 
-    matrix = np.asanyarray(matrix, dtype=np.bool)
-
-    rev_matrix = np.logical_not(matrix)  # Takes set about 0.
-    # Add in padding so marching cubes can function properly with
-    # voxels on edge of AABB
-    pad_width = 1
-    rev_matrix = np.pad(rev_matrix,
-                        pad_width=(pad_width),
-                        mode='constant',
-                        constant_values=(1))
-
     # pick between old and new API
     if hasattr(measure, 'marching_cubes_lewiner'):
         func = measure.marching_cubes_lewiner
     else:
         func = measure.marching_cubes
 
-    # Run marching cubes.
-    meshed = func(volume=rev_matrix,
-                  level=.5,  # it is a boolean voxel grid
-                  spacing=(pitch,
-                           pitch,
-                           pitch))
-
-    # allow results from either marching cubes function in skimage
-    # binaries available for python 3.3 and 3.4 appear to use the classic
-    # method
-    if len(meshed) == 2:
-        log.warning('using old marching cubes, may not be watertight!')
-        vertices, faces = meshed
+    # Add in padding so marching cubes can function properly with
+    # voxels on edge of AABB
+    pad_width = 1
+
+    if isinstance(matrix, VoxelRuns):
+        runs = matrix
+        shape = np.array(runs.shape) + 2 * pad_width
+        # rows of the padded matrix in each slab, where slabs
+        # share their last row with the start of the next one
+        step = max(int(max_cells // shape[1:].prod()), 1)
+        slabs = [(i, min(i + step, shape[0] - 1) + 1)
+                 for i in range(0, shape[0] - 1, step)]
+    else:
+        runs = None
+        matrix = np.asanyarray(matrix, dtype=np.bool)
+        slabs = [(0, matrix.shape[0] + 2 * pad_width)]
+
+    vertices = []
+    faces = []
+    normals = []
+    count = 0
+    for start, stop in slabs:
+        if runs is None:
+            slab = matrix
+            pad = pad_width
+        else:
+            # only rows of the padded matrix which contain cells
+            slab = runs.to_matrix(start=max(start - pad_width, 0),
+                                  stop=stop - pad_width)
+            # pad the empty rows before and after the runs
+            pad = ((pad_width if start == 0 else 0,
+                    stop - start - len(slab) -
+                    (pad_width if start == 0 else 0)),
+                   (pad_width, pad_width),
+                   (pad_width, pad_width))
+
+        rev_matrix = np.logical_not(slab)  # Takes set about 0.
+        rev_matrix = np.pad(rev_matrix,
+                            pad_width=pad,
+                            mode='constant',
+                            constant_values=(1))
+
+        # Run marching cubes.
+        meshed = func(volume=rev_matrix,
+                      level=.5,  # it is a boolean voxel grid
+                      spacing=(pitch,
+                               pitch,
+                               pitch))
+
+        # allow results from either marching cubes function in skimage
+        # binaries available for python 3.3 and 3.4 appear to use the
+        # classic method
+        if len(meshed) == 2:
+            log.warning('using old marching cubes, may not be watertight!')
+            v, f = meshed
+            n = None
+        elif len(meshed) == 4:
+            v, f, n, vals = meshed
+
+        v = np.array(v, dtype=np.float64)
+        v[:, 0] += start * pitch
+        vertices.append(v)
+        faces.append(np.asanyarray(f) + count)
+        normals.append(n)
+        count += len(v)
+
+    vertices = np.vstack(vertices)
+    faces = np.vstack(faces)
+    if any(n is None for n in normals):
         normals = None
-    elif len(meshed) == 4:
-        vertices, faces, normals, vals = meshed
+    else:
+        normals = np.vstack(normals)
 
     # Return to the origin, add in the pad_width
     vertices = np.subtract(np.add(vertices, origin), pad_width * pitch)
-    # create the mesh
+    # create the mesh, which merges vertices shared between slabs
     mesh = Trimesh(vertices=vertices,
                    faces=faces,
                    vertex_normals=normals)
@@ -745,12 +1413,14 @@ def sparse_to_matrix(sparse):
 
     Parameters
     -----------
-    sparse: (n,3) int, index of filled cells
+    sparse: (n,3) int, index of filled cells, or VoxelRuns
 
     Returns
     ------------
     dense: (m,o,p) bool, matrix of filled cells
     """
+    if isinstance(sparse, VoxelRuns):
+        return sparse.to_matrix()
 
     sparse = np.asanyarray(sparse, dtype=np.int)
     if not util.is_shape(sparse, (-1, 3)):
@@ -802,44 +1472,33 @@ def multibox(centers, pitch):
 def boolean_sparse(a, b, operation=np.logical_and):
     """
     Find common rows between two arrays very quickly
-    using 3D boolean sparse matrices.
+    using runs of filled cells.
 
     Parameters
     -----------
-    a: (n, d)  int, coordinates in space
-    b: (m, d)  int, coordinates in space
+    a: (n, 3) int, coordinates in space, or VoxelRuns
+    b: (m, 3) int, coordinates in space, or VoxelRuns
     operation: numpy operation function, ie:
                   np.logical_and
                   np.logical_or
 
     Returns
     -----------
-    coords: (q, d) int, coordinates in space
-    """
-    # 3D sparse arrays, using wrapped scipy.sparse
-    # pip install sparse
-    import sparse
-
-    # find the bounding box of both arrays
-    extrema = np.array([a.min(axis=0),
-                        a.max(axis=0),
-                        b.min(axis=0),
-                        b.max(axis=0)])
-    origin = extrema.min(axis=0) - 1
-    size = tuple(extrema.ptp(axis=0) + 2)
-
-    # put nearby voxel arrays into same shape sparse array
-    sp_a = sparse.COO((a - origin).T,
-                      data=np.ones(len(a), dtype=np.bool),
-                      shape=size)
-    sp_b = sparse.COO((b - origin).T,
-                      data=np.ones(len(b), dtype=np.bool),
-                      shape=size)
-
-    # apply the logical operation
-    # get a sparse matrix out
-    applied = operation(sp_a, sp_b)
+    coords: (q, 3) int, coordinates in space,
+            or VoxelRuns if both inputs were VoxelRuns
+    """
+    if isinstance(a, VoxelRuns) and isinstance(b, VoxelRuns):
+        return a.boolean(b, operation=operation)
+
+    a = np.asanyarray(a, dtype=np.int64).reshape((-1, 3))
+    b = np.asanyarray(b, dtype=np.int64).reshape((-1, 3))
+    if len(a) + len(b) == 0:
+        return np.zeros((0, 3), dtype=np.int64)
+    # runs need non- negative indices
+    origin = np.vstack((a, b)).min(axis=0)
+    applied = VoxelRuns.from_sparse(a - origin).boolean(
+        VoxelRuns.from_sparse(b - origin), operation=operation)
     # reconstruct the original coordinates
-    coords = np.column_stack(applied.coords) + origin
+    coords = applied.sparse + origin
 
     return coords